@@ -0,0 +1,69 @@
+"""simple_data_augmentation: eski iterrows döngüsü ve vektörize sürüm.
+
+Veri seti --scales katlarına büyütülerek iki sürüm de boyut sınırı olmadan
+çalıştırılır; vektörize sürümün doğrusal ölçeklendiği görülmelidir.
+
+Kullanım:
+    python benchmarks/bench_augmentation.py [--scales 1 10 50] [--skip-legacy-above 20000]
+"""
+import argparse
+import contextlib
+import io
+import re
+
+import pandas as pd
+
+from _common import best_of, load_symptoms
+from preprocessing import Preprocessor
+
+
+def legacy_data_augmentation(df):
+    augmented_data = []
+    synonyms = {
+        'vomiting': 'throwing up',
+        'diarrhea': 'loose stool',
+        'assess': 'evaluate',
+        'monitor': 'observe',
+        'implement': 'apply'
+    }
+    for _, row in df.iterrows():
+        original_text = str(row['text'])
+        augmented_text = original_text
+        for original, synonym in synonyms.items():
+            if original in original_text.lower():
+                augmented_text = re.sub(rf'\b{original}\b', synonym, augmented_text, flags=re.IGNORECASE)
+                break
+        if augmented_text != original_text:
+            augmented_data.append({'text': augmented_text, 'condition': row['condition']})
+    if augmented_data:
+        return pd.concat([df, pd.DataFrame(augmented_data)], ignore_index=True)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--skip-legacy-above", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = load_symptoms()
+    print(f"{'rows':>8} {'legacy (s)':>11} {'vectorized (s)':>15} {'µs/row':>8} {'out rows':>9} {'speedup':>8}")
+    for scale in args.scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            new_time, new = best_of(
+                lambda: Preprocessor.simple_data_augmentation(df, max_rows=None), args.repeat
+            )
+            if len(df) <= args.skip_legacy_above:
+                legacy_time, _ = best_of(lambda: legacy_data_augmentation(df), 1)
+            else:
+                legacy_time = None
+        legacy_col = f"{legacy_time:11.2f}" if legacy_time else f"{'skipped':>11}"
+        speedup = f"{legacy_time / new_time:7.1f}x" if legacy_time else f"{'-':>8}"
+        print(f"{len(df):>8} {legacy_col} {new_time:>15.3f} {new_time / len(df) * 1e6:>8.2f} "
+              f"{len(new):>9} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
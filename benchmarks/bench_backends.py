@@ -0,0 +1,52 @@
+"""PetModel sınıflandırıcı backend'lerinin karşılaştırması.
+
+Her backend aynı TF-IDF özellikleriyle pet-health-symptoms-dataset.csv üzerinde
+eğitilir; doğruluk (ayrılmış %20), tekil istek gecikmesi, batch verimi ve
+serileştirilmiş model boyutu raporlanır.
+
+Kullanım:
+    python benchmarks/bench_backends.py [--backends random_forest sgd] [--batch 1000]
+"""
+import argparse
+import pickle
+import time
+
+from _common import best_of, load_symptoms, percentile, train_model
+
+from model import CLASSIFIER_BACKENDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(CLASSIFIER_BACKENDS))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    df = load_symptoms()
+    print(f"{'backend':>20} {'train (s)':>10} {'accuracy':>9} {'macro f1':>9} {'p50 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'batch/s':>9} {'model (KB)':>11}")
+    for backend in args.backends:
+        start = time.perf_counter()
+        model, preprocessor = train_model(df, {'classifier': backend})
+        train_time = time.perf_counter() - start
+
+        texts = [preprocessor.advanced_text_preprocessing(t) for t in df["text"].astype(str)]
+        latencies = []
+        for text in texts[:args.requests]:
+            start = time.perf_counter()
+            model.diagnose_cleaned([text])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        batch = (texts * (args.batch // len(texts) + 1))[:args.batch]
+        batch_time, _ = best_of(lambda: model.diagnose_cleaned(batch))
+        size_kb = len(pickle.dumps(model.model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+        f1 = model.actual_classification_report["macro avg"]["f1-score"]
+
+        print(f"{backend:>20} {train_time:>10.2f} {model.actual_accuracy:>9.3f} {f1:>9.3f} "
+              f"{percentile(latencies, 50):>9.3f} {percentile(latencies, 99):>9.3f} "
+              f"{args.batch / batch_time:>9.0f} {size_kb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
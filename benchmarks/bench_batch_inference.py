@@ -0,0 +1,34 @@
+"""PetModel.diagnose_many ile N adet multi_label_diagnosis çağrısının karşılaştırması.
+
+Kullanım:
+    python benchmarks/bench_batch_inference.py [--sizes 10 100 1000 2000]
+"""
+import argparse
+
+from _common import best_of, load_symptoms, train_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = load_symptoms()
+    model, preprocessor = train_model(df)
+    texts = df["text"].astype(str).tolist()
+
+    print(f"{'batch':>7} {'single (s)':>11} {'batch (s)':>10} {'single/s':>10} {'batch/s':>10} {'speedup':>8}")
+    for size in args.sizes:
+        batch = (texts * (size // len(texts) + 1))[:size]
+        single_time, single_results = best_of(
+            lambda: [model.multi_label_diagnosis(t, preprocessor) for t in batch], args.repeat
+        )
+        batch_time, batch_results = best_of(lambda: model.diagnose_many(batch, preprocessor), args.repeat)
+        assert single_results == batch_results, "batch output differs from single-text path"
+        print(f"{size:>7} {single_time:>11.3f} {batch_time:>10.3f} "
+              f"{size / single_time:>10.0f} {size / batch_time:>10.0f} {single_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
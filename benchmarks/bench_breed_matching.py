@@ -0,0 +1,87 @@
+"""BreedOverlapAnalyzer.find_fuzzy_matches: tüm çiftleri karşılaştıran eski yöntem ile
+aday üretme indeksinin farklı boyutlarda karşılaştırması.
+
+Sorgu tarafı breed_demographics/dogs_dataset.csv (3.000 satır), referans tarafı
+dog_breeds.csv isimlerinden türetilmiş sentetik kayıt listeleridir. Her boyutta
+sonuçların birebir aynı olduğu doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_breed_matching.py [--sizes 277 2000 20000] [--jobs 1 4]
+"""
+import argparse
+import os
+import random
+import sys
+
+import pandas as pd
+
+from _common import DATA_DIR, best_of
+
+sys.path.insert(0, DATA_DIR)
+from breed_overlap_analysis import BreedOverlapAnalyzer  # noqa: E402
+
+
+def naive_fuzzy_matches(analyzer, threshold):
+    ranked = [analyzer.normalize_breed_name(n) for n in analyzer.ranked_df.iloc[:, 0] if pd.notna(n)]
+    akc = [analyzer.normalize_breed_name(n) for n in analyzer.akc_df.iloc[:, 0] if pd.notna(n)]
+    matches = []
+    for ranked_breed in ranked:
+        best_match, best_score = None, 0
+        for akc_breed in akc:
+            similarity = analyzer.calculate_similarity(ranked_breed, akc_breed)
+            if similarity > best_score and similarity >= threshold:
+                best_score, best_match = similarity, akc_breed
+        if best_match:
+            matches.append({'ranked_breed': ranked_breed, 'akc_breed': best_match, 'similarity': best_score})
+    return matches
+
+
+def registry_names(base_names, size, seed=42):
+    """Gerçek isimlerden yazım hataları/ekler ile sentetik bir kayıt listesi üret"""
+    rng = random.Random(seed)
+    suffixes = ["", " dog", " mix", " (standard)", " miniature", " toy", " hound"]
+    names = list(base_names)
+    while len(names) < size:
+        name = list(rng.choice(base_names).lower())
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(name))
+            name[position] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+        names.append("".join(name) + rng.choice(suffixes))
+    return names[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[277, 2000, 20000])
+    parser.add_argument("--queries", type=int, default=3000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1])
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--skip-naive-above", type=int, default=2000)
+    args = parser.parse_args()
+
+    queries = pd.read_csv(os.path.join(DATA_DIR, "breed_demographics", "dogs_dataset.csv"))[["Breed"]]
+    queries = queries.head(args.queries)
+    base_names = pd.read_csv(os.path.join(DATA_DIR, "dog_breeds.csv"))["Name"].dropna().tolist()
+
+    print(f"{'queries':>8} {'reference':>10} {'naive (s)':>10} " + " ".join(f"{f'index j={j} (s)':>15}" for j in args.jobs))
+    for size in args.sizes:
+        reference = pd.DataFrame({"Breed": registry_names(base_names, size)})
+        analyzer = BreedOverlapAnalyzer(queries, reference)
+
+        naive_time, expected = None, None
+        if size <= args.skip_naive_above:
+            naive_time, expected = best_of(lambda: naive_fuzzy_matches(analyzer, args.threshold), 1)
+
+        timings = []
+        for jobs in args.jobs:
+            elapsed, matches = best_of(lambda: analyzer.find_fuzzy_matches(args.threshold, n_jobs=jobs), 1)
+            if expected is not None:
+                assert matches == expected, "indexed matches differ from all-pairs matches"
+            timings.append(elapsed)
+
+        naive_col = f"{naive_time:10.2f}" if naive_time is not None else f"{'skipped':>10}"
+        print(f"{len(queries):>8} {size:>10} {naive_col} " + " ".join(f"{t:>15.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""extract_real_clinical_recommendations: eski condition başına filtre + 7 regex taraması
+ile tek geçişli groupby sürümünün karşılaştırması.
+
+Kullanım:
+    python benchmarks/bench_clinical_extraction.py [--scales 1 10 100] [--jobs 1 4]
+"""
+import argparse
+import re
+
+import pandas as pd
+
+from _common import best_of, load_symptoms
+from clinical_recommendation import ClinicalRecommendation
+
+
+def legacy_extract(symptoms_data):
+    recommendations = {}
+    for condition in symptoms_data['condition'].unique():
+        if pd.isna(condition):
+            continue
+        condition_data = symptoms_data[symptoms_data['condition'] == condition]
+        all_notes = [str(t).lower() for t in condition_data['text'] if pd.notna(t)]
+        if not all_notes:
+            continue
+        combined_text = ' '.join(all_notes)
+        action_patterns = [
+            r'rule out \w+\s?\w*', r'assess \w+\s?\w*', r'monitor \w+\s?\w*', r'evaluate \w+\s?\w*',
+            r'perform \w+\s?\w*', r'implement \w+\s?\w*', r'emphasize \w+\s?\w*'
+        ]
+        extracted_actions = []
+        for pattern in action_patterns:
+            extracted_actions.extend(re.findall(pattern, combined_text))
+        recommendations[condition] = {
+            'raw_notes_count': len(all_notes),
+            'extracted_actions': list(set(extracted_actions))[:8],
+            'sample_notes': all_notes[:1]
+        }
+    return recommendations
+
+
+def synthetic_scale(df, scale):
+    """Condition sayısını da büyüt: her kopya kendi condition etiketlerini alır"""
+    copies = []
+    for i in range(scale):
+        copy = df.copy()
+        copy['condition'] = copy['condition'] + f" #{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--skip-legacy-above", type=int, default=200000)
+    args = parser.parse_args()
+
+    base = load_symptoms()
+    for scale in args.scales:
+        df = synthetic_scale(base, scale)
+        line = f"rows={len(df):>8} conditions={df['condition'].nunique():>4}"
+        if len(df) <= args.skip_legacy_above:
+            legacy_time, _ = best_of(lambda: legacy_extract(df), 1)
+            line += f"  legacy={legacy_time:7.3f}s"
+        for jobs in args.jobs:
+            new_time, result = best_of(
+                lambda: ClinicalRecommendation().extract_real_clinical_recommendations(df, n_jobs=jobs), 1
+            )
+            line += f"  groupby(n_jobs={jobs})={new_time:7.3f}s"
+        print(line)
+
+    sample = ClinicalRecommendation().extract_real_clinical_recommendations(base)
+    for condition, info in sample.items():
+        print(f"  {condition}: {info['action_counts']}")
+
+
+if __name__ == "__main__":
+    main()
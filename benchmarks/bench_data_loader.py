@@ -0,0 +1,84 @@
+"""DataLoader: varsayılan read_csv ile tipli / parçalı / columnar önbellekli yüklemenin süre ve tepe RSS karşılaştırması.
+
+Her ölçüm ayrı bir süreçte yapılır (tepe RSS temiz kalsın). --scales ile semptom
+veri seti sentetik olarak büyütülüp geçici bir CSV'ye yazılır.
+
+Kullanım:
+    python benchmarks/bench_data_loader.py [--scales 1 100]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from _common import SYMPTOMS_CSV
+
+MODES = ("legacy", "typed", "chunked", "columnar-cold", "columnar-warm")
+
+WORKER = r"""
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+import pandas as pd
+from data_loader import DataLoader
+
+mode, path = sys.argv[1], sys.argv[2]
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if mode == "legacy":
+    df = pd.read_csv(path)
+    rows, memory = len(df), df.memory_usage(deep=True).sum()
+elif mode == "chunked":
+    rows, memory = 0, 0
+    for chunk in DataLoader(symptoms_path=path, use_cache=False).iter_symptoms(chunksize=20000):
+        rows += len(chunk)
+        memory = max(memory, chunk.memory_usage(deep=True).sum())
+else:
+    # typed: yalnızca CSV; columnar-cold: önbelleği oluşturur; columnar-warm: önbellekten okur
+    loader = DataLoader(symptoms_path=path, use_cache=mode.startswith("columnar"))
+    loader.load_real_datasets(datasets=("symptoms",))
+    df = loader.symptoms_data
+    rows, memory = len(df), df.memory_usage(deep=True).sum()
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"rows": int(rows), "seconds": elapsed, "frame_mb": memory / 2**20,
+                  "peak_rss_delta_mb": (peak - baseline) / 1024}}))
+"""
+
+
+def measure(mode, path):
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER.format(src=src), mode, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args()
+
+    base = pd.read_csv(SYMPTOMS_CSV)
+    print(f"{'scale':>6} {'mode':>13} {'rows':>9} {'load (s)':>9} {'frame MB':>9} {'peak RSS Δ MB':>14}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = SYMPTOMS_CSV
+            if scale > 1:
+                path = os.path.join(tmp, "symptoms.csv")
+                pd.concat([base] * scale, ignore_index=True).to_csv(path, index=False)
+            for suffix in (".feather", ".feather.json"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            for mode in MODES:
+                result = measure(mode, path)
+                print(f"{scale:>5}x {mode:>13} {result['rows']:>9} {result['seconds']:>9.3f} "
+                      f"{result['frame_mb']:>9.1f} {result['peak_rss_delta_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
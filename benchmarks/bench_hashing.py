@@ -0,0 +1,71 @@
+"""TF-IDF sözlüğü ile hashing + online IDF özellik modlarının karşılaştırması.
+
+Semptom veri seti --scale kez çoğaltılarak büyütülür. 'tfidf' modu tüm veriyi
+belleğe alıp fit eder; 'hashing' modu --chunksize satırlık parçalarla
+partial_fit yapar. Eğitim süresi, tepe bellek (tracemalloc), doğruluk,
+serileştirilmiş boyut ve --update satırlık yeni notla artımlı güncelleme
+süresi raporlanır.
+
+Kullanım:
+    python benchmarks/bench_hashing.py [--scale 10] [--chunksize 5000] [--classifier sgd]
+"""
+import argparse
+import pickle
+import time
+import tracemalloc
+
+from _common import load_symptoms
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--classifier", default="sgd")
+    parser.add_argument("--update", type=int, default=500)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from model import PetModel
+    from preprocessing import Preprocessor
+
+    base = load_symptoms()[["text", "condition"]].dropna()
+    df = pd.concat([base] * args.scale, ignore_index=True)
+    classes = sorted(df["condition"].unique())
+    preprocessor = Preprocessor()
+    print(f"{len(df)} satır, classifier={args.classifier}")
+    print(f"{'features':>9} {'train (s)':>10} {'peak (MB)':>10} {'accuracy':>9} {'model (KB)':>11} {'update (ms)':>12}")
+
+    for features in ("tfidf", "hashing"):
+        model = PetModel({'classifier': args.classifier, 'features': features,
+                          'augmentation_max_rows': 0})
+        if features == "hashing":
+            chunks = (df.iloc[i:i + args.chunksize] for i in range(0, len(df), args.chunksize))
+            train = lambda: model.train_incremental(chunks, preprocessor, classes)
+        else:
+            train = lambda: model.train_improved_model(df, preprocessor)
+        train_time, peak_mb, _ = measure(train)
+        size_kb = len(pickle.dumps((model.vectorizer, model.model), protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+
+        update = "-"
+        if model.incremental:
+            notes = base.sample(args.update, replace=True, random_state=0)
+            start = time.perf_counter()
+            model.update(notes, preprocessor)
+            update = f"{(time.perf_counter() - start) * 1000:.1f}"
+        print(f"{features:>9} {train_time:>10.2f} {peak_mb:>10.1f} {model.actual_accuracy:>9.3f} "
+              f"{size_kb:>11.1f} {update:>12}")
+
+
+if __name__ == "__main__":
+    main()
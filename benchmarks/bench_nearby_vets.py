@@ -0,0 +1,138 @@
+"""/nearby_vets: yavaş Overpass altında event loop, konum önbelleği ve devre kesici.
+
+Yerel Overpass taklidi (--delay-ms gecikmeli) başlatılır, API ona yönlendirilir.
+Ardından:
+  1. Aynı bölgedeki --users kullanıcı eşzamanlı /nearby_vets çağırır; bu sırada
+     /health gecikmesi ölçülür (event loop bloklanmamalı).
+  2. Aynı kullanıcılar tekrar sorar (önbellekten dönmeli).
+  3. Mobil ekran yüklemesi: /nearby_vets + 20 x /vet_details (N+1) ile tek
+     /nearby_vets?include_details=true karşılaştırılır; önbellekte olmayan
+     id'ler için toplu POST /vet_details'in OSM API'ye kaç istek attığı sayılır.
+  4. Overpass hataya geçirilir; devre açıldıktan sonra istekler hemen 503 almalı.
+
+Kullanım:
+    python benchmarks/bench_nearby_vets.py [--users 50] [--delay-ms 300]
+"""
+import argparse
+import os
+import random
+import threading
+import time
+
+from _common import percentile, serve_in_thread
+from fake_overpass import FakeOverpassServer
+
+
+def timed_get(session, url, **params):
+    start = time.perf_counter()
+    response = session.get(url, params=params, timeout=60)
+    return (time.perf_counter() - start) * 1000, response
+
+
+def run_users(base_url, points, radius):
+    import requests
+
+    latencies, statuses, lock = [], {}, threading.Lock()
+
+    def user(lat, lng):
+        with requests.Session() as session:
+            elapsed, response = timed_get(session, f"{base_url}/nearby_vets", lat=lat, lng=lng, radius=radius)
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    threads = [threading.Thread(target=user, args=point) for point in points]
+    for thread in threads:
+        thread.start()
+    return threads, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=300)
+    parser.add_argument("--radius", type=int, default=5000)
+    args = parser.parse_args()
+
+    import requests
+
+    fake = FakeOverpassServer(delay_ms=args.delay_ms).start()
+    os.environ["PET_OVERPASS_URL"] = fake.url
+    os.environ["PET_OSM_API_URL"] = fake.osm_api_url
+    os.environ["PET_VETS_SOURCE"] = "overpass"
+    os.environ.setdefault("PET_HTTP_BREAKER_RESET", "60")
+    import api
+
+    server, base_url = serve_in_thread(api.app)
+    rng = random.Random(0)
+    # Kullanıcılar ~2 km'lik bir bölgeye dağılmış (birkaç geohash hücresi)
+    points = [(41.0 + rng.uniform(0, 0.02), 29.0 + rng.uniform(0, 0.02)) for _ in range(args.users)]
+
+    print(f"Fake Overpass gecikmesi: {args.delay_ms:.0f} ms, {args.users} kullanıcı, radius={args.radius} m")
+    threads, latencies, statuses = run_users(base_url, points, args.radius)
+    health = []
+    with requests.Session() as session:
+        while any(thread.is_alive() for thread in threads):
+            health.append(timed_get(session, f"{base_url}/health")[0])
+            time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    print(f"  soğuk: p50={percentile(latencies, 50):.1f} ms p99={percentile(latencies, 99):.1f} ms "
+          f"status={statuses} overpass_istekleri={fake.requests}")
+    print(f"  bu sırada /health: p50={percentile(health, 50):.2f} ms p99={percentile(health, 99):.2f} ms "
+          f"(n={len(health)})")
+
+    before = fake.requests
+    threads, latencies, statuses = run_users(base_url, points, args.radius)
+    for thread in threads:
+        thread.join()
+    print(f"  sıcak: p50={percentile(latencies, 50):.1f} ms p99={percentile(latencies, 99):.1f} ms "
+          f"status={statuses} yeni_overpass_istekleri={fake.requests - before}")
+
+    fake.delay_ms = 0
+    lat, lng = 41.5, 29.5
+    with requests.Session() as session:
+        start = time.perf_counter()
+        vets = session.get(f"{base_url}/nearby_vets", params=dict(lat=lat, lng=lng, radius=args.radius),
+                           timeout=60).json()["results"]
+        for vet in vets:
+            session.get(f"{base_url}/vet_details", params={"place_id": vet["place_id"]}, timeout=60)
+        n_plus_one = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        inline = session.get(f"{base_url}/nearby_vets", params=dict(lat=lat + 0.003, lng=lng, radius=args.radius,
+                                                                    include_details="true"), timeout=60).json()
+        single = (time.perf_counter() - start) * 1000
+    print(f"  ekran yüklemesi: N+1 ({1 + len(vets)} istek) {n_plus_one:.1f} ms, "
+          f"include_details (1 istek) {single:.1f} ms, "
+          f"ilk telefon: {inline['results'][0]['details']['formatted_phone_number']}")
+
+    # Overpass'tan gelmemiş (önbellekte olmayan) id'ler: OSM API multi-fetch
+    from fake_overpass import vet_node
+    place_ids = [f"osm_node_{vet_node(i, 500)['id']}" for i in range(100)]
+    osm_before = fake.osm_requests
+    with requests.Session() as session:
+        start = time.perf_counter()
+        response = session.post(f"{base_url}/vet_details", json={"place_ids": place_ids}, timeout=60)
+        bulk = (time.perf_counter() - start) * 1000
+    print(f"  toplu /vet_details: 100 id, {bulk:.1f} ms, status={response.status_code}, "
+          f"OSM API istekleri={fake.osm_requests - osm_before}")
+
+    fake.fail, fake.delay_ms = True, 0
+    statuses, far = {}, []
+    with requests.Session() as session:
+        for i in range(10):
+            # Önbellekte olmayan uzak noktalar: her istek upstream'e gitmeli
+            elapsed, response = timed_get(session, f"{base_url}/nearby_vets", lat=10.0 + i, lng=10.0, radius=1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            far.append(elapsed)
+    print(f"  Overpass hata modunda 10 istek: status={statuses} son istek={far[-1]:.1f} ms")
+
+    stats = requests.get(f"{base_url}/status", timeout=10).json()
+    print(f"  geo_cache: {stats['geo_cache']}")
+    print(f"  upstream: {stats['upstream']['hosts']}")
+    server.should_exit = True
+    fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Başlangıç süresi: import api, port açılması, ilk başarılı /predict ve tam hazır olma.
+
+src/api.py ayrı bir süreçte diskteki artifact ile başlatılır ve süreç
+başlangıcından itibaren şu anlar ölçülür:
+  port      /health ilk kez cevap verdiğinde
+  predict   ilk 200 dönen /predict
+  healthy   /health "healthy" (risk tabloları dahil tüm bileşenler yüklü)
+PET_LAZY_STARTUP=1 (aşamalı başlangıç) ve 0 (her şey port açılmadan önce)
+karşılaştırılır. Ayrıca yeni bir süreçte "import api" süresi raporlanır.
+
+Kullanım:
+    python benchmarks/bench_startup.py [--runs 3]
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import REPO_DIR, SRC_DIR
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request(method, path, body, {"Content-Type": "application/json"} if body else {})
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def import_seconds():
+    code = "import time; start = time.perf_counter(); import api; print(time.perf_counter() - start)"
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(lazy, timeout=300):
+    port = free_port()
+    env = dict(os.environ, PET_HOST="127.0.0.1", PET_PORT=str(port), PET_LAZY_STARTUP="1" if lazy else "0")
+    body = json.dumps({"symptoms": "dog vomiting and diarrhea for 3 days not eating"})
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "api.py")], cwd=REPO_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    marks = {}
+    try:
+        while len(marks) < 3 and time.perf_counter() - start < timeout:
+            try:
+                status, payload = request(port, "GET", "/health")
+            except OSError:
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter() - start
+            marks.setdefault("port", now)
+            if "predict" not in marks and request(port, "POST", "/predict", body)[0] == 200:
+                marks["predict"] = time.perf_counter() - start
+            if json.loads(payload).get("status") == "healthy":
+                marks.setdefault("healthy", now)
+                marks.setdefault("predict", now)
+            time.sleep(0.01)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # Artifact yoksa bir kez eğit; ölçümler yeniden eğitimi içermesin
+    subprocess.run([sys.executable, os.path.join(SRC_DIR, "train.py")], cwd=REPO_DIR,
+                   stdout=subprocess.DEVNULL, check=True)
+
+    imports = [import_seconds() for _ in range(args.runs)]
+    print(f"import api: medyan {statistics.median(imports):.3f}s")
+    print(f"{'mode':>6} {'port (s)':>9} {'predict (s)':>12} {'healthy (s)':>12}")
+    for lazy in (True, False):
+        runs = [measure_startup(lazy) for _ in range(args.runs)]
+        cells = [statistics.median(run.get(mark, float("nan")) for run in runs) for mark in ("port", "predict", "healthy")]
+        print(f"{'lazy' if lazy else 'eager':>6} {cells[0]:>9.2f} {cells[1]:>12.2f} {cells[2]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Preprocessor.advanced_text_preprocessing: eski (kısaltma başına regex) ve tek geçişli sürüm.
+
+pet-health-symptoms-dataset.csv'deki her satırda iki sürümün çıktısının aynı
+olduğunu doğrular ve çağrı başına süreyi raporlar.
+
+Kullanım:
+    python benchmarks/bench_text_normalizer.py [--repeat 5]
+"""
+import argparse
+import re
+
+from _common import best_of, load_symptoms
+from preprocessing import Preprocessor
+
+
+def legacy_text_preprocessing(text):
+    text = str(text).lower()
+    medical_expansions = {
+        'gi': 'gastrointestinal',
+        'dka': 'diabetic ketoacidosis',
+        'uri': 'upper respiratory infection',
+        'uti': 'urinary tract infection'
+    }
+    for abbr, expansion in medical_expansions.items():
+        text = re.sub(rf'\b{abbr}\b', expansion, text)
+    text = re.sub(r'[^\w\s\-]', ' ', text)
+    return ' '.join(text.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = load_symptoms()["text"].tolist()
+    # Kısaltma içeren örnekler de karşılaştırılsın
+    texts += [t + " gi upset, uti? uri/dka" for t in texts[:200]]
+
+    legacy_time, legacy = best_of(lambda: [legacy_text_preprocessing(t) for t in texts], args.repeat)
+    new_time, new = best_of(lambda: [Preprocessor.advanced_text_preprocessing(t) for t in texts], args.repeat)
+
+    mismatches = [(t, a, b) for t, a, b in zip(texts, legacy, new) if a != b]
+    assert not mismatches, f"{len(mismatches)} outputs differ, first: {mismatches[0]}"
+
+    per_call = lambda seconds: seconds / len(texts) * 1e6
+    print(f"rows: {len(texts)} (outputs identical)")
+    print(f"legacy:      {per_call(legacy_time):6.2f} µs/call")
+    print(f"single-pass: {per_call(new_time):6.2f} µs/call ({legacy_time / new_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""build_diagnoses: sınıf sayısına göre top-k aday çıkarımı maliyeti.
+
+Dirichlet dağılımından sentetik predict_proba matrisleri (--classes sınıf)
+üretilir ve PetModel.build_diagnoses tekil satır ve --batch satırlık matris
+için ölçülür. "tümü" eşik 0 ve top_k yok (tüm sınıflar sıralanır) durumudur;
+diğerleri argpartition ile yalnızca aday sınıfları sıralar.
+
+Kullanım:
+    python benchmarks/bench_topk.py [--classes 20 200 800] [--batch 1000]
+"""
+import argparse
+
+import numpy as np
+
+from _common import best_of
+
+from model import PetModel
+
+CASES = (
+    ("tümü", 0.0, None),
+    ("eşik 0.15", 0.15, None),
+    ("eşik 0, k=5", 0.0, 5),
+    ("eşik 0.05, k=3", 0.05, 3),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, nargs="+", default=[20, 200, 800])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--single", type=int, default=500, help="single-row calls per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'classes':>7} {'case':>16} {'single (us)':>12} {'batch (ms)':>11} {'candidates':>11}")
+    for n_classes in args.classes:
+        model = PetModel()
+        model.label_encoder.classes_ = np.array([f"condition_{i}" for i in range(n_classes)])
+        probabilities = rng.dirichlet([0.2] * n_classes, size=args.batch)
+        single = probabilities[:1]
+        for name, threshold, top_k in CASES:
+            single_time, _ = best_of(
+                lambda: [model.build_diagnoses(single, threshold, top_k) for _ in range(args.single)]
+            )
+            batch_time, results = best_of(lambda: model.build_diagnoses(probabilities, threshold, top_k))
+            candidates = np.mean([len(r["possible_diagnoses"]) for r in results])
+            print(f"{n_classes:>7} {name:>16} {single_time / args.single * 1e6:>12.1f} "
+                  f"{batch_time * 1000:>11.2f} {candidates:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Yerel veteriner POI indeksi: içe aktarma, yarıçap / k-NN sorgu ve diff süreleri.
+
+Sentetik bir Overpass JSON dump'ı (--vets adet, Türkiye sınırları içinde rastgele)
+üretilir, VetIndex'e aktarılır; ardından rastgele noktalardan yarıçap ve k-NN
+sorguları ölçülür ve küçük bir osmChange diff'i uygulanır.
+
+Kullanım:
+    python benchmarks/bench_vet_index.py [--vets 50000] [--queries 2000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from _common import best_of, percentile
+
+from vet_index import VetIndex
+
+
+def synthetic_dump(count, rng):
+    return {"elements": [
+        {"type": "node", "id": i, "lat": rng.uniform(36.0, 42.0), "lon": rng.uniform(26.0, 45.0),
+         "tags": {"amenity": "veterinary", "name": f"Vet {i}", "phone": f"+90 555 {i:07d}"}}
+        for i in range(count)
+    ]}
+
+
+def synthetic_diff(path, count, rng):
+    creates = "".join(
+        f'<node id="{10_000_000 + i}" lat="{rng.uniform(36, 42):.6f}" lon="{rng.uniform(26, 45):.6f}">'
+        f'<tag k="amenity" v="veterinary"/><tag k="name" v="New Vet {i}"/></node>'
+        for i in range(count)
+    )
+    deletes = "".join(f'<node id="{i}"/>' for i in range(count))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<osmChange version="0.6"><create>{creates}</create><delete>{deletes}</delete></osmChange>')
+
+
+def time_queries(fn, points):
+    latencies = []
+    for lat, lng in points:
+        start = time.perf_counter()
+        fn(lat, lng)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vets", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_path = os.path.join(tmp, "vets.json")
+        with open(dump_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_dump(args.vets, rng), f)
+
+        elapsed, index = best_of(lambda: VetIndex.from_file(dump_path), repeat=1)
+        print(f"İçe aktarma: {args.vets} veteriner {elapsed * 1000:.0f} ms")
+        index_path = index.save(os.path.join(tmp, "vet_index.json"))
+        elapsed, index = best_of(lambda: VetIndex.load(index_path), repeat=1)
+        print(f"Diskten yükleme: {elapsed * 1000:.0f} ms")
+
+        points = [(rng.uniform(36.5, 41.5), rng.uniform(27, 44)) for _ in range(args.queries)]
+        totals = []
+        radius = time_queries(lambda lat, lng: totals.append(index.query_radius(lat, lng, args.radius)[0]), points)
+        knn = time_queries(lambda lat, lng: index.query_knn(lat, lng, 20), points)
+        print(f"Yarıçap ({args.radius} m, ort. {sum(totals) / len(totals):.1f} sonuç, ilk 20 sayfa): "
+              f"p50={percentile(radius, 50):.0f} µs p99={percentile(radius, 99):.0f} µs")
+        print(f"k-NN (k=20): p50={percentile(knn, 50):.0f} µs p99={percentile(knn, 99):.0f} µs")
+
+        diff_path = os.path.join(tmp, "changes.osc")
+        synthetic_diff(diff_path, 500, rng)
+        start = time.perf_counter()
+        upserted, removed = index.apply_osm_change(diff_path)
+        print(f"Diff: +{upserted} / -{removed} -> {len(index)} veteriner, "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms (ağaç yeniden kurulumu dahil)")
+
+
+if __name__ == "__main__":
+    main()
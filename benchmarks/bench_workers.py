@@ -0,0 +1,158 @@
+"""Pre-fork çok worker'lı mod: worker sayısına göre verim ve toplam bellek.
+
+Her --workers değeri için src/api.py ayrı bir süreç olarak PET_WORKERS=N ile
+başlatılır (model diskteki artifact'ten bir kez yüklenir, worker'lar fork ile
+paylaşır). --concurrency thread, sonuç önbelleğine takılmayan (iki rastgele
+semptom metninin birleşimi) /predict istekleri gönderir. Süreç ağacının
+toplam RSS'i (paylaşılan sayfaları her süreçte yeniden sayar) ve PSS'i
+(paylaşılan sayfaları süreçler arasında böler; gerçek bellek maliyeti)
+/proc üzerinden yük öncesi ve sonrası ölçülür.
+
+Kullanım:
+    python benchmarks/bench_workers.py [--workers 1 2 4 8] [--duration 10] [--concurrency 16]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from _common import REPO_DIR, SRC_DIR, load_symptoms, percentile
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid):
+    pids, queue = [], [pid]
+    while queue:
+        current = queue.pop()
+        pids.append(current)
+        try:
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                queue.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory_mb(pid):
+    """Süreç ağacının toplam (RSS, PSS) değeri, MB"""
+    rss = pss = 0
+    for current in process_tree(pid):
+        try:
+            with open(f"/proc/{current}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Rss:"):
+                        rss += int(line.split()[1])
+                    elif line.startswith("Pss:"):
+                        pss += int(line.split()[1])
+        except OSError:
+            pass
+    return rss / 1024, pss / 1024
+
+
+def wait_healthy(port, workers, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/health")
+            if json.loads(conn.getresponse().read()).get("status") == "healthy":
+                return True
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_load(port, texts, duration, concurrency):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local = []
+        while time.perf_counter() < deadline:
+            body = json.dumps({"symptoms": f"{rng.choice(texts)} {rng.choice(texts)}"})
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except OSError:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                ok = False
+            local.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    texts = load_symptoms()["text"].dropna().astype(str).tolist()
+    # Artifact yoksa bir kez eğit; her worker sayısında aynı artifact yüklenir
+    subprocess.run([sys.executable, os.path.join(SRC_DIR, "train.py")], cwd=REPO_DIR,
+                   stdout=subprocess.DEVNULL, check=True)
+
+    print(f"{os.cpu_count()} CPU, concurrency={args.concurrency}, {args.duration:.0f}s / ölçüm")
+    print(f"{'workers':>7} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'errors':>7} "
+          f"{'RSS (MB)':>9} {'PSS (MB)':>9} {'PSS yük sonrası':>16} {'N x 1 PSS':>10}")
+    single_pss = None
+    for workers in args.workers:
+        port = free_port()
+        env = dict(os.environ, PET_WORKERS=str(workers), PET_HOST="127.0.0.1", PET_PORT=str(port))
+        proc = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "api.py")], cwd=REPO_DIR, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_healthy(port, workers):
+                print(f"{workers:>7} başlatılamadı")
+                continue
+            time.sleep(1)
+            rss, pss = memory_mb(proc.pid)
+            start = time.perf_counter()
+            latencies, errors = run_load(port, texts, args.duration, args.concurrency)
+            elapsed = time.perf_counter() - start
+            _, pss_after = memory_mb(proc.pid)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if single_pss is None:
+            single_pss = pss
+        print(f"{workers:>7} {len(latencies) / elapsed:>8.0f} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 99):>9.1f} {errors:>7} {rss:>9.0f} {pss:>9.0f} {pss_after:>16.0f} "
+              f"{single_pss * workers:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
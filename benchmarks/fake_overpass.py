@@ -0,0 +1,133 @@
+"""Yerel Overpass + OSM API taklidi (test ve benchmark'lar için).
+
+Sorgudaki "around:<radius>,<lat>,<lng>" ifadesini okur ve sabit bir ızgaradaki
+veteriner node'larından yarıçap içinde kalanları döndürür. Aynı node'lar OSM
+API biçiminde de (/api/0.6/node/<id>.json ve /api/0.6/nodes.json?nodes=...)
+sunulur. Yanıt gecikmesi ve hata modu çalışırken değiştirilebilir.
+
+Kullanım:
+    python benchmarks/fake_overpass.py [--port 8099] [--delay-ms 200]
+    PET_OVERPASS_URL=http://127.0.0.1:8099/api/interpreter \
+    PET_OSM_API_URL=http://127.0.0.1:8099/api/0.6 python src/api.py
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+AROUND_PATTERN = re.compile(r"around:(\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
+GRID_STEP_DEG = 0.01  # ~1.1 km aralıklı veteriner ızgarası
+
+
+def _haversine_m(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * 6371008.8 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def vet_node(i, j):
+    node_id = (i + 9000) * 100000 + (j + 18000)
+    return {
+        "type": "node", "id": node_id, "lat": round(i * GRID_STEP_DEG, 6), "lon": round(j * GRID_STEP_DEG, 6),
+        "tags": {"amenity": "veterinary", "name": f"Vet {node_id}",
+                 "addr:street": f"Street {i}", "addr:city": "Testville",
+                 "phone": f"+90 555 {node_id % 10000000:07d}"}
+    }
+
+
+def node_by_id(node_id):
+    return vet_node(node_id // 100000 - 9000, node_id % 100000 - 18000)
+
+
+def vets_around(lat, lng, radius):
+    span = radius / 111000 + GRID_STEP_DEG
+    elements = []
+    i_min, i_max = math.floor((lat - span) / GRID_STEP_DEG), math.ceil((lat + span) / GRID_STEP_DEG)
+    j_min, j_max = math.floor((lng - span) / GRID_STEP_DEG), math.ceil((lng + span) / GRID_STEP_DEG)
+    for i in range(i_min, i_max + 1):
+        for j in range(j_min, j_max + 1):
+            node = vet_node(i, j)
+            if _haversine_m(lat, lng, node["lat"], node["lon"]) <= radius:
+                elements.append(node)
+    return elements
+
+
+class FakeOverpassServer:
+    def __init__(self, host="127.0.0.1", port=0, delay_ms=0.0):
+        self.delay_ms = delay_ms
+        self.fail = False
+        self.requests = 0
+        self.osm_requests = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                with fake._lock:
+                    fake.requests += 1
+                if fake.delay_ms:
+                    time.sleep(fake.delay_ms / 1000)
+                if fake.fail:
+                    return self._reply(504, {"error": "gateway timeout"})
+                match = AROUND_PATTERN.search(form.get("data", [""])[0])
+                if not match:
+                    return self._reply(400, {"error": "no around filter"})
+                radius, lat, lng = (float(v) for v in match.groups())
+                self._reply(200, {"version": 0.6, "elements": vets_around(lat, lng, radius)})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with fake._lock:
+                    fake.osm_requests += 1
+                if fake.delay_ms:
+                    time.sleep(fake.delay_ms / 1000)
+                match = re.fullmatch(r"/api/0\.6/node/(\d+)\.json", url.path)
+                if match:
+                    return self._reply(200, {"version": "0.6", "elements": [node_by_id(int(match.group(1)))]})
+                if url.path == "/api/0.6/nodes.json":
+                    ids = parse_qs(url.query).get("nodes", [""])[0].split(",")
+                    return self._reply(200, {"version": "0.6", "elements": [node_by_id(int(i)) for i in ids if i]})
+                self._reply(404, {"error": "not found"})
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}/api/interpreter"
+        self.osm_api_url = f"http://{host}:{self.server.server_address[1]}/api/0.6"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeOverpassServer(port=args.port, delay_ms=args.delay_ms)
+    print(f"Fake Overpass: {fake.url}\nFake OSM API: {fake.osm_api_url}")
+    fake.server.serve_forever()
@@ -0,0 +1,100 @@
+"""/predict doygunluktayken /health gecikmesinin sabit kaldığını gösteren yük testi.
+
+Önce boştaki /health gecikmesi ölçülür, ardından --concurrency thread /predict'e
+yüklenirken aynı ölçüm tekrarlanır. Inference havuzu event loop'u bloklamıyorsa
+iki p99 değeri birbirine yakın olmalıdır.
+
+Kullanım:
+    python benchmarks/load_health_latency.py [--concurrency 32] [--duration 10]
+"""
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+from _common import percentile, prepare_api, serve_in_thread
+
+LONG_SYMPTOMS = " ".join([
+    "dog vomiting and diarrhea for 3 days not eating, lethargic, scratching ears,",
+    "limping on back leg, visible worms in stool and red skin patches"
+] * 4)
+
+
+def connect(base_url, timeout):
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+    conn.connect()
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return conn
+
+
+def probe_health(base_url, duration, interval=0.01):
+    conn = connect(base_url, timeout=30)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        conn.request("GET", "/health")
+        conn.getresponse().read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+    conn.close()
+    return latencies
+
+
+def hammer_predict(base_url, stop, counters, lock):
+    conn = connect(base_url, timeout=60)
+    body = json.dumps({"symptoms": LONG_SYMPTOMS, "pet_type": "dog"})
+    while not stop.is_set():
+        conn.request("POST", "/predict", body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        with lock:
+            counters[response.status] = counters.get(response.status, 0) + 1
+        if response.status == 503:
+            time.sleep(float(response.getheader("Retry-After", "1")) / 10)
+    conn.close()
+
+
+def summarize(name, latencies):
+    print(f"{name:<22} n={len(latencies):>5}  p50={percentile(latencies, 50):7.2f}ms  "
+          f"p99={percentile(latencies, 99):7.2f}ms  max={max(latencies):7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    api = prepare_api()
+    server, base_url = serve_in_thread(api.app)
+    print(f"🚀 Serving on {base_url} (inference pool: {api.inference.stats()})")
+
+    idle = probe_health(base_url, args.duration / 2)
+
+    stop, lock, counters = threading.Event(), threading.Lock(), {}
+    workers = [
+        threading.Thread(target=hammer_predict, args=(base_url, stop, counters, lock), daemon=True)
+        for _ in range(args.concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    time.sleep(1)  # Kuyruğun dolmasını bekle
+    loaded = probe_health(base_url, args.duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    summarize("/health idle", idle)
+    summarize("/health under load", loaded)
+    print(f"/predict responses by status: {dict(sorted(counters.items()))}")
+    print(f"inference stats: {api.inference.stats()}")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Tanı hattının tekrarlanabilir benchmark paketi: JSON sonuçlar ve regresyon karşılaştırması.
+
+run: her aşamayı pet-health-symptoms-dataset.csv ve sentetik büyütmeleri
+(--scales 1 10 100; satırlar kopyalanır) üzerinde ölçer ve sonuçları JSON'a yazar:
+  cold_start           yeni süreçte api.initialize_model() (diskteki artifact ile / artifact'siz)
+  augment              simple_data_augmentation (boyut sınırı yok)
+  clinical             extract_real_clinical_recommendations
+  train                train_improved_model (+ ayrılmış setteki doğruluk)
+  diagnose_single      tekil multi_label_diagnosis gecikmesi
+  diagnose_batch       diagnose_many ile --batch metin
+  http_predict         yerel sunucuya eşzamanlı /predict yükü (önbelleğe takılmayan metinler)
+
+compare: iki JSON'u karşılaştırır; eşikten (--threshold, varsayılan %10) kötü
+olan metrikleri işaretler ve regresyon varsa 1 ile çıkar (CI'da kullanılabilir).
+
+Kullanım:
+    python benchmarks/suite.py run [--scales 1 10 100] [--output benchmarks/results/base.json]
+    python benchmarks/suite.py compare benchmarks/results/base.json benchmarks/results/new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from _common import REPO_DIR, SRC_DIR, best_of, load_symptoms, percentile, serve_in_thread
+
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+STAGES = ("cold_start", "augment", "clinical", "train", "diagnose_single", "diagnose_batch", "http_predict")
+
+# Metrik adı -> daha iyi yön; listede olmayanlar (satır sayısı vb.) karşılaştırılmaz
+METRIC_DIRECTIONS = {
+    "seconds": "lower",
+    "p50_ms": "lower",
+    "p99_ms": "lower",
+    "per_second": "higher",
+    "accuracy": "higher"
+}
+
+
+def scale_symptoms(df, scale):
+    import pandas as pd
+    return df if scale == 1 else pd.concat([df] * scale, ignore_index=True)
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_cold_start(artifact_dir):
+    """Yeni bir Python sürecinde import + initialize_model süresi (saniye)"""
+    code = ("import time; start = time.perf_counter(); import api; "
+            "ok = api.initialize_model(); print(); print(ok, time.perf_counter() - start)")
+    env = dict(os.environ, PET_MODEL_DIR=artifact_dir)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    ok, seconds = out.stdout.strip().splitlines()[-1].split()
+    if ok != "True":
+        raise RuntimeError(f"initialize_model failed:\n{out.stdout[-2000:]}")
+    return {"seconds": round(float(seconds), 4), "process_seconds": round(wall, 4)}
+
+
+def bench_latency(fn, items):
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - start
+    return {"p50_ms": round(percentile(latencies, 50), 4), "p99_ms": round(percentile(latencies, 99), 4),
+            "per_second": round(len(items) / elapsed, 1), "n": len(items)}
+
+
+def bench_http(model, preprocessor, texts, duration, concurrency):
+    import http.client
+    import api
+    from data_loader import DataLoader
+    from clinical_recommendation import ClinicalRecommendation
+    from risk_calculator import RiskCalculator
+
+    api.model, api.preprocessor = model, preprocessor
+    api.loader, api.clinical, api.risk = DataLoader(), ClinicalRecommendation(), RiskCalculator()
+    server, base_url = serve_in_thread(api.app)
+    host, port = base_url.rsplit("//", 1)[1].split(":")
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(host, int(port), timeout=60)
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            body = json.dumps({"symptoms": f"{rng.choice(texts)} {rng.choice(texts)}"})
+            t = time.perf_counter()
+            conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            local.append((time.perf_counter() - t) * 1000)
+            failed += response.status != 200
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.should_exit = True
+    return {"p50_ms": round(percentile(latencies, 50), 3), "p99_ms": round(percentile(latencies, 99), 3),
+            "per_second": round(len(latencies) / elapsed, 1), "errors": errors[0], "concurrency": concurrency}
+
+
+def run(args):
+    from preprocessing import Preprocessor
+    from clinical_recommendation import ClinicalRecommendation
+    from model import PetModel
+
+    stages = set(args.stages)
+    base = load_symptoms()
+    texts = base["text"].dropna().astype(str).tolist()
+    rng = random.Random(0)
+    results = {}
+
+    def record(stage, scale, metrics):
+        key = f"{stage}@{scale}x"
+        results[key] = metrics
+        shown = ", ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"  {key:<24} {shown}")
+
+    if "cold_start" in stages:
+        with tempfile.TemporaryDirectory(prefix="pet-bench-") as artifact_dir:
+            record("cold_start_train", 1, bench_cold_start(artifact_dir))
+            record("cold_start_artifact", 1, bench_cold_start(artifact_dir))
+
+    preprocessor = Preprocessor()
+    for scale in args.scales:
+        df = scale_symptoms(base, scale)
+        rows = len(df)
+        if "augment" in stages:
+            seconds, _ = best_of(lambda: quiet(preprocessor.simple_data_augmentation, df, max_rows=None), args.repeat)
+            record("augment", scale, {"seconds": round(seconds, 4), "rows": rows})
+        if "clinical" in stages:
+            seconds, _ = best_of(
+                lambda: ClinicalRecommendation().extract_real_clinical_recommendations(df), args.repeat
+            )
+            record("clinical", scale, {"seconds": round(seconds, 4), "rows": rows})
+
+        if scale > args.train_max_scale or not stages & {"train", "diagnose_single", "diagnose_batch", "http_predict"}:
+            continue
+        model = PetModel(args.params)
+        start = time.perf_counter()
+        quiet(model.train_improved_model, df, preprocessor)
+        if "train" in stages:
+            record("train", scale, {"seconds": round(time.perf_counter() - start, 4), "rows": rows,
+                                    "accuracy": round(model.actual_accuracy, 4)})
+        if "diagnose_single" in stages:
+            sample = [rng.choice(texts) for _ in range(args.requests)]
+            record("diagnose_single", scale, bench_latency(
+                lambda text: model.multi_label_diagnosis(text, preprocessor), sample))
+        if "diagnose_batch" in stages:
+            batch = [rng.choice(texts) for _ in range(args.batch)]
+            seconds, _ = best_of(lambda: model.diagnose_many(batch, preprocessor), args.repeat)
+            record("diagnose_batch", scale, {"seconds": round(seconds, 4), "per_second": round(len(batch) / seconds, 1),
+                                             "n": len(batch)})
+        if "http_predict" in stages and scale == 1:
+            record("http_predict", scale, bench_http(model, preprocessor, texts, args.duration, args.concurrency))
+
+    import sklearn
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k != "func"}
+        },
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 {output}")
+
+
+def compare_reports(base, new, threshold):
+    """(satırlar, regresyon sayısı); değişim oranı 'iyi' yönde pozitif"""
+    rows, regressions = [], 0
+    for key in sorted(set(base["results"]) & set(new["results"])):
+        for metric, direction in METRIC_DIRECTIONS.items():
+            old_value, new_value = base["results"][key].get(metric), new["results"][key].get(metric)
+            if not old_value or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value
+            improvement = -change if direction == "lower" else change
+            regressed = improvement < -threshold
+            regressions += regressed
+            rows.append((key, metric, old_value, new_value, change, regressed))
+    return rows, regressions
+
+
+def compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows, regressions = compare_reports(base, new, args.threshold)
+    print(f"base: {base['meta'].get('git_commit')} ({base['meta']['created_at']})  "
+          f"new: {new['meta'].get('git_commit')} ({new['meta']['created_at']})  threshold: {args.threshold:.0%}")
+    print(f"{'benchmark':<24} {'metric':<11} {'base':>12} {'new':>12} {'change':>8}")
+    for key, metric, old_value, new_value, change, regressed in rows:
+        flag = "  ❌ REGRESSION" if regressed else ""
+        print(f"{key:<24} {metric:<11} {old_value:>12.4g} {new_value:>12.4g} {change:>+8.1%}{flag}")
+    missing = sorted(set(base["results"]) - set(new["results"]))
+    if missing:
+        print(f"⚠️ Missing in new run: {', '.join(missing)}")
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write JSON results")
+    run_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    run_parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    run_parser.add_argument("--train-max-scale", type=int, default=10,
+                            help="skip training/diagnosis stages above this scale")
+    run_parser.add_argument("--classifier", help="PetModel classifier backend")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--requests", type=int, default=300, help="single diagnosis calls")
+    run_parser.add_argument("--batch", type=int, default=1000, help="texts per diagnose_many call")
+    run_parser.add_argument("--duration", type=float, default=5, help="seconds of HTTP load")
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--output", help="JSON path (default: benchmarks/results/<timestamp>.json)")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged as regression")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        args.params = {"classifier": args.classifier} if args.classifier else None
+    exit(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,121 @@
 import pandas as pd
 import numpy as np
 from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import math
+import os
 import re
 
+RAW_DIR = os.path.dirname(os.path.abspath(__file__))
+PROCESSED_DIR = os.path.join(os.path.dirname(RAW_DIR), "processed")
+REPO_DIR = os.path.dirname(os.path.dirname(RAW_DIR))
+ALIAS_TABLE_PATH = os.path.join(PROCESSED_DIR, "breed_alias_table.json")
+ALIAS_TABLE_VERSION = 1
+
+
+class BreedNameIndex:
+    """Fuzzy eşleştirme için aday üretme indeksi.
+
+    Tam SequenceMatcher.ratio() yalnızca iki ucuz üst sınırı geçen adaylar için
+    hesaplanır:
+      * uzunluk         - 2*min(la, lb) / (la + lb)        (real_quick_ratio)
+      * karakter sayımı - 2*Σ min(ha[c], hb[c]) / (la + lb) (quick_ratio)
+    İsimler uzunluğa göre sıralı tutulur; uzunluk sınırı eşiği geçebilen
+    aralık (la ∈ [lq*t/(2-t), lq*(2-t)/t]) ikili aramayla bulunur ve yalnızca
+    o aralıktaki isimlere bakılır. İkisi de ratio() için kesin üst sınır
+    olduğundan sonuçlar, tüm çiftleri karşılaştıran yöntemle birebir aynıdır.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int64)
+        # Uzunluğa göre sıralı görünüm (eşit uzunlukta özgün sıra korunur)
+        self.length_order = np.argsort(self.lengths, kind='stable')
+        self.sorted_lengths = self.lengths[self.length_order]
+        self.first_index = {}
+        for i, name in enumerate(self.names):
+            self.first_index.setdefault(name, i)
+
+        self.alphabet = {ch: i for i, ch in enumerate(sorted(set(''.join(self.names))))}
+        self.histograms = np.zeros((len(self.names), max(1, len(self.alphabet))), dtype=np.int32)
+        for row, name in enumerate(self.names):
+            for ch in name:
+                self.histograms[row, self.alphabet[ch]] += 1
+        # seq2 (AKC ismi) sabit kalır; b2j tablosu her isim için bir kez kurulur
+        self._matchers = {}
+
+    def _histogram(self, query):
+        histogram = np.zeros(self.histograms.shape[1], dtype=np.int32)
+        for ch in query:
+            position = self.alphabet.get(ch)
+            if position is not None:
+                histogram[position] += 1
+        return histogram
+
+    def _ratio(self, query, name):
+        matcher = self._matchers.get(name)
+        if matcher is None:
+            matcher = self._matchers[name] = SequenceMatcher(None, '', name)
+        matcher.set_seq1(query)
+        return matcher.ratio()
+
+    def best_match(self, query, threshold):
+        """find_fuzzy_matches ile aynı kural: eşik üstündeki en yüksek skor, eşitlikte ilk isim"""
+        exact = self.first_index.get(query)
+        if exact is not None:
+            # ratio == 1.0 yalnızca birebir aynı isimde mümkündür
+            return self.names[exact], 1.0
+
+        query_length = len(query)
+        if threshold > 0:
+            # Aralık yuvarlamaya karşı bir karakter geniş alınır; kesin sınır aşağıda uygulanır
+            lo = np.searchsorted(self.sorted_lengths, math.floor(query_length * threshold / (2 - threshold)) - 1)
+            hi = np.searchsorted(self.sorted_lengths, math.ceil(query_length * (2 - threshold) / threshold) + 1,
+                                 side='right')
+        else:
+            lo, hi = 0, len(self.names)
+        # Özgün sıraya dön: eşit skorda ilk isim seçilir
+        candidates = np.sort(self.length_order[lo:hi])
+        lengths = self.lengths[candidates]
+        totals = lengths + query_length
+        safe_totals = np.maximum(totals, 1)
+        length_bound = np.where(totals > 0, 2.0 * np.minimum(lengths, query_length) / safe_totals, 1.0)
+        keep = length_bound >= threshold
+        candidates, totals, safe_totals = candidates[keep], totals[keep], safe_totals[keep]
+        if not len(candidates):
+            return None, 0
+
+        overlap = np.minimum(self.histograms[candidates], self._histogram(query)).sum(axis=1)
+        count_bound = np.where(totals > 0, 2.0 * overlap / safe_totals, 1.0)
+        keep = count_bound >= threshold
+        candidates, count_bound = candidates[keep], count_bound[keep]
+
+        best_match, best_score = None, 0
+        for index, bound in zip(candidates.tolist(), count_bound.tolist()):
+            if bound <= best_score:
+                continue
+            similarity = self._ratio(query, self.names[index])
+            if similarity > best_score and similarity >= threshold:
+                best_score = similarity
+                best_match = self.names[index]
+        return best_match, best_score
+
+
+_worker_index = None
+
+
+def _init_match_worker(names):
+    global _worker_index
+    _worker_index = BreedNameIndex(names)
+
+
+def _match_chunk(args):
+    queries, threshold = args
+    return [_worker_index.best_match(query, threshold) for query in queries]
+
+
 class BreedOverlapAnalyzer:
     def __init__(self, ranked_df, akc_df):
         """
@@ -12,7 +125,8 @@ class BreedOverlapAnalyzer:
         self.ranked_df = ranked_df
         self.akc_df = akc_df
         
-    def normalize_breed_name(self, name):
+    @staticmethod
+    def normalize_breed_name(name):
         """Breed isimlerini standardize et"""
         if pd.isna(name):
             return ""
@@ -65,23 +179,29 @@ class BreedOverlapAnalyzer:
             'match_count': len(exact_matches)
         }
     
-    def find_fuzzy_matches(self, threshold=0.8):
-        """Benzer isimleri bul (fuzzy matching)"""
+    def find_fuzzy_matches(self, threshold=0.8, n_jobs=1, chunk_size=500):
+        """Benzer isimleri bul (fuzzy matching)
+
+        Aday üretme indeksi (BreedNameIndex) ile çalışır; n_jobs > 1 ise sorgu
+        isimleri parçalara bölünüp process pool'da eşleştirilir.
+        """
         ranked_breeds = [self.normalize_breed_name(name) for name in self.ranked_df.iloc[:, 0] if pd.notna(name)]
         akc_breeds = [self.normalize_breed_name(name) for name in self.akc_df.iloc[:, 0] if pd.notna(name)]
         
-        fuzzy_matches = []
+        if n_jobs and n_jobs > 1 and len(ranked_breeds) > chunk_size:
+            chunks = [
+                (ranked_breeds[start:start + chunk_size], threshold)
+                for start in range(0, len(ranked_breeds), chunk_size)
+            ]
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_match_worker,
+                                     initargs=(akc_breeds,)) as executor:
+                matches = [match for chunk in executor.map(_match_chunk, chunks) for match in chunk]
+        else:
+            index = BreedNameIndex(akc_breeds)
+            matches = [index.best_match(ranked_breed, threshold) for ranked_breed in ranked_breeds]
         
-        for ranked_breed in ranked_breeds:
-            best_match = None
-            best_score = 0
-            
-            for akc_breed in akc_breeds:
-                similarity = self.calculate_similarity(ranked_breed, akc_breed)
-                if similarity > best_score and similarity >= threshold:
-                    best_score = similarity
-                    best_match = akc_breed
-            
+        fuzzy_matches = []
+        for ranked_breed, (best_match, best_score) in zip(ranked_breeds, matches):
             if best_match:
                 fuzzy_matches.append({
                     'ranked_breed': ranked_breed,
@@ -161,6 +281,152 @@ class BreedOverlapAnalyzer:
             'recommendation': 'merge' if total_overlap_rate >= 70 else 'separate' if total_overlap_rate < 50 else 'partial'
         }
 
+# KANONİK BREED / ALIAS TABLOSU:
+# Kaynaklar öncelik sırasıyla işlenir; ilk kaynak (dog_breeds.csv) kanonik kayıt
+# listesidir, diğer kaynaklardaki isimler ona exact/fuzzy eşlenir.
+BREED_SOURCES = [
+    ('dog_breeds', os.path.join(RAW_DIR, 'dog_breeds.csv'), 'Name'),
+    ('merged_dog_data', os.path.join(PROCESSED_DIR, 'merged_dog_data.csv'), 'Breed'),
+    ('dogs_ranking', os.path.join(RAW_DIR, 'dogs-ranking-dataset.csv'), 'Breed'),
+    ('demographics', os.path.join(RAW_DIR, 'breed_demographics', 'dogs_dataset.csv'), 'Breed'),
+    ('genetic_risks', os.path.join(REPO_DIR, 'pet_diagnosis_data.json'), 'breed_genetic_risks'),
+]
+DEMOGRAPHIC_COLUMNS = ['Breed', 'Age (Years)', 'Weight (kg)', 'Color', 'Gender']
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _json_value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _read_source_names(path, column):
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return list(json.load(f).get(column, {}))
+    return [name for name in pd.read_csv(path)[column] if pd.notna(name)]
+
+
+def _build_breed_records(canonicals, aliases, display_names):
+    """Kanonik breed başına özellik + demografi + genetik risk kaydı"""
+    normalize = BreedOverlapAnalyzer.normalize_breed_name
+    canonicals = set(canonicals)
+
+    merged = pd.read_csv(os.path.join(PROCESSED_DIR, 'merged_dog_data.csv'))
+    merged['canonical'] = merged['Breed'].map(lambda name: aliases.get(normalize(name)))
+    merged = merged[merged['canonical'].isin(canonicals)]
+    attribute_columns = [col for col in merged.columns if col not in DEMOGRAPHIC_COLUMNS + ['canonical']]
+
+    breeds = pd.read_csv(os.path.join(RAW_DIR, 'dog_breeds.csv'))
+    breeds['canonical'] = breeds['Name'].map(lambda name: aliases.get(normalize(name)))
+    breeds = breeds[breeds['canonical'].isin(canonicals)].drop_duplicates('canonical')
+
+    with open(os.path.join(REPO_DIR, 'pet_diagnosis_data.json'), encoding='utf-8') as f:
+        genetic_risks = {
+            aliases.get(normalize(name)): info
+            for name, info in json.load(f).get('breed_genetic_risks', {}).items()
+        }
+
+    records = {
+        canonical: {
+            'name': display_names.get(canonical, canonical),
+            'attributes': None,
+            'demographics': None,
+            'genetic_risks': genetic_risks.get(canonical)
+        }
+        for canonical in canonicals
+    }
+    # Önce AKC özellikleri, merged_dog_data'daki (aynı kolonlar) değerler üzerine yazar
+    for _, row in breeds.iterrows():
+        records[row['canonical']]['attributes'] = {
+            col: _json_value(row[col]) for col in attribute_columns if col in breeds.columns
+        }
+    for canonical, group in merged.groupby('canonical'):
+        first = group.iloc[0]
+        records[canonical]['attributes'] = {col: _json_value(first[col]) for col in attribute_columns}
+        records[canonical]['demographics'] = {
+            'count': int(len(group)),
+            'mean_age_years': round(float(group['Age (Years)'].mean()), 2),
+            'mean_weight_kg': round(float(group['Weight (kg)'].mean()), 2),
+            'min_weight_kg': _json_value(group['Weight (kg)'].min()),
+            'max_weight_kg': _json_value(group['Weight (kg)'].max())
+        }
+    return records
+
+
+def build_breed_alias_table(output_path=ALIAS_TABLE_PATH, threshold=0.88, full=False):
+    """Kanonik breed-alias tablosunu üret ve diske yaz.
+
+    Mevcut tablo varsa artımlı çalışır: yalnızca tabloda olmayan isimler
+    eşleştirilir, yalnızca yeni alias alan ya da kaynağı değişen kanonik
+    kayıtlar yeniden hesaplanır. full=True her şeyi sıfırdan kurar.
+    """
+    normalize = BreedOverlapAnalyzer.normalize_breed_name
+    table = None
+    if not full and os.path.exists(output_path):
+        with open(output_path, encoding='utf-8') as f:
+            table = json.load(f)
+        if table.get('format_version') != ALIAS_TABLE_VERSION or table.get('threshold') != threshold:
+            table = None
+    if table is None:
+        table = {'format_version': ALIAS_TABLE_VERSION, 'threshold': threshold,
+                 'sources': {}, 'aliases': {}, 'display_names': {}, 'records': {}}
+
+    aliases, display_names = table['aliases'], table['display_names']
+    registry = list(table['records'])
+    affected, new_names, fuzzy_aliases = set(), 0, 0
+
+    for priority, (source, path, column) in enumerate(BREED_SOURCES):
+        source_hash = _file_hash(path)
+        source_changed = table['sources'].get(source) != source_hash
+        table['sources'][source] = source_hash
+        if not source_changed:
+            continue
+
+        names = _read_source_names(path, column)
+        index = BreedNameIndex(registry) if registry else None
+        for raw_name in names:
+            key = normalize(raw_name)
+            if not key:
+                continue
+            if key in aliases:
+                # Kaynak değişti: bu breed'in kaydı da tazelenmeli
+                affected.add(aliases[key])
+                continue
+
+            new_names += 1
+            canonical = key
+            if index is not None:
+                match, _ = index.best_match(key, threshold)
+                if match:
+                    canonical = match
+                    fuzzy_aliases += 1
+            if canonical == key:
+                # Sonraki kaynaklar yeni kanonik breed'lere de eşlenebilsin
+                registry.append(key)
+                display_names.setdefault(key, str(raw_name).strip())
+            aliases[key] = canonical
+            affected.add(canonical)
+
+    if affected:
+        table['records'].update(_build_breed_records(affected, aliases, display_names))
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, output_path)
+
+    print(f"📚 Breed alias tablosu: {len(table['records'])} kanonik breed, {len(aliases)} alias "
+          f"({new_names} yeni isim, {fuzzy_aliases} fuzzy eşleşme, {len(affected)} kayıt güncellendi)")
+    return table
+
+
 # GERÇEK VERİ İLE KULLANIM:
 def analyze_real_data():
     """Gerçek veri dosyalarıyla overlap analizi"""
@@ -225,6 +491,7 @@ if __name__ == "__main__":
     print()
     
     analyze_real_data()
+    build_breed_alias_table()
 
 # Manuel test için örnek veri
 def create_sample_data():
@@ -142,37 +142,22 @@ export default function TabOneScreen() {
     console.log(`🗺️ Konum: ${latitude}, ${longitude}`);
     
     try {
-      const url = `${API_BASE_URL}/nearby_vets?lat=${latitude}&lng=${longitude}&radius=10000`;
+      // Telefon vb. detaylar aynı yanıtta gelir (vet başına ayrı /vet_details çağrısı yok)
+      const url = `${API_BASE_URL}/nearby_vets?lat=${latitude}&lng=${longitude}&radius=10000&include_details=true`;
       const response = await fetch(url);
       const data = await response.json();
       
       if (data.status === 'OK' && data.results && data.results.length > 0) {
-        const veterinarians: Veterinarian[] = data.results.map((place: any) => ({
+        const vetsWithDetails: Veterinarian[] = data.results.map((place: any) => ({
           id: place.place_id,
           name: place.name,
           clinic_name: place.name,
           latitude: place.geometry.location.lat,
           longitude: place.geometry.location.lng,
           address: place.vicinity || 'Adres bilgisi yok',
+          phone: place.details?.formatted_phone_number || 'Telefon bilgisi yok'
         }));
         
-        const vetsWithDetails = await Promise.all(
-          veterinarians.map(async (vet) => {
-            try {
-              const detailUrl = `${API_BASE_URL}/vet_details?place_id=${vet.id}`;
-              const detailResponse = await fetch(detailUrl);
-              const detailData = await detailResponse.json();
-              
-              return {
-                ...vet,
-                phone: detailData.result?.formatted_phone_number || 'Telefon bilgisi yok'
-              };
-            } catch {
-              return { ...vet, phone: 'Telefon bilgisi yok' };
-            }
-          })
-        );
-        
         setVets(vetsWithDetails);
         Alert.alert('Başarılı', `${vetsWithDetails.length} veteriner bulundu!`);
       } else {
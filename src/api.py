@@ -1,21 +1,29 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from pydantic import BaseModel
+from fastapi.responses import RedirectResponse, PlainTextResponse
+from pydantic import BaseModel, Field
 import uvicorn
+import asyncio
+import hmac
 import sys
 import os
+import time
 from typing import Optional, List, Dict, Any
 
 # Bir üst klasördeki dosyalara erişmek için
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Gerçek kodlarınızı import edin
-from data_loader import DataLoader
-from preprocessing import Preprocessor
-from model import PetModel
-from clinical_recommendation import ClinicalRecommendation
-from risk_calculator import RiskCalculator
+# Yalnızca hafif modüller burada import edilir. sklearn/pandas/scipy çeken bileşenler
+# (model, veri, risk tabloları, vet indeksi) ilk kullanıldıkları yerde import edilir;
+# böylece port hemen açılır ve /health başlangıç sırasında da cevap verir.
+from inference_executor import InferenceExecutor, InferenceQueueFull
+from micro_batcher import MicroBatcher
+from result_cache import DiagnosisCache
+from http_client import UpstreamHttpClient, CircuitOpenError
+from geo_cache import GeoCache, haversine_m
+from vet_details import VetDetailsService
+from metrics import REGISTRY, TimingMiddleware, timed
+from profiler import SamplingProfiler, MIN_SAMPLE_INTERVAL_MS
 
 app = FastAPI(
     title="🐾 Pet Health Diagnosis API", 
@@ -30,7 +38,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Route bazında istek süresi + aşama süreleri için Server-Timing başlığı
+app.add_middleware(TimingMiddleware)
 
 # Global components
 loader = None
@@ -38,15 +49,49 @@ preprocessor = None
 model = None
 clinical = None
 risk = None
+artifact_manifest = None
+model_loaded_at = None
+model_load_seconds = None
+
+# Model çağrıları event loop'u bloklamasın diye sınırlı havuzda çalışır
+inference = InferenceExecutor()
 
 class SymptomRequest(BaseModel):
     symptoms: str
     pet_type: str = "dog"
+    # Opsiyonel: risk seviyesi hesabı için (ırk genetiği, yaş ve kilo)
+    breed: Optional[str] = None
+    age: Optional[float] = Field(None, ge=0)
+    weight: Optional[float] = Field(None, gt=0)
+    # Opsiyonel: en fazla kaç aday tanı dönsün ve alt olasılık eşiği
+    top_k: Optional[int] = Field(None, ge=1)
+    confidence_threshold: Optional[float] = Field(None, ge=0, le=1)
     
     class Config:
         schema_extra = {
             "example": {
                 "symptoms": "dog vomiting and diarrhea for 3 days not eating",
+                "pet_type": "dog",
+                "breed": "Labrador Retriever",
+                "age": 9,
+                "weight": 32.5,
+                "top_k": 3
+            }
+        }
+
+class BatchSymptomRequest(BaseModel):
+    symptoms: List[str]
+    pet_type: str = "dog"
+    top_k: Optional[int] = Field(None, ge=1)
+    confidence_threshold: Optional[float] = Field(None, ge=0, le=1)
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "symptoms": [
+                    "dog vomiting and diarrhea for 3 days not eating",
+                    "excessive scratching red skin patches"
+                ],
                 "pet_type": "dog"
             }
         }
@@ -59,44 +104,356 @@ class DiagnosisResponse(BaseModel):
     recommendations: List[str]
     risk_level: Optional[str] = None
 
-def initialize_model():
-    """Model ve veriyi yükle"""
-    global loader, preprocessor, model, clinical, risk
-    
-    print("🚀 LOADING PET DIAGNOSIS SYSTEM...")
-    
+class BatchDiagnosisResponse(BaseModel):
+    results: List[DiagnosisResponse]
+    total: int
+
+# Tek istekte kabul edilen en fazla metin sayısı
+MAX_BATCH_SIZE = int(os.environ.get("PET_MAX_BATCH_SIZE", "5000"))
+
+async def run_inference(fn, *args, **kwargs):
+    """Model çağrısını inference havuzunda çalıştır; kuyruk doluysa 503 döndür"""
     try:
-        # Initialize components
-        loader = DataLoader()
-        preprocessor = Preprocessor()
-        model = PetModel()
-        clinical = ClinicalRecommendation()
-        risk = RiskCalculator()
-        
-        print("📦 Components initialized...")
-        
-        # Load datasets
-        if not loader.load_real_datasets():
-            print("❌ No datasets loaded")
-            return False
-        
-        print("📊 Datasets loaded...")
-        
-        # Extract clinical recommendations
-        clinical.extract_real_clinical_recommendations(loader.symptoms_data)
-        print("💊 Clinical recommendations extracted...")
-        
-        # Train model
-        if model.train_improved_model(loader.symptoms_data, preprocessor):
-            print(f"✅ Model loaded successfully! Accuracy: {model.actual_accuracy:.3f}")
-            return True
+        return await inference.run(fn, *args, **kwargs)
+    except InferenceQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.15
+# İstekte top_k verilmezse dönen en fazla aday tanı sayısı (0 = eşiği geçen hepsi)
+DEFAULT_TOP_K = int(os.environ.get("PET_TOP_K", "0")) or None
+
+async def run_diagnosis_batch(cleaned_texts, thresholds, top_k=None):
+    """Aktif modelle skorla; her sonuç onu üreten modelin versiyonunu taşır.
+
+    Model ve versiyon araya await girmeden birlikte alınır (activate_model ikisini
+    birlikte değiştirir); böylece reload sırasında biten sonuçlar da önbelleğe
+    doğru versiyonla yazılır.
+    """
+    active_model, version = model, current_model_version()
+    results = await run_inference(active_model.diagnose_cleaned, cleaned_texts, thresholds, top_k)
+    for result in results:
+        result["model_version"] = version
+    return results
+
+# Opsiyonel: eşzamanlı /predict isteklerini tek batch'te birleştir (PET_MICROBATCH=1)
+micro_batcher = MicroBatcher(run_diagnosis_batch) if MicroBatcher.enabled_from_env() else None
+
+# Tekrarlanan semptom metinleri için sonuç önbelleği (model versiyonuna bağlı)
+result_cache = DiagnosisCache()
+
+# Dış servisler (Overpass / OSM API): havuzlu async istemci + konum önbelleği.
+# Testlerde yerel bir Overpass taklidine yönlendirilebilir.
+OVERPASS_URL = os.environ.get("PET_OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+OSM_API_URL = os.environ.get("PET_OSM_API_URL", "https://www.openstreetmap.org/api/0.6").rstrip("/")
+# Overpass sorguları OSM API çağrılarından yavaştır; istemcinin varsayılanı (PET_HTTP_TIMEOUT, 10s) yerine
+OVERPASS_TIMEOUT = float(os.environ.get("PET_OVERPASS_TIMEOUT", "30"))
+upstream = UpstreamHttpClient()
+geo_cache = GeoCache()
+vet_details = VetDetailsService(upstream, OSM_API_URL)
+
+# Yerel veteriner POI indeksi: auto (dosya varsa kullan), index (zorunlu), overpass (hiç kullanma)
+VETS_SOURCE = os.environ.get("PET_VETS_SOURCE", "auto").lower()
+MAX_VET_RESULTS = 100
+vet_index = None
+vet_index_mtime = None
+
+def get_vet_index():
+    """İndeksi yükle; dosya (ör. diff uygulandıktan sonra) değiştiyse yeniden yükle"""
+    global vet_index, vet_index_mtime
+    if VETS_SOURCE == "overpass":
+        return None
+    from vet_index import VetIndex, VET_INDEX_PATH
+    try:
+        mtime = os.stat(VET_INDEX_PATH).st_mtime_ns
+    except OSError:
+        if VETS_SOURCE == "index":
+            raise HTTPException(status_code=503, detail="Local vet index not available")
+        return None
+    if mtime != vet_index_mtime:
+        try:
+            vet_index, vet_index_mtime = VetIndex.load(VET_INDEX_PATH), mtime
+            print(f"📍 Vet index loaded: {len(vet_index)} veterinarians")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Vet index could not be loaded: {e}")
+            vet_index_mtime = mtime
+            if vet_index is None and VETS_SOURCE == "index":
+                raise HTTPException(status_code=503, detail="Local vet index not available")
+    return vet_index
+
+# Kanonik breed tablosu ilk kullanımda yüklenir (data/processed/breed_alias_table.json)
+breed_resolver = None
+
+def get_breed_resolver():
+    global breed_resolver
+    if breed_resolver is None:
+        from breed_resolver import BreedResolver
+        try:
+            breed_resolver = BreedResolver.load()
+        except (OSError, ValueError) as e:
+            raise HTTPException(status_code=503, detail=f"Breed table not available: {str(e)}")
+    return breed_resolver
+
+# /test ve hot reload doğrulamasında kullanılan örnek vakalar
+# /test vakaları ve kabul edilen birincil tanılar; hot reload yeni modeli bunlarla doğrular
+TEST_CASES = {
+    "dog vomiting and diarrhea for 3 days not eating": ("Digestive Issues",),
+    "cat difficulty walking limping back leg": ("Mobility Problems",),
+    "visible worms in stool weight loss": ("Parasites", "Digestive Issues"),
+    "excessive scratching red skin patches": ("Skin Irritations", "Parasites"),
+    "cat has had no appetite for a few days": ("Digestive Issues",)
+}
+
+# Hot reload: POST /admin/reload_model ya da PET_MODEL_WATCH_INTERVAL ile manifest izleme.
+# Admin endpoint'leri PET_ADMIN_TOKEN tanımlıysa X-Admin-Token başlığını ister;
+# tanımlı değilse yalnızca doğrudan loopback'ten gelen isteklere açıktır.
+ADMIN_TOKEN = os.environ.get("PET_ADMIN_TOKEN")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+reload_lock = asyncio.Lock()
+reload_stats = {"reloads": 0, "rejected": 0, "last_error": None, "last_attempt_at": None}
+
+def activate_model(new_preprocessor, new_model, new_clinical, manifest, load_seconds):
+    """Aktif modeli tek adımda değiştir (araya await girmez).
+
+    Devam eden istekler eski nesnelere tuttukları referanslarla biter; eski
+    modelin ürettiği sonuçlar önbelleğe yazılmaz (bkz. DiagnosisCache.put).
+    """
+    global preprocessor, model, clinical, artifact_manifest, model_loaded_at, model_load_seconds
+    preprocessor, model, clinical, artifact_manifest = new_preprocessor, new_model, new_clinical, manifest
+    model_loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    model_load_seconds = round(load_seconds, 3)
+
+async def reload_model(force=False):
+    """Diskteki artifact'i arka planda yükle, /test vakalarıyla doğrula ve atomik olarak devreye al"""
+    from model_artifact import ModelArtifact
+    from model_reload import ModelReloadError, ModelReloadInProgress, load_candidate, validate_candidate
+    if reload_lock.locked():
+        raise ModelReloadInProgress("A model reload is already in progress")
+    async with reload_lock:
+        reload_stats["last_attempt_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        loop = asyncio.get_running_loop()
+        try:
+            # Yükleme ve doğrulama inference havuzunu meşgul etmeden ayrı thread'de
+            candidate = await loop.run_in_executor(None, load_candidate, ModelArtifact.artifact_dir())
+            version = candidate["manifest"]["artifact_key"]
+            if version == current_model_version() and not force:
+                return {"status": "unchanged", "model_version": version}
+            failures = await loop.run_in_executor(None, validate_candidate, candidate, TEST_CASES)
+            if failures:
+                raise ModelReloadError(f"Validation failed for artifact {version[:12]}", failures)
+        except ModelReloadError as e:
+            reload_stats["rejected"] += 1
+            reload_stats["last_error"] = str(e)
+            raise
+        except Exception as e:
+            reload_stats["rejected"] += 1
+            reload_stats["last_error"] = str(e)
+            raise ModelReloadError(f"Model artifact could not be loaded: {e}")
+
+        previous = current_model_version()
+        activate_model(candidate["preprocessor"], candidate["model"], candidate["clinical"],
+                       candidate["manifest"], candidate["load_seconds"])
+        reload_stats["reloads"] += 1
+        reload_stats["last_error"] = None
+        print(f"🔁 Model reloaded: {(previous or '-')[:12]} -> {version[:12]} ({model_load_seconds:.2f}s)")
+        return {"status": "reloaded", "model_version": version, "previous_version": previous,
+                "load_seconds": model_load_seconds}
+
+# İlk model yüklendikten sonra oluşturulur (bkz. staged_startup)
+artifact_watcher = None
+
+def require_admin(request, token):
+    if ADMIN_TOKEN:
+        if token is None or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+        return
+    # Token yoksa: proxy arkasından gelen istekler de loopback görünür, onlar da reddedilir
+    client_host = request.client.host if request.client else None
+    forwarded = "x-forwarded-for" in request.headers or "forwarded" in request.headers
+    if client_host not in LOOPBACK_HOSTS or forwarded:
+        raise HTTPException(status_code=403, detail="Admin endpoints need PET_ADMIN_TOKEN for non-local clients")
+
+# Çalışma anında açılabilen örnekleyici profiler (/admin/profiler/*)
+profiler = SamplingProfiler()
+
+# /metrics: histogramlara ek olarak okuma anında alınan sayaçlar
+REGISTRY.register_callback("pet_inference_running", "Inference jobs running", "gauge",
+                           lambda: inference.stats()["running"])
+REGISTRY.register_callback("pet_inference_queued", "Inference jobs waiting for a worker", "gauge",
+                           lambda: inference.stats()["queued"])
+REGISTRY.register_callback("pet_inference_rejected_total", "Inference jobs rejected (queue full)", "counter",
+                           lambda: inference.rejected)
+REGISTRY.register_callback("pet_result_cache_hits_total", "Diagnosis result cache hits", "counter",
+                           lambda: result_cache.hits)
+REGISTRY.register_callback("pet_result_cache_misses_total", "Diagnosis result cache misses", "counter",
+                           lambda: result_cache.misses)
+REGISTRY.register_callback("pet_model_load_seconds", "Time taken to load the active model", "gauge",
+                           lambda: model_load_seconds)
+REGISTRY.register_callback("pet_model_reloads_total", "Successful hot model reloads", "counter",
+                           lambda: reload_stats["reloads"])
+
+def current_model_version():
+    return artifact_manifest.get('artifact_key') if artifact_manifest else None
+
+async def diagnose(symptoms, pet_type="dog", confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD, top_k=DEFAULT_TOP_K):
+    """Tekil tanı: önce önbellek, yoksa micro-batcher ya da inference havuzu"""
+    with timed("preprocess"):
+        cleaned_text = preprocessor.advanced_text_preprocessing(symptoms)
+    version = current_model_version()
+    cache_key = (cleaned_text, pet_type, confidence_threshold, top_k)
+    
+    result = result_cache.get(version, cache_key)
+    if result is None:
+        if micro_batcher:
+            result = await micro_batcher.submit(cleaned_text, confidence_threshold, top_k)
         else:
+            result = (await run_diagnosis_batch([cleaned_text], confidence_threshold, top_k))[0]
+        result_cache.put(result["model_version"], cache_key, result)
+    return result
+
+async def diagnose_batch(symptoms_list, pet_type="dog", confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD,
+                         top_k=DEFAULT_TOP_K):
+    """Toplu tanı: önbellekte olmayan metinler tek batch olarak skorlanır"""
+    def preprocess_all():
+        with timed("preprocess"):
+            return [preprocessor.advanced_text_preprocessing(t) for t in symptoms_list]
+    cleaned_texts = await run_inference(preprocess_all)
+    version = current_model_version()
+    cache_keys = [(text, pet_type, confidence_threshold, top_k) for text in cleaned_texts]
+    results = [result_cache.get(version, key) for key in cache_keys]
+    
+    # Aynı batch içindeki tekrarlanan metinler yalnızca bir kez skorlanır
+    missing = {}
+    for i, result in enumerate(results):
+        if result is None:
+            missing.setdefault(cache_keys[i], []).append(i)
+    if missing:
+        missing_keys = list(missing)
+        fresh = await run_diagnosis_batch([key[0] for key in missing_keys], confidence_threshold, top_k)
+        for key, result in zip(missing_keys, fresh):
+            result_cache.put(result["model_version"], key, result)
+            for i in missing[key]:
+                results[i] = result
+    return results
+
+def diagnosis_options(request):
+    """İstekteki (confidence_threshold, top_k); verilmeyenler için varsayılanlar"""
+    threshold = DEFAULT_CONFIDENCE_THRESHOLD if request.confidence_threshold is None else request.confidence_threshold
+    return threshold, DEFAULT_TOP_K if request.top_k is None else request.top_k
+
+def build_diagnosis_response(result, risk_level=None):
+    """Model çıktısını API response formatına dönüştür"""
+    return DiagnosisResponse(
+        primary_diagnosis=result.get('primary_diagnosis', {}),
+        possible_diagnoses=result.get('possible_diagnoses', []),
+        multiple_possibilities=result.get('multiple_possibilities', False),
+        confidence_interpretation=result.get('confidence_interpretation', ''),
+        recommendations=result.get('recommendations', []),
+        risk_level=risk_level
+    )
+
+# Aşamalı başlangıç: "model" aşaması /predict için gerekenleri (preprocessor + artifact),
+# "risk" aşaması ırk tablolarını yükler. Vet indeksi ve breed endpoint'i ilk kullanımda yüklenir.
+startup = {"state": "idle", "stages": {"model": "pending", "risk": "pending"}, "seconds": {}, "error": None}
+# True ise (tek worker, PET_LAZY_STARTUP=1) initialize_model port açıldıktan sonra arka planda çalışır
+background_startup = False
+startup_task = None
+
+def startup_pending():
+    """Başlangıç sürüyor ya da arka plan görevi henüz başlamadı (port açık, model yok)"""
+    return startup["state"] == "starting" or (background_startup and startup["state"] == "idle")
+
+def load_prediction_components():
+    """Preprocessor + model artifact (yoksa/eskiyse yeniden eğitir); tamamlanınca tek adımda devreye alınır"""
+    global loader
+    from data_loader import DataLoader
+    from preprocessing import Preprocessor
+    from model import PetModel
+    from clinical_recommendation import ClinicalRecommendation
+    from model_artifact import ModelArtifact
+    from train import build_artifact, compute_artifact_key
+
+    start = time.perf_counter()
+    new_loader = DataLoader(release_after_use=True)
+    new_preprocessor = Preprocessor()
+    artifact_dir = ModelArtifact.artifact_dir()
+    # Diskteki artifact'in kendi parametreleri (yoksa tuned_params.json / PET_MODEL_* varsayılanları);
+    # bilerek başka bir backend ya da hashing ile eğitilmiş bir artifact'in üzerine yazılmaz
+    new_model = PetModel(ModelArtifact.read_params(artifact_dir))
+    new_clinical = ClinicalRecommendation()
+
+    # Önce diskteki artifact'i dene - taze ise yeniden eğitime gerek yok
+    artifact_key = compute_artifact_key(new_loader, new_model)
+    manifest = ModelArtifact.load(artifact_dir, new_model, new_clinical, expected_key=artifact_key)
+    if manifest:
+        print(f"✅ Model artifact loaded ({manifest['artifact_key'][:12]}). Accuracy: {new_model.actual_accuracy:.3f}")
+    else:
+        print("🔄 Model artifact missing or stale, rebuilding...")
+        manifest = build_artifact(new_loader, new_preprocessor, new_model, new_clinical, artifact_dir, artifact_key)
+        if not manifest:
             print("❌ Model training failed")
             return False
-            
+        print(f"✅ Model loaded successfully! Accuracy: {new_model.actual_accuracy:.3f}")
+
+    loader = new_loader
+    activate_model(new_preprocessor, new_model, new_clinical, manifest, time.perf_counter() - start)
+    return True
+
+def load_risk_components():
+    """Irk genetiği / ömür / kilo tabloları (risk_level için; tanının kendisi bunları beklemez)"""
+    global risk, breed_resolver
+    from data_loader import DataLoader
+    from breed_resolver import BreedResolver
+    from risk_calculator import RiskCalculator
+
+    resolver = breed_resolver
+    if resolver is None:
+        try:
+            resolver = BreedResolver.load()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Breed alias table not available, using plain breed names: {e}")
+    calculator = RiskCalculator(resolver=resolver)
+    calculator.load_breed_data(loader or DataLoader(release_after_use=True))
+    breed_resolver, risk = resolver, calculator
+    return True
+
+def run_startup_stage(name, fn):
+    startup["stages"][name] = "loading"
+    start = time.perf_counter()
+    try:
+        ok = fn()
     except Exception as e:
-        print(f"❌ Initialization error: {str(e)}")
-        return False
+        print(f"❌ Initialization error ({name}): {str(e)}")
+        startup["error"] = f"{name}: {str(e)}"
+        ok = False
+    startup["seconds"][name] = round(time.perf_counter() - start, 3)
+    startup["stages"][name] = "ready" if ok else "failed"
+    return ok
+
+def initialize_model():
+    """Model ve veriyi yükle: önce /predict için gerekenler, ardından risk tabloları.
+
+    Risk tabloları yüklenemezse tanı yine çalışır (risk_level "Unknown" döner).
+    """
+    print("🚀 LOADING PET DIAGNOSIS SYSTEM...")
+    startup["state"] = "starting"
+    ok = run_startup_stage("model", load_prediction_components)
+    if ok:
+        run_startup_stage("risk", load_risk_components)
+    startup["state"] = "ready" if ok else "failed"
+    return ok
+
+def require_model():
+    """Model hazır değilse: başlangıç sürüyorsa 503 + Retry-After, değilse 500"""
+    if model is not None and preprocessor is not None:
+        return
+    if startup_pending():
+        raise HTTPException(status_code=503, detail="Model is loading, please retry",
+                            headers={"Retry-After": "1"})
+    raise HTTPException(status_code=500, detail="Model not initialized")
 
 @app.get("/", include_in_schema=False)
 async def root():
@@ -108,37 +465,57 @@ async def root():
 async def predict_diagnosis(request: SymptomRequest):
     """Ana tanı fonksiyonu - Pet semptomlarını analiz eder ve tanı önerir"""
     try:
-        if not model or not preprocessor:
-            raise HTTPException(status_code=500, detail="Model not initialized")
+        require_model()
         
         # Gerçek model ile tanı yap
-        result = model.multi_label_diagnosis(request.symptoms, preprocessor)
+        result = await diagnose(request.symptoms, request.pet_type, *diagnosis_options(request))
         
-        # Risk hesapla (eğer risk_calculator'da böyle bir fonksiyon varsa)
-        risk_level = None
+        # Risk: tanı olasılıkları + ırk genetiği/yaş/kilo (ırk tabloları köpekler için)
+        risk_level = "Unknown"
         try:
-            # Bu kısmı risk_calculator.py'deki gerçek fonksiyona göre ayarlayın
-            # risk_level = risk.calculate_risk(result)
-            pass
-        except:
+            breed = request.breed if request.pet_type == "dog" else None
+            if risk is None:
+                raise RuntimeError("risk tables are not loaded yet")
+            with timed("risk"):
+                risk_level = risk.calculate_risk(result, breed=breed, age=request.age, weight=request.weight)
+        except Exception as e:
+            print(f"⚠️ Risk calculation error: {str(e)}")
             risk_level = "Unknown"
         
         # API response formatına dönüştür
-        api_response = DiagnosisResponse(
-            primary_diagnosis=result.get('primary_diagnosis', {}),
-            possible_diagnoses=result.get('possible_diagnoses', []),
-            multiple_possibilities=result.get('multiple_possibilities', False),
-            confidence_interpretation=result.get('confidence_interpretation', ''),
-            recommendations=result.get('recommendations', []),
-            risk_level=risk_level
-        )
+        with timed("response"):
+            api_response = build_diagnosis_response(result, risk_level)
         
         return api_response
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@app.post("/predict_batch", response_model=BatchDiagnosisResponse, summary="Batch Pet Health Diagnosis",
+          description="Analyze many symptom descriptions in a single vectorized pass")
+async def predict_batch(request: BatchSymptomRequest):
+    """Toplu tanı - tüm metinler tek seferde vectorize edilip skorlanır"""
+    require_model()
+    if len(request.symptoms) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE})")
+    
+    try:
+        results = await diagnose_batch(request.symptoms, request.pet_type, *diagnosis_options(request))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Batch prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+    
+    with timed("response"):
+        return BatchDiagnosisResponse(
+            results=[build_diagnosis_response(result) for result in results],
+            total=len(results)
+        )
+
 @app.get("/status", summary="API Status", description="Get API status and model information")
 async def api_status():
     """API durumu ve model bilgileri"""
@@ -147,15 +524,36 @@ async def api_status():
         "version": "1.0.0",
         "model_loaded": model is not None,
         "model_accuracy": round(model.actual_accuracy, 3) if model else None,
-        "total_conditions": len(loader.symptoms_data['condition'].unique()) if loader else None,
-        "total_records": len(loader.symptoms_data) if loader else None
+        "classifier": model.params.get('classifier') if model else None,
+        "model_version": current_model_version(),
+        "model_loaded_at": model_loaded_at,
+        "model_load_seconds": model_load_seconds,
+        "model_reload": {**reload_stats, "watch_interval": artifact_watcher.interval if artifact_watcher else None},
+        "startup": startup,
+        "total_conditions": len(model.label_encoder.classes_) if model else None,
+        "total_records": artifact_manifest.get('data_records') if artifact_manifest else None,
+        "inference": inference.stats(),
+        "micro_batching": micro_batcher.stats() if micro_batcher else None,
+        "result_cache": result_cache.stats(),
+        "upstream": upstream.stats(),
+        "geo_cache": geo_cache.stats(),
+        "vet_details_cache": vet_details.stats()
     }
 
 @app.get("/health", summary="Health Check", description="System health and component status")
 async def health_check():
-    """Sistem sağlık kontrolü"""
+    """Sistem sağlık kontrolü: starting (yükleniyor), healthy, degraded (tanı var, risk yok) ya da unhealthy"""
+    if all([loader, preprocessor, model, clinical, risk]):
+        status = "healthy"
+    elif startup_pending():
+        status = "starting"
+    elif model is not None and preprocessor is not None:
+        status = "degraded"
+    else:
+        status = "unhealthy"
     return {
-        "status": "healthy" if all([loader, preprocessor, model, clinical, risk]) else "unhealthy",
+        "status": status,
+        "startup": {"state": startup["state"], "stages": startup["stages"], "seconds": startup["seconds"]},
         "components": {
             "data_loader": loader is not None,
             "preprocessor": preprocessor is not None,
@@ -169,18 +567,13 @@ async def health_check():
 @app.post("/test", summary="Test Diagnosis", description="Run predefined test cases for diagnosis")
 async def test_diagnosis():
     """Test tanı - birkaç örnek case"""
-    test_cases = [
-        "dog vomiting and diarrhea for 3 days not eating",
-        "cat difficulty walking limping back leg", 
-        "visible worms in stool weight loss",
-        "excessive scratching red skin patches",
-        "cat has had no appetite for a few days"
-    ]
+    require_model()
+    test_cases = list(TEST_CASES)
     
     results = []
     for case in test_cases:
         try:
-            result = model.multi_label_diagnosis(case, preprocessor)
+            result = await diagnose(case)
             primary = result.get('primary_diagnosis', {})
             results.append({
                 "input": case,
@@ -189,6 +582,8 @@ async def test_diagnosis():
                 "confidence_level": primary.get('confidence_level', 'Unknown'),
                 "recommendations": result.get('recommendations', [])
             })
+        except HTTPException:
+            raise
         except Exception as e:
             results.append({
                 "input": case,
@@ -201,105 +596,187 @@ async def test_diagnosis():
         "successful_tests": len([r for r in results if 'error' not in r])
     }
 
-@app.get("/nearby_vets", summary="Get Nearby Veterinarians")
-async def get_nearby_vets(lat: float, lng: float, radius: int = 10000):
-    """OpenStreetMap Overpass API - Ücretsiz gerçek veteriner verileri"""
+@app.post("/admin/reload_model", summary="Reload Model",
+          description="Load the current model artifact, validate it on the test cases and swap it in")
+async def admin_reload_model(request: Request, force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """Yeniden başlatmadan yeni model artifact'ini devreye al; doğrulama başarısızsa eski model kalır"""
+    require_admin(request, x_admin_token)
+    from model_reload import ModelReloadError, ModelReloadInProgress
     try:
-        import requests
-        
-        # Overpass API query
-        overpass_url = "https://overpass-api.de/api/interpreter"
-        
-        # Radius'u metre cinsinden kullan
-        query = f"""
-        [out:json];
-        (
-          node["amenity"="veterinary"](around:{radius},{lat},{lng});
-          way["amenity"="veterinary"](around:{radius},{lat},{lng});
-          relation["amenity"="veterinary"](around:{radius},{lat},{lng});
-        );
-        out center;
-        """
-        
-        response = requests.post(overpass_url, data={"data": query}, timeout=30)
-        data = response.json()
-        
-        results = []
-        for element in data.get("elements", []):
-            # Koordinatları al
-            if element["type"] == "node":
-                coords_lat = element["lat"]
-                coords_lng = element["lon"]
-            else:
-                coords_lat = element.get("center", {}).get("lat")
-                coords_lng = element.get("center", {}).get("lon")
-            
-            if not coords_lat or not coords_lng:
-                continue
-                
-            tags = element.get("tags", {})
-            
-            result = {
-                "place_id": f"osm_{element['type']}_{element['id']}",
-                "name": tags.get("name", "İsimsiz Veteriner"),
-                "vicinity": tags.get("addr:street", "") + " " + tags.get("addr:city", ""),
-                "geometry": {
-                    "location": {
-                        "lat": coords_lat,
-                        "lng": coords_lng
-                    }
-                },
-                "rating": None,
-                "opening_hours": {
-                    "open_now": None
-                }
-            }
-            results.append(result)
-        
-        return {
-            "status": "OK",
-            "results": results[:20]
-        }
-            
-    except Exception as e:
-        print(f"Overpass API Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        return await reload_model(force=force)
+    except ModelReloadInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ModelReloadError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "failures": e.failures})
+
+@app.get("/metrics", summary="Prometheus Metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Aşama/istek süre histogramları ve sayaçlar (Prometheus text formatı, worker başına)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/admin/profiler/start", summary="Start Sampling Profiler")
+async def start_profiler(request: Request, interval_ms: Optional[float] = Query(None, ge=MIN_SAMPLE_INTERVAL_MS),
+                         duration: Optional[float] = Query(None, gt=0), x_admin_token: Optional[str] = Header(None)):
+    """Örnekleyici profiler'ı başlat; duration (saniye) sonunda kendiliğinden durur"""
+    require_admin(request, x_admin_token)
+    if not profiler.start(interval_ms=interval_ms, duration=duration):
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    return profiler.stats()
+
+@app.post("/admin/profiler/stop", summary="Stop Sampling Profiler")
+async def stop_profiler(request: Request, x_admin_token: Optional[str] = Header(None)):
+    require_admin(request, x_admin_token)
+    profiler.stop()
+    return profiler.stats()
+
+@app.get("/admin/profiler", summary="Sampling Profiler Output", response_class=PlainTextResponse)
+async def profiler_output(request: Request, limit: int = Query(200, ge=1), x_admin_token: Optional[str] = Header(None)):
+    """Katlanmış yığınlar (flamegraph.pl / speedscope ile görselleştirilebilir)"""
+    require_admin(request, x_admin_token)
+    return PlainTextResponse(profiler.collapsed(limit), headers={
+        "X-Profiler-Samples": str(profiler.samples), "X-Profiler-Running": str(profiler.running).lower()
+    })
+
+async def staged_startup():
+    """Arka planda model + risk aşamaları, ardından artifact izleyicisi"""
+    global artifact_watcher
+    if background_startup and startup["state"] == "idle":
+        await asyncio.get_running_loop().run_in_executor(None, initialize_model)
+    if model is not None and artifact_watcher is None:
+        from model_artifact import ModelArtifact
+        from model_reload import ArtifactWatcher
+        artifact_watcher = ArtifactWatcher(ModelArtifact.artifact_dir(), reload_model).start()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    global startup_task
+    startup_task = asyncio.ensure_future(staged_startup())
+
+@app.on_event("shutdown")
+async def stop_artifact_watcher():
+    if artifact_watcher is not None:
+        artifact_watcher.stop()
+
+@app.get("/breed_info", summary="Breed Info", description="Resolve a breed name to its canonical record")
+async def breed_info(name: str, fuzzy: bool = True):
+    """Serbest metin breed ismini kanonik kayda çöz (özellikler, demografi, genetik riskler)"""
+    match = get_breed_resolver().resolve(name, fuzzy=fuzzy)
+    if match is None:
+        raise HTTPException(status_code=404, detail=f"Unknown breed: {name}")
+    return {"query": name, **match}
+
+async def fetch_overpass_vets(lat, lng, radius):
+    # Radius'u metre cinsinden kullan
+    query = f"""
+    [out:json];
+    (
+      node["amenity"="veterinary"](around:{radius},{lat},{lng});
+      way["amenity"="veterinary"](around:{radius},{lat},{lng});
+      relation["amenity"="veterinary"](around:{radius},{lat},{lng});
+    );
+    out center;
+    """
+    from vet_index import parse_overpass_elements
+    data = await upstream.post_json(OVERPASS_URL, data={"data": query}, timeout=OVERPASS_TIMEOUT)
+    vet_details.prime(data.get("elements", []))
+    return parse_overpass_elements(data)
+
+def page_vets(vets, lat, lng, radius, k, offset, limit):
+    """Overpass sonuçlarını mesafeye göre sırala, yarıçap/k ile sınırla ve sayfala"""
+    nearby = []
+    for vet in vets:
+        location = vet["geometry"]["location"]
+        distance = haversine_m(lat, lng, location["lat"], location["lng"])
+        if distance <= radius:
+            nearby.append((distance, vet))
+    nearby.sort(key=lambda item: item[0])
+    if k is not None:
+        nearby = nearby[:k]
+    return len(nearby), [
+        {**vet, "distance_m": round(distance, 1)} for distance, vet in nearby[offset:offset + limit]
+    ]
+
+@app.get("/nearby_vets", summary="Get Nearby Veterinarians")
+async def get_nearby_vets(lat: float = Query(..., ge=-90, le=90), lng: float = Query(..., ge=-180, le=180),
+                          radius: float = Query(10000, gt=0), k: Optional[int] = Query(None, ge=1),
+                          offset: int = Query(0, ge=0), limit: int = Query(20, ge=1),
+                          include_details: bool = False):
+    """Yakındaki veterinerler, yakından uzağa sıralı ve sayfalı.
+
+    Yerel POI indeksi varsa (src/vet_index.py) çevrimdışı cevaplanır; yoksa
+    OpenStreetMap Overpass API'ye (önbellekli) sorulur. k verilirse yarıçap
+    içindeki en yakın k veteriner döner. include_details=true ise iletişim
+    bilgileri (telefon vb.) her sonuca "details" olarak eklenir.
+    """
+    limit = min(limit, MAX_VET_RESULTS)
+    
+    index = get_vet_index()
+    if index is not None:
+        if k is not None:
+            vets = index.query_knn(lat, lng, k, max_radius_m=radius)
+            total, results = len(vets), vets[offset:offset + limit]
+        else:
+            total, results = index.query_radius(lat, lng, radius, offset=offset, limit=limit)
+        source = "local_index"
+    else:
+        try:
+            # Aynı geohash hücresi + yarıçap kovasındaki istekler tek Overpass sorgusunu paylaşır
+            vets, _ = await geo_cache.get_or_fetch(OVERPASS_URL, lat, lng, radius, fetch_overpass_vets)
+        except CircuitOpenError as e:
+            raise HTTPException(
+                status_code=503,
+                detail="Overpass API unavailable, please retry",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except Exception as e:
+            print(f"Overpass API Error: {str(e)}")
+            raise HTTPException(status_code=502, detail=f"Overpass API error: {str(e)}")
+        total, results = page_vets(vets, lat, lng, radius, k, offset, limit)
+        source = "overpass"
+    
+    if include_details and results:
+        details = await vet_details.get_many([vet["place_id"] for vet in results], index=index)
+        results = [{**vet, "details": details[vet["place_id"]]} for vet in results]
+    
+    return {
+        "status": "OK",
+        "results": results,
+        "total": total,
+        "offset": offset,
+        "next_offset": offset + limit if offset + limit < total else None,
+        "source": source
+    }
+
+class VetDetailsRequest(BaseModel):
+    place_ids: List[str]
 
 @app.get("/vet_details", summary="Get Vet Details")
 async def get_vet_details(place_id: str):
     """OpenStreetMap'ten detay bilgileri"""
-    try:
-        import requests
-        
-        # place_id formatı: osm_node_123456
-        parts = place_id.split("_")
-        if len(parts) != 3:
-            return {"status": "OK", "result": {"formatted_phone_number": "Telefon bilgisi yok"}}
-        
-        element_type = parts[1]
-        element_id = parts[2]
-        
-        # OSM'den detay çek
-        osm_url = f"https://www.openstreetmap.org/api/0.6/{element_type}/{element_id}.json"
-        response = requests.get(osm_url, timeout=10)
-        data = response.json()
-        
-        tags = data.get("elements", [{}])[0].get("tags", {})
-        phone = tags.get("phone", tags.get("contact:phone", "Telefon bilgisi yok"))
-        
-        return {
-            "status": "OK",
-            "result": {"formatted_phone_number": phone}
-        }
-            
-    except Exception as e:
-        return {"status": "OK", "result": {"formatted_phone_number": "Telefon bilgisi yok"}}
+    details = await vet_details.get_many([place_id], index=get_vet_index())
+    return {"status": "OK", "result": details[place_id]}
+
+@app.post("/vet_details", summary="Get Vet Details (bulk)",
+          description="Fetch contact details for many place_ids in one request")
+async def get_vet_details_bulk(request: VetDetailsRequest):
+    """Toplu detay: önbellek / yerel indeks, kalanlar OSM API multi-fetch ile tek seferde"""
+    if len(request.place_ids) > MAX_VET_RESULTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_VET_RESULTS} place_ids per request")
+    details = await vet_details.get_many(request.place_ids, index=get_vet_index())
+    return {"status": "OK", "results": details}
 
 if __name__ == "__main__":
     print("🎯 Starting Pet Diagnosis API...")
+    host = os.environ.get("PET_HOST", "0.0.0.0")
+    port = int(os.environ.get("PET_PORT", "8001"))
+    # PET_WORKERS > 1: model bir kez yüklenir, worker'lar fork ile belleği paylaşır
+    workers = int(os.environ.get("PET_WORKERS", "1"))
+    # Tek worker'da port hemen açılır, model arka planda yüklenir (/health: "starting").
+    # Çok worker'lı modda model paylaşılabilmesi için fork'tan önce yüklenmelidir.
+    lazy = workers <= 1 and os.environ.get("PET_LAZY_STARTUP", "1").lower() not in ("0", "false", "no")
     
     # Önce modeli yükle
-    if initialize_model():
+    if lazy or initialize_model():
         
         print("📋 API will automatically open Swagger UI documentation")
         print("📋 Available endpoints:")
@@ -307,15 +784,26 @@ if __name__ == "__main__":
         print("   • GET  /status    - API status")  
         print("   • GET  /health    - System health")
         print("   • POST /predict   - Diagnosis prediction")
+        print("   • POST /predict_batch - Batch diagnosis prediction")
         print("   • POST /test      - Test diagnosis")
+        print("   • POST /admin/reload_model - Hot reload the model artifact")
+        print("   • GET  /metrics   - Prometheus metrics")
+        print("   • POST /admin/profiler/start|stop, GET /admin/profiler - Sampling profiler")
+        print("   • GET  /breed_info - Canonical breed record")
         print("   • GET  /nearby_vets - Nearby veterinarians (OpenStreetMap)")
         print("   • GET  /vet_details - Veterinarian details")
+        print("   • POST /vet_details - Bulk veterinarian details")
         print("api için tıklayabilirsiniz: http://10.212.87.189:8001")
-        uvicorn.run(app, host="0.0.0.0", port=8001)
+        if workers > 1:
+            from prefork import serve_prefork
+            serve_prefork(app, host, port, workers)
+        else:
+            background_startup = lazy
+            uvicorn.run(app, host=host, port=port)
 
     else:
         print("❌ Failed to initialize model. Cannot start API.")
         print("🔍 Check if these files exist in src folder:")
         print("   • data/raw/pet-health-symptoms-dataset.csv")
         print("   • model.py, data_loader.py, preprocessing.py")
-        exit(1)
\ No newline at end of file
+        exit(1)
@@ -0,0 +1,117 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+BREED_TABLE_PATH = os.environ.get(
+    "PET_BREED_TABLE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "data", "processed", "breed_alias_table.json")
+)
+
+
+def normalize_breed_name(name):
+    """Breed ismini alias tablosunun anahtar formatına getir (analyzer ile aynı kural)"""
+    if name is None:
+        return ""
+    name = re.sub(r'[^\w\s]', '', str(name).lower().strip())
+    return ' '.join(name.split())
+
+
+class BreedResolver:
+    """Serbest metin breed ismini kanonik breed kaydına çözer.
+
+    Tablo data/raw/breed_overlap_analysis.py tarafından üretilir. Exact ve
+    alias eşleşmeleri tek dict araması; bulunamazsa uzunluğa göre daraltılmış,
+    en fazla max_fuzzy_candidates adaylık bir fuzzy arama yapılır ve sonucu
+    sınırlı bir LRU'da tutulur.
+    """
+
+    def __init__(self, table, fuzzy_threshold=0.8, max_fuzzy_candidates=200, fuzzy_cache_size=1024):
+        self.aliases = table.get('aliases', {})
+        self.records = table.get('records', {})
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_fuzzy_candidates = max_fuzzy_candidates
+        self.fuzzy_cache_size = fuzzy_cache_size
+        self._fuzzy_cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Alias anahtarları uzunluğa göre: fuzzy adaylar yalnızca ulaşılabilir uzunluklardan seçilir
+        self._keys_by_length = {}
+        for key in self.aliases:
+            self._keys_by_length.setdefault(len(key), []).append(key)
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        with open(path or BREED_TABLE_PATH, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _candidates(self, key):
+        # ratio = 2*M/(a+b) <= 2*min(a,b)/(a+b); eşiği geçemeyecek uzunluklar elenir
+        n, threshold = len(key), self.fuzzy_threshold
+        lengths = sorted(
+            (length for length in self._keys_by_length
+             if 2 * min(n, length) / (n + length) >= threshold),
+            key=lambda length: abs(length - n)
+        )
+        candidates = []
+        for length in lengths:
+            candidates.extend(self._keys_by_length[length])
+            if len(candidates) >= self.max_fuzzy_candidates:
+                return candidates[:self.max_fuzzy_candidates]
+        return candidates
+
+    def _fuzzy_match(self, key):
+        with self._lock:
+            if key in self._fuzzy_cache:
+                self._fuzzy_cache.move_to_end(key)
+                return self._fuzzy_cache[key]
+
+        best, best_score = None, self.fuzzy_threshold
+        matcher = SequenceMatcher()
+        matcher.set_seq2(key)
+        for candidate in self._candidates(key):
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score or (best is None and score >= best_score):
+                best, best_score = candidate, score
+        result = (best, round(best_score, 3)) if best else (None, 0.0)
+
+        with self._lock:
+            self._fuzzy_cache[key] = result
+            if len(self._fuzzy_cache) > self.fuzzy_cache_size:
+                self._fuzzy_cache.popitem(last=False)
+        return result
+
+    def resolve(self, name, fuzzy=True):
+        """Breed ismini çöz; bulunamazsa None.
+
+        Dönüş: {'canonical', 'matched_by' (exact|alias|fuzzy), 'score', 'record'}
+        """
+        key = normalize_breed_name(name)
+        if not key:
+            return None
+
+        canonical, matched_by, score = self.aliases.get(key), None, 1.0
+        if canonical is not None:
+            matched_by = 'exact' if canonical == key else 'alias'
+        elif fuzzy:
+            alias, score = self._fuzzy_match(key)
+            if alias is None:
+                return None
+            canonical, matched_by = self.aliases[alias], 'fuzzy'
+        else:
+            return None
+
+        return {
+            'canonical': canonical,
+            'matched_by': matched_by,
+            'score': score,
+            'record': self.records.get(canonical)
+        }
@@ -1,34 +1,82 @@
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 
+ACTION_VERBS = ['rule out', 'assess', 'monitor', 'evaluate', 'perform', 'implement', 'emphasize']
+
+# Tüm eylem kalıpları tek pattern'de; lookahead sayesinde örtüşen eşleşmeler de
+# (ör. "assess monitor x" içindeki "monitor x") ayrı ayrı yakalanır
+ACTION_PATTERN = re.compile(rf"(?=((?:{'|'.join(ACTION_VERBS)}) \w+\s?\w*))")
+
+MAX_ACTIONS = 8
+PARALLEL_CHUNK_SIZE = 50000
+
+
+def count_actions(notes):
+    """Not listesindeki eylem ifadelerini say (process pool'da da çalışır)"""
+    counts = Counter()
+    for note in notes:
+        # "\s?\w*" boşlukla bitebilir; "x " ve "x" aynı eylem sayılsın
+        counts.update(action.rstrip() for action in ACTION_PATTERN.findall(note))
+    return counts
+
 
 class ClinicalRecommendation:
     def __init__(self):
         self.real_clinical_recommendations = {}
 
-    def extract_real_clinical_recommendations(self, symptoms_data):
-        for condition in symptoms_data['condition'].unique():
-            if pd.isna(condition):
-                continue
-            condition_data = symptoms_data[symptoms_data['condition'] == condition]
-            all_notes = [str(t).lower() for t in condition_data['text'] if pd.notna(t)]
-            if not all_notes:
-                continue
-            combined_text = ' '.join(all_notes)
-            action_patterns = [
-                r'rule out \w+\s?\w*',
-                r'assess \w+\s?\w*', 
-                r'monitor \w+\s?\w*',
-                r'evaluate \w+\s?\w*',
-                r'perform \w+\s?\w*',
-                r'implement \w+\s?\w*',
-                r'emphasize \w+\s?\w*'
+    def extract_real_clinical_recommendations(self, symptoms_data, n_jobs=1):
+        """Her condition için klinik notlardan en sık geçen eylemleri çıkar.
+
+        Veri tek geçişte condition'a göre gruplanır; her not bir kez taranır.
+        n_jobs > 1 ise notlar parçalara bölünüp process pool'da sayılır.
+        """
+        return self.extract_from_chunks([symptoms_data], n_jobs=n_jobs)
+
+    def extract_from_chunks(self, chunks, n_jobs=1):
+        """extract_real_clinical_recommendations'ın parçalı sürümü (ör. DataLoader.iter_symptoms)"""
+        action_counts, notes_counts, samples = {}, Counter(), {}
+        for chunk in chunks:
+            notes = chunk[['condition', 'text']].dropna()
+            notes = notes.assign(text=notes['text'].astype(str).str.lower())
+            groups = [
+                (condition, group.tolist())
+                for condition, group in notes.groupby('condition', sort=False, observed=True)['text']
             ]
-            extracted_actions = []
-            for pattern in action_patterns:
-                extracted_actions.extend(re.findall(pattern, combined_text))
+
+            if n_jobs and n_jobs > 1:
+                chunk_counts = self._count_parallel(groups, n_jobs)
+            else:
+                chunk_counts = [count_actions(condition_notes) for _, condition_notes in groups]
+
+            for (condition, condition_notes), counts in zip(groups, chunk_counts):
+                action_counts.setdefault(condition, Counter()).update(counts)
+                notes_counts[condition] += len(condition_notes)
+                samples.setdefault(condition, condition_notes[:1])
+
+        for condition, counts in action_counts.items():
+            # Frekansa göre sıralı; eşitlikte ilk görülen önce gelir
+            top_actions = counts.most_common(MAX_ACTIONS)
             self.real_clinical_recommendations[condition] = {
-                'raw_notes_count': len(all_notes),
-                'extracted_actions': list(set(extracted_actions))[:8],
-                'sample_notes': all_notes[:1]
+                'raw_notes_count': notes_counts[condition],
+                'extracted_actions': [action for action, _ in top_actions],
+                'action_counts': dict(top_actions),
+                'sample_notes': samples[condition]
             }
+        return self.real_clinical_recommendations
+
+    @staticmethod
+    def _count_parallel(groups, n_jobs):
+        chunks = [
+            (index, condition_notes[start:start + PARALLEL_CHUNK_SIZE])
+            for index, (_, condition_notes) in enumerate(groups)
+            for start in range(0, len(condition_notes), PARALLEL_CHUNK_SIZE)
+        ]
+        action_counts = [Counter() for _ in groups]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            partials = executor.map(count_actions, [chunk for _, chunk in chunks])
+            # Parçalar sırayla birleştirilir; "ilk görülen" sıralaması korunur
+            for (index, _), partial in zip(chunks, partials):
+                action_counts[index].update(partial)
+        return action_counts
@@ -1,46 +1,288 @@
+import gc
+import hashlib
+import json
+import os
 import pandas as pd
 
+from metrics import pipeline_stage
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow yoksa yalnızca CSV kullanılır
+    pa = None
+    feather = None
+
+# Önbellek okuma/yazma bu hatalarla başarısız olabilir (disk, bozuk/yarım Feather dosyası,
+# ya da karışık tipli kolonların Arrow'a çevrilememesi); hepsi önbellek ıskası sayılır,
+# veri CSV'den yüklenir
+CACHE_ERRORS = (OSError, pa.lib.ArrowException) if pa is not None else (OSError,)
+
+DATA_DIR = os.environ.get(
+    "PET_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "raw")
+)
+PROCESSED_DIR = os.environ.get(
+    "PET_PROCESSED_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "processed")
+)
+
+# CSV'lerin yanına yazılan sıkıştırılmamış Arrow IPC (Feather v2) önbelleği
+CACHE_SUFFIX = ".feather"
+CACHE_META_SUFFIX = ".feather.json"
+CACHE_FORMAT_VERSION = 1
+USE_COLUMNAR_CACHE = os.environ.get("PET_COLUMNAR_CACHE", "1").lower() not in ("0", "false", "no")
+
+# Açık kolon tipleri: tekrar eden etiketler category, sayılar dar tiplerde
+SYMPTOMS_DTYPES = {
+    'text': str,
+    'condition': 'category',
+    'record_type': 'category'
+}
+DOG_GENETICS_DTYPES = {
+    'Breed': str,
+    'type': 'category',
+    'LONGEVITY(YEARS)': 'float32',
+    'NUMBER OF GENETIC AILMENTS': 'Int16',
+    'GENETIC AILMENTS': str
+}
+CAT_DTYPES = {
+    'class': str,
+    'image_count': 'Int32',
+    'avg_width': 'Int32',
+    'avg_height': 'Int32',
+    'min_width': 'Int32',
+    'min_height': 'Int32',
+    'max_width': 'Int32',
+    'max_height': 'Int32',
+    'formats': 'category',
+    'corrupt_files': 'Int32'
+}
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ColumnarCache:
+    """CSV kaynak olarak kalır; yanında mtime/boyut/hash ile doğrulanan Feather kopyası tutulur.
+
+    Taze önbellek CSV ayrıştırması olmadan Arrow IPC'den okunur (dosya memory_map=True
+    ile açılır, ama to_pandas() veriyi pandas belleğine kopyalar - kazanç ayrıştırma
+    süresidir, bellek değil). CSV değiştiyse (ya da dtype ayarları değiştiyse) CSV'den
+    yeniden oluşturulur.
+    """
+
+    @staticmethod
+    def available():
+        return feather is not None and USE_COLUMNAR_CACHE
+
+    @staticmethod
+    def paths(csv_path):
+        return csv_path + CACHE_SUFFIX, csv_path + CACHE_META_SUFFIX
+
+    @staticmethod
+    def _dtypes_signature(dtypes):
+        return {col: str(dtype) for col, dtype in dtypes.items()}
+
+    @staticmethod
+    def is_fresh(csv_path, dtypes):
+        cache_path, meta_path = ColumnarCache.paths(csv_path)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = os.stat(csv_path)
+        except (OSError, ValueError):
+            return False
+        if not os.path.exists(cache_path):
+            return False
+        if meta.get('format_version') != CACHE_FORMAT_VERSION:
+            return False
+        if meta.get('dtypes') != ColumnarCache._dtypes_signature(dtypes):
+            return False
+        if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+            return True
+        # mtime değişti ama içerik aynı olabilir (ör. git checkout): hash'e bak
+        try:
+            if meta.get('size') == stat.st_size and meta.get('sha256') == _file_sha256(csv_path):
+                meta['mtime_ns'] = stat.st_mtime_ns
+                ColumnarCache._write_meta(meta_path, meta)
+                return True
+        except OSError:
+            pass
+        return False
+
+    @staticmethod
+    def _write_meta(meta_path, meta):
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def write(csv_path, df, dtypes):
+        cache_path, meta_path = ColumnarCache.paths(csv_path)
+        stat = os.stat(csv_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        # Sıkıştırmasız: okuma sırasında açma (decompress) maliyeti yok
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        ColumnarCache._write_meta(meta_path, {
+            'format_version': CACHE_FORMAT_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': _file_sha256(csv_path),
+            'dtypes': ColumnarCache._dtypes_signature(dtypes),
+            'rows': len(df)
+        })
+
+    @staticmethod
+    def read_table(csv_path):
+        return feather.read_table(ColumnarCache.paths(csv_path)[0], memory_map=True)
+
+    @staticmethod
+    def read(csv_path):
+        return ColumnarCache.read_table(csv_path).to_pandas()
+
+
 class DataLoader:
-    def __init__(self):
+    DATASETS = ('symptoms', 'dog_genetics', 'cat')
+
+    def __init__(self, data_dir=None, symptoms_path=None, dog_genetics_path=None, cat_path=None,
+                 release_after_use=False, use_cache=None, breed_standards_path=None):
+        data_dir = data_dir or DATA_DIR
+        self.symptoms_path = symptoms_path or os.path.join(data_dir, "pet-health-symptoms-dataset.csv")
+        self.dog_genetics_path = dog_genetics_path or os.path.join(data_dir, "dogs_filtrelenmişgenetik.csv")
+        self.cat_path = cat_path or os.path.join(data_dir, "dataset_stats.csv")
+        self.breed_standards_path = breed_standards_path or os.path.join(data_dir, "dog_breeds.csv")
+        # True ise eğitim/çıkarım bittikten sonra veri setleri bellekten bırakılır
+        self.release_after_use = release_after_use
+        self.use_cache = ColumnarCache.available() if use_cache is None else (use_cache and feather is not None)
         self.symptoms_data = None
         self.dog_genetics_data = None
         self.cat_data = None
 
-    def load_real_datasets(self):
+    @staticmethod
+    def _read_csv(path, dtypes, **kwargs):
+        # Dosyada olmayan kolonların tipleri read_csv'yi bozmasın
+        columns = pd.read_csv(path, nrows=0).columns
+        return pd.read_csv(
+            path, dtype={col: dtype for col, dtype in dtypes.items() if col in columns}, **kwargs
+        )
+
+    def _load(self, path, dtypes):
+        """Taze columnar önbellek varsa onu, yoksa CSV'yi oku (ve önbelleği yenile)"""
+        if self.use_cache and ColumnarCache.is_fresh(path, dtypes):
+            try:
+                with pipeline_stage("load"):
+                    return ColumnarCache.read(path)
+            except CACHE_ERRORS as e:
+                print(f"⚠️ Columnar cache okunamadı, CSV'den yükleniyor ({path}): {e}")
+        with pipeline_stage("load"):
+            df = self._load_csv(path, dtypes)
+        self._write_cache(path, df, dtypes)
+        return df
+
+    def _write_cache(self, path, df, dtypes):
+        """Columnar önbelleği yenile; başarısızlık yalnızca uyarıdır (CSV kaynak olarak kalır)"""
+        if not self.use_cache:
+            return
+        try:
+            ColumnarCache.write(path, df, dtypes)
+        except CACHE_ERRORS as e:
+            print(f"⚠️ Columnar cache yazılamadı ({path}): {e}")
+
+    @staticmethod
+    def _load_csv(path, dtypes):
+        # Tam yükleme tek read_csv: parçalayıp birleştirmek tepe belleği düşürmez
+        # (tüm parçalar concat'e kadar bellekte kalır); akış için iter_symptoms
+        return DataLoader._read_csv(path, dtypes)
+
+    def load_real_datasets(self, datasets=None):
+        """Veri setlerini yükle; datasets verilirse yalnızca onlar (ör. ('symptoms',))"""
+        datasets = datasets or self.DATASETS
         datasets_loaded = 0
-        
+
         # Pet Health Symptoms
-        try:
-            path = r"C:\Users\w11\Desktop\pet_digital_twin\data\raw\pet-health-symptoms-dataset.csv"
-            self.symptoms_data = pd.read_csv(path)
-            print(f"✅ Symptoms dataset: {len(self.symptoms_data)} kayıt")
-            
-            if 'condition' in self.symptoms_data.columns:
-                condition_counts = self.symptoms_data['condition'].value_counts()
-                print("   Condition dağılımı:")
-                for condition, count in condition_counts.head().items():
-                    print(f"     {condition}: {count}")
-            
-            datasets_loaded += 1
-        except Exception as e:
-            print(f"❌ Symptoms dataset yüklenemedi: {e}")
-        
+        if 'symptoms' in datasets:
+            try:
+                self.symptoms_data = self._load(self.symptoms_path, SYMPTOMS_DTYPES)
+                print(f"✅ Symptoms dataset: {len(self.symptoms_data)} kayıt")
+
+                if 'condition' in self.symptoms_data.columns:
+                    condition_counts = self.symptoms_data['condition'].value_counts()
+                    print("   Condition dağılımı:")
+                    for condition, count in condition_counts.head().items():
+                        print(f"     {condition}: {count}")
+
+                datasets_loaded += 1
+            except Exception as e:
+                print(f"❌ Symptoms dataset yüklenemedi: {e}")
+
         # Dog Genetics
-        try:
-            path = r"C:\Users\w11\Desktop\pet_digital_twin\data\raw\dogs_filtrelenmişgenetik.csv"
-            self.dog_genetics_data = pd.read_csv(path)
-            print(f"✅ Dog genetics: {len(self.dog_genetics_data)} kayıt")
-            datasets_loaded += 1
-        except Exception as e:
-            print(f"❌ Dog genetics yüklenemedi: {e}")
-        
+        if 'dog_genetics' in datasets:
+            try:
+                self.dog_genetics_data = self._load(self.dog_genetics_path, DOG_GENETICS_DTYPES)
+                print(f"✅ Dog genetics: {len(self.dog_genetics_data)} kayıt")
+                datasets_loaded += 1
+            except Exception as e:
+                print(f"❌ Dog genetics yüklenemedi: {e}")
+
         # Cat Data
-        try:
-            path = r"C:\Users\w11\Desktop\pet_digital_twin\data\raw\dataset_stats.csv"
-            self.cat_data = pd.read_csv(path)
-            print(f"✅ Cat dataset: {len(self.cat_data)} kayıt")
-            datasets_loaded += 1
-        except Exception as e:
-            print(f"❌ Cat dataset yüklenemedi: {e}")
-        
+        if 'cat' in datasets:
+            try:
+                self.cat_data = self._load(self.cat_path, CAT_DTYPES)
+                print(f"✅ Cat dataset: {len(self.cat_data)} kayıt")
+                datasets_loaded += 1
+            except Exception as e:
+                print(f"❌ Cat dataset yüklenemedi: {e}")
+
         return datasets_loaded > 0
+
+    def iter_symptoms(self, chunksize=50000):
+        """Semptom veri setini tipli DataFrame parçaları halinde oku (tümü belleğe alınmaz)"""
+        table = None
+        if self.use_cache and ColumnarCache.is_fresh(self.symptoms_path, SYMPTOMS_DTYPES):
+            try:
+                table = ColumnarCache.read_table(self.symptoms_path)
+            except CACHE_ERRORS as e:
+                print(f"⚠️ Columnar cache okunamadı, CSV'den yükleniyor ({self.symptoms_path}): {e}")
+        if table is not None:
+            # Memory-map ile açılmış tablo üzerinden: yalnızca o anki parça pandas'a çevrilir
+            for batch in table.to_batches(max_chunksize=chunksize):
+                yield pa.Table.from_batches([batch]).to_pandas()
+            return
+        with self._read_csv(self.symptoms_path, SYMPTOMS_DTYPES, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def release(self, *names):
+        """Verilen (ya da tüm) veri setlerini bırak ve belleği geri kazan"""
+        for name in names or self.DATASETS:
+            setattr(self, f"{name}_data", None)
+        gc.collect()
+
+    def load_breed_standards(self):
+        """dog_breeds.csv: ırk standartları (boy/kilo aralıkları lbs, ömür); bellekte tutulmaz"""
+        return self._load(self.breed_standards_path, {'Name': str})
+
+    def load_processed(self, name, dtypes=None):
+        """data/processed/<name>.csv dosyasını (columnar önbellek üzerinden) oku"""
+        return self._load(os.path.join(PROCESSED_DIR, f"{name}.csv"), dtypes or {})
+
+    def write_processed(self, df, name):
+        """İşlenmiş çıktıyı data/processed altına CSV + columnar önbellek olarak yaz"""
+        os.makedirs(PROCESSED_DIR, exist_ok=True)
+        path = os.path.join(PROCESSED_DIR, f"{name}.csv")
+        df.to_csv(path, index=False)
+        self._write_cache(path, df, {})
+        return path
@@ -0,0 +1,120 @@
+import asyncio
+import bisect
+import math
+import os
+
+from result_cache import TTLCache
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_M = 6371008.8
+
+# Yarıçaplar bu kovalara yuvarlanır; aynı hücre + kova aynı önbellek girdisini paylaşır
+RADIUS_BUCKETS_M = (1000, 2000, 5000, 10000, 20000, 50000)
+
+
+def geohash_encode(lat, lng, precision=6):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash):
+    """Hücrenin (lat_min, lat_max, lng_min, lng_max) sınırları"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlmb = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bucket(radius):
+    index = bisect.bisect_left(RADIUS_BUCKETS_M, radius)
+    # En büyük kovadan geniş sorgular kendi yarıçaplarıyla anahtarlanır
+    return RADIUS_BUCKETS_M[index] if index < len(RADIUS_BUCKETS_M) else int(radius)
+
+
+class GeoCache:
+    """Konum sorguları için geohash hücresi + yarıçap kovası anahtarlı önbellek.
+
+    Bir hücre için upstream'e hücre merkezinden, kova yarıçapı + hücrenin yarı
+    köşegeni kadar sorulur; böylece hücredeki her nokta için kova yarıçapındaki
+    tüm sonuçlar girdide bulunur ve istek yalnızca kendi mesafesine göre süzülür.
+    Aynı anahtar için eşzamanlı kaçırmalar tek bir upstream çağrısında birleşir.
+    """
+
+    def __init__(self, maxsize=None, ttl=None, precision=None):
+        self.precision = precision or int(os.environ.get("PET_GEO_CACHE_PRECISION", "6"))
+        # Anahtar: (upstream kaynağı, geohash, yarıçap kovası)
+        self._cache = TTLCache(
+            maxsize=maxsize if maxsize is not None else int(os.environ.get("PET_GEO_CACHE_SIZE", "2048")),
+            ttl=ttl if ttl is not None else float(os.environ.get("PET_GEO_CACHE_TTL", "3600"))
+        )
+        self._in_flight = {}
+        self.coalesced = 0
+
+    def cell(self, lat, lng, radius):
+        """(anahtar, merkez_lat, merkez_lng, upstream_yarıçapı)"""
+        geohash = geohash_encode(lat, lng, self.precision)
+        bucket = radius_bucket(radius)
+        lat_min, lat_max, lng_min, lng_max = geohash_bounds(geohash)
+        center_lat, center_lng = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+        half_diagonal = haversine_m(center_lat, center_lng, lat_max, lng_max)
+        return (geohash, bucket), center_lat, center_lng, int(math.ceil(bucket + half_diagonal))
+
+    async def get_or_fetch(self, source, lat, lng, radius, fetch):
+        """fetch(center_lat, center_lng, radius) -> öğe listesi; (öğeler, önbellekten_mi)"""
+        key, center_lat, center_lng, fetch_radius = self.cell(lat, lng, radius)
+        items = self._cache.get((source, *key))
+        if items is not None:
+            return items, True
+
+        pending = self._in_flight.get((source, key))
+        if pending is None:
+            # İstemci koparsa (iptal) upstream çağrısı yine tamamlanıp önbelleğe yazılır
+            pending = asyncio.ensure_future(
+                self._fetch_and_store(source, key, fetch, center_lat, center_lng, fetch_radius)
+            )
+            self._in_flight[(source, key)] = pending
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(pending), False
+
+    async def _fetch_and_store(self, source, key, fetch, center_lat, center_lng, fetch_radius):
+        try:
+            items = await fetch(center_lat, center_lng, fetch_radius)
+            self._cache.put((source, *key), items)
+            return items
+        finally:
+            self._in_flight.pop((source, key), None)
+
+    def stats(self):
+        return {**self._cache.stats(), "precision": self.precision, "coalesced": self.coalesced}
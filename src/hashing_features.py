@@ -0,0 +1,74 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class OnlineTfidfHasher:
+    """Sabit bellekli TF-IDF: feature hashing + artımlı güncellenen doküman frekansları.
+
+    Sözlük tutulmaz; n-gram'lar n_features boyutlu bir uzaya hash'lenir. IDF,
+    partial_fit ile görülen dokümanlardan (TfidfVectorizer'daki smooth_idf
+    formülüyle) hesaplanır. Bellek yalnızca n_features uzunluğunda bir sayaç
+    dizisidir; yeni notlar geldikçe baştan fit etmeden güncellenebilir.
+    """
+
+    def __init__(self, n_features=2 ** 16, ngram_range=(1, 3), stop_words='english'):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._idf = None
+
+    # Model eğitim ayarlarında TfidfVectorizer ile aynı alanlar raporlanır
+    @property
+    def max_features(self):
+        return self.n_features
+
+    @property
+    def min_df(self):
+        return 1
+
+    def _hasher(self):
+        # Durumsuz ve ucuz; pickle'a yalnızca ayarlar ve sayaçlar girer
+        return HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=self.ngram_range,
+            stop_words=self.stop_words,
+            alternate_sign=False,
+            norm=None
+        )
+
+    def partial_fit(self, texts):
+        counts = self._hasher().transform(texts)
+        return self._update_frequencies(counts)
+
+    def _update_frequencies(self, counts):
+        # Her satırdaki indeksler tekildir: bincount doğrudan doküman frekansı verir
+        # Yerinde (+=) değil: mmap ile yüklenmiş salt okunur dizilerde de çalışsın
+        self.document_frequency = self.document_frequency + np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        self._idf = None
+        return self
+
+    @property
+    def idf(self):
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+        return self._idf
+
+    def _weight(self, counts):
+        return normalize(counts.multiply(self.idf).tocsr(), norm='l2', copy=False)
+
+    def transform(self, texts):
+        return self._weight(self._hasher().transform(texts))
+
+    def partial_fit_transform(self, texts):
+        counts = self._hasher().transform(texts)
+        self._update_frequencies(counts)
+        return self._weight(counts)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_idf'] = None
+        return state
@@ -0,0 +1,218 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(Exception):
+    """Upstream art arda hata verdi; devre açık, retry_after saniye istek gönderilmez"""
+
+    def __init__(self, host, retry_after):
+        super().__init__(f"Circuit open for {host}, retry after {retry_after}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Host başına devre kesici: closed -> (failure_threshold hata) -> open -> (reset_timeout) -> half_open.
+
+    half_open durumunda tek bir deneme isteğine izin verilir; başarılıysa devre
+    kapanır, başarısızsa reset_timeout kadar tekrar açılır.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self):
+        if self.opened_at is None:
+            return 0
+        return max(1, int(self.reset_timeout - (time.monotonic() - self.opened_at) + 0.999))
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.trial_in_flight:
+                    self.times_opened += 1
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened
+        }
+
+
+class UpstreamHttpClient:
+    """Dış servis çağrıları (Overpass, OSM API) için bağlantı havuzlu async istemci.
+
+    Tek bir requests.Session, host başına keep-alive havuzu tutar; bloklayan
+    çağrılar ayrı bir thread havuzunda çalışır, event loop hiç beklemez. Host
+    başına eşzamanlılık bir semaphore ile sınırlanır ve her host'un kendi
+    devre kesicisi vardır. Thread havuzu ve session ilk kullanımda oluşturulur.
+    """
+
+    def __init__(self, max_connections_per_host=None, max_concurrency_per_host=None, timeout=None,
+                 failure_threshold=None, reset_timeout=None, max_workers=None):
+        self.max_connections_per_host = max_connections_per_host or int(
+            os.environ.get("PET_HTTP_POOL_SIZE", "10")
+        )
+        self.max_concurrency_per_host = max_concurrency_per_host or int(
+            os.environ.get("PET_HTTP_HOST_CONCURRENCY", "4")
+        )
+        self.timeout = timeout or float(os.environ.get("PET_HTTP_TIMEOUT", "10"))
+        self.failure_threshold = failure_threshold or int(os.environ.get("PET_HTTP_BREAKER_FAILURES", "5"))
+        self.reset_timeout = reset_timeout or float(os.environ.get("PET_HTTP_BREAKER_RESET", "30"))
+        self.max_workers = max_workers or int(os.environ.get("PET_HTTP_WORKERS", "16"))
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._breakers = {}
+        self._counters = {}
+
+    def _get_session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # Yeniden deneme yok: başarısızlık hemen devre kesiciye yansısın
+                    adapter = HTTPAdapter(
+                        pool_connections=8, pool_maxsize=self.max_connections_per_host, max_retries=0
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="upstream-http"
+                    )
+                    self._session = session
+        return self._session
+
+    def _host_state(self, host):
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+            self._counters[host] = {"requests": 0, "failures": 0, "rejected": 0}
+        return self._breakers[host], self._semaphores[host], self._counters[host]
+
+    @staticmethod
+    def _release_slot(loop, semaphore):
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # event loop kapanmış; semaphore onunla birlikte kullanım dışı
+
+    async def request_json(self, method, url, **kwargs):
+        """HTTP isteği gönder, JSON gövdesini döndür.
+
+        Devre açıksa CircuitOpenError; bağlantı/zaman aşımı/5xx/429 hataları
+        devre kesiciye işlenir ve requests istisnası olarak yükselir.
+        """
+        host = urlparse(url).netloc
+        breaker, semaphore, counters = self._host_state(host)
+        if not breaker.allow():
+            counters["rejected"] += 1
+            raise CircuitOpenError(host, breaker.retry_after())
+
+        session = self._get_session()
+        kwargs.setdefault("timeout", self.timeout)
+        call = functools.partial(session.request, method, url, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            semaphore.release()
+            breaker.release_trial()
+            raise
+        # İstek iptal edilse bile slot, thread'deki çağrı gerçekten bittiğinde serbest kalır
+        # (host başına eşzamanlılık sınırı aşılmaz); semaphore event loop thread'inde bırakılır
+        future.add_done_callback(lambda _: self._release_slot(loop, semaphore))
+        counters["requests"] += 1
+        try:
+            response = await asyncio.wrap_future(future)
+            if response.status_code >= 500 or response.status_code == 429:
+                response.raise_for_status()
+        except (requests.RequestException, OSError):
+            counters["failures"] += 1
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # İstemci koptu: sonuç bilinmiyor, half_open deneme hakkı geri verilir
+            breaker.release_trial()
+            raise
+        breaker.record_success()
+        response.raise_for_status()
+        return response.json()
+
+    async def get_json(self, url, **kwargs):
+        return await self.request_json("GET", url, **kwargs)
+
+    async def post_json(self, url, **kwargs):
+        return await self.request_json("POST", url, **kwargs)
+
+    def stats(self):
+        return {
+            "max_connections_per_host": self.max_connections_per_host,
+            "max_concurrency_per_host": self.max_concurrency_per_host,
+            "timeout_seconds": self.timeout,
+            "hosts": {
+                host: {**self._counters[host], "circuit": breaker.stats()}
+                for host, breaker in list(self._breakers.items())
+            }
+        }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
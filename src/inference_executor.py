@@ -0,0 +1,87 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceQueueFull(Exception):
+    """Havuz + kuyruk dolu; istemci retry_after saniye sonra tekrar denemeli"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """CPU-yoğun model çağrılarını event loop dışında, sınırlı bir havuzda çalıştırır.
+
+    Aynı anda en fazla max_workers iş çalışır, max_queue iş bekler; fazlası
+    InferenceQueueFull ile hemen reddedilir. Thread havuzu ilk kullanımda
+    oluşturulur (fork sonrası güvenli).
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, retry_after=None):
+        self.max_workers = max_workers or int(
+            os.environ.get("PET_INFERENCE_WORKERS", min(4, os.cpu_count() or 1))
+        )
+        self.max_queue = max_queue if max_queue is not None else int(
+            os.environ.get("PET_INFERENCE_QUEUE", "64")
+        )
+        self.retry_after = retry_after or int(os.environ.get("PET_INFERENCE_RETRY_AFTER", "1"))
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="inference"
+                    )
+        return self._executor
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise InferenceQueueFull(self.retry_after)
+            self._pending += 1
+
+        try:
+            # İsteğin context'i (ör. Server-Timing aşama süreleri) worker thread'e taşınır
+            context = contextvars.copy_context()
+            future = self._get_executor().submit(functools.partial(context.run, fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # İstek iptal edilse bile slot, iş gerçekten bittiğinde serbest kalır
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(pending, self.max_workers),
+            "queued": max(0, pending - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
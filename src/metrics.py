@@ -0,0 +1,161 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Aşama süreleri (saniye): tanı yolu milisaniye altı, başlangıç aşamaları saniyeler
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+PIPELINE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# İstek başına aşama süreleri (Server-Timing başlığı için); istek dışında None
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Etiket değeri başına kümülatif olmayan kova sayaçları (Prometheus'a yazarken toplanır).
+
+    observe() tek bir kilit + bisect; üretimde açık bırakılacak kadar ucuzdur.
+    """
+
+    def __init__(self, name, help_text, buckets, label="stage"):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for label_value, (counts, total, count) in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+class Registry:
+    """Histogramlar + render anında okunan gauge/counter geri çağrıları"""
+
+    def __init__(self):
+        self.histograms = []
+        self.callbacks = []
+
+    def histogram(self, name, help_text, buckets, label="stage"):
+        histogram = Histogram(name, help_text, buckets, label)
+        self.histograms.append(histogram)
+        return histogram
+
+    def register_callback(self, name, help_text, metric_type, fn):
+        """fn() -> sayı; /metrics her okunduğunda çağrılır (ör. kuyruk uzunluğu)"""
+        self.callbacks.append((name, help_text, metric_type, fn))
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for name, help_text, metric_type, fn in self.callbacks:
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram(
+    "pet_diagnosis_stage_seconds", "Time spent in each stage of the diagnosis path", STAGE_BUCKETS
+)
+PIPELINE_SECONDS = REGISTRY.histogram(
+    "pet_pipeline_stage_seconds", "Time spent in startup/training pipeline stages", PIPELINE_BUCKETS
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "pet_http_request_seconds", "HTTP request latency by route", REQUEST_BUCKETS, label="route"
+)
+
+
+def record(histogram, stage, seconds):
+    histogram.observe(stage, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage, histogram=STAGE_SECONDS):
+    """with timed("vectorize"): ... - süreyi histograma ve (varsa) isteğin Server-Timing'ine yazar"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(histogram, stage, time.perf_counter() - start)
+
+
+def pipeline_stage(stage):
+    """Başlangıç/eğitim aşamaları için timed() kısayolu"""
+    return timed(stage, PIPELINE_SECONDS)
+
+
+class TimingMiddleware:
+    """Saf ASGI middleware: istek süresini route bazında ölçer, Server-Timing başlığı ekler.
+
+    Aşamalar isteğin context'inde (contextvars) toplanır; inference havuzuna
+    gönderilen işler context'i taşır (InferenceExecutor). Route etiketi
+    yalnızca uygulamada tanımlı yollar için kullanılır, diğerleri "other"
+    sayılır (etiket sayısı sınırlı kalır).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes = None
+
+    def _route(self, scope):
+        if self._routes is None:
+            self._routes = {route.path for route in getattr(scope.get("app"), "routes", [])}
+        path = scope.get("path", "")
+        return path if path in self._routes else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in timings.items()]
+                entries.append(f"total;dur={total_ms:.3f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(entries).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            REQUEST_SECONDS.observe(self._route(scope), time.perf_counter() - start)
@@ -0,0 +1,109 @@
+import asyncio
+import bisect
+import os
+import time
+
+
+class MicroBatcher:
+    """Eşzamanlı tekil istekleri kısa bir pencerede toplayıp tek batch olarak çalıştırır.
+
+    run_batch(texts, thresholds, top_ks) -> sonuç listesi döndüren bir coroutine olmalı.
+    Bir batch, max_batch_size isteğe ulaşınca ya da ilk istek max_wait_ms kadar
+    beklediğinde gönderilir; sonuçlar bekleyen her isteğe geri dağıtılır.
+    """
+
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+    QUEUE_DELAY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+    def __init__(self, run_batch, max_batch_size=None, max_wait_ms=None):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size or int(os.environ.get("PET_MICROBATCH_MAX_SIZE", "32"))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(
+            os.environ.get("PET_MICROBATCH_MAX_WAIT_MS", "5")
+        )
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+        self.batches = 0
+        self.items = 0
+        self.batch_size_counts = [0] * (len(self.BATCH_SIZE_BUCKETS) + 1)
+        self.queue_delay_counts = [0] * (len(self.QUEUE_DELAY_BUCKETS_MS) + 1)
+        self.queue_delay_sum_ms = 0.0
+        self.queue_delay_max_ms = 0.0
+
+    @staticmethod
+    def enabled_from_env():
+        return os.environ.get("PET_MICROBATCH", "0").lower() in ("1", "true", "yes")
+
+    async def submit(self, text, confidence_threshold=0.15, top_k=None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, confidence_threshold, future, time.perf_counter(), top_k))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            # İptal edilmiş (istemcisi kopmuş) istekleri batch'e katma
+            batch = [item for item in batch if not item[2].done()]
+            if batch:
+                self._record(batch)
+                task = asyncio.ensure_future(self._run(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        texts = [item[0] for item in batch]
+        thresholds = [item[1] for item in batch]
+        top_ks = [item[4] for item in batch]
+        try:
+            results = await self.run_batch(texts, thresholds, top_ks)
+        except BaseException as e:
+            for _, _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future, _, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record(self, batch):
+        now = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_size_counts[bisect.bisect_left(self.BATCH_SIZE_BUCKETS, len(batch))] += 1
+        for item in batch:
+            delay_ms = (now - item[3]) * 1000
+            self.queue_delay_counts[bisect.bisect_left(self.QUEUE_DELAY_BUCKETS_MS, delay_ms)] += 1
+            self.queue_delay_sum_ms += delay_ms
+            self.queue_delay_max_ms = max(self.queue_delay_max_ms, delay_ms)
+
+    @staticmethod
+    def _histogram(buckets, counts):
+        labels = [f"<={b}" for b in buckets] + [f">{buckets[-1]}"]
+        return dict(zip(labels, counts))
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "items": self.items,
+            "pending": len(self._pending),
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "batch_size_histogram": self._histogram(self.BATCH_SIZE_BUCKETS, self.batch_size_counts),
+            "avg_queue_delay_ms": round(self.queue_delay_sum_ms / self.items, 3) if self.items else None,
+            "max_queue_delay_ms": round(self.queue_delay_max_ms, 3),
+            "queue_delay_histogram_ms": self._histogram(self.QUEUE_DELAY_BUCKETS_MS, self.queue_delay_counts)
+        }
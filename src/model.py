@@ -1,16 +1,120 @@
+import os
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import ComplementNB
 from sklearn.metrics import accuracy_score, classification_report
 
+from hashing_features import OnlineTfidfHasher
+from metrics import timed, pipeline_stage
+from risk_calculator import RiskCalculator
+
+
+def _random_forest(params, n_rows):
+    n_estimators = params['n_estimators'] or min(200, max(50, n_rows // 10))
+    max_depth = params['max_depth'] or min(20, max(5, n_rows // 100 + 5))
+    min_samples_split = params['min_samples_split'] or max(2, n_rows // 500)
+    estimator = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        random_state=params['random_state']
+    )
+    return estimator, {
+        'n_estimators': n_estimators,
+        'max_depth': max_depth,
+        'min_samples_split': min_samples_split
+    }
+
+
+def _logistic_regression(params, n_rows):
+    C = params['C'] or 10.0
+    estimator = LogisticRegression(C=C, max_iter=1000, random_state=params['random_state'])
+    return estimator, {'C': C}
+
+
+def _sgd(params, n_rows):
+    alpha = params['alpha'] or 1e-4
+    # log_loss: predict_proba olasılık verir (eşik ve güven seviyeleri anlamlı kalır)
+    estimator = SGDClassifier(loss='log_loss', alpha=alpha, max_iter=1000, tol=1e-4,
+                              random_state=params['random_state'])
+    return estimator, {'alpha': alpha}
+
+
+def _complement_nb(params, n_rows):
+    alpha = params['alpha'] or 0.3
+    return ComplementNB(alpha=alpha), {'alpha': alpha}
+
+
+# Sınıflandırıcı backend'leri: isim -> (params, satır sayısı) -> (estimator, kaydedilen ayarlar).
+# Hepsi aynı TF-IDF özellikleri üzerinde çalışır ve predict_proba sağlar.
+CLASSIFIER_BACKENDS = {
+    'random_forest': _random_forest,
+    'logistic_regression': _logistic_regression,
+    'sgd': _sgd,
+    'complement_nb': _complement_nb
+}
+
+# 'tfidf': sözlüklü TfidfVectorizer; 'hashing': sabit bellekli OnlineTfidfHasher +
+# partial_fit (parça parça eğitim ve yeni notlarla artımlı güncelleme)
+FEATURE_MODES = ('tfidf', 'hashing')
+INCREMENTAL_BACKENDS = ('sgd', 'complement_nb')
+DEFAULT_FEATURES = os.environ.get("PET_MODEL_FEATURES", "tfidf")
+DEFAULT_CLASSIFIER = os.environ.get("PET_MODEL_BACKEND", "sgd" if DEFAULT_FEATURES == "hashing" else "random_forest")
+
+# Olasılık > 0.3 ve > 0.6 eşiklerinin toplamı bu diziye indekstir
+CONFIDENCE_LEVELS = np.array(["Low", "Medium", "High"], dtype=object)
+CONFIDENCE_INTERPRETATIONS = {
+    level: RiskCalculator.interpret_confidence(level) for level in ("High", "Medium", "Low", "Very Low")
+}
+
+
 class PetModel:
-    def __init__(self):
+    # None = veri boyutuna göre otomatik seçilir
+    DEFAULT_PARAMS = {
+        'classifier': DEFAULT_CLASSIFIER,
+        'features': DEFAULT_FEATURES,
+        'hash_features': 2 ** 16,
+        'partial_fit_epochs': 5,
+        'holdout_max_rows': 5000,
+        'n_estimators': None,
+        'max_depth': None,
+        'min_samples_split': None,
+        'tfidf_max_features': None,
+        'ngram_range': None,
+        'min_df': None,
+        'C': None,
+        'alpha': None,
+        'augmentation_factor': 1,
+        'augmentation_max_rows': 1000,
+        'test_size': 0.2,
+        'random_state': 42
+    }
+
+    def __init__(self, params=None):
+        self.params = dict(self.DEFAULT_PARAMS, **(params or {}))
+        if self.params['classifier'] not in CLASSIFIER_BACKENDS:
+            raise ValueError(
+                f"Unknown classifier backend '{self.params['classifier']}', "
+                f"expected one of: {', '.join(CLASSIFIER_BACKENDS)}"
+            )
+        if self.params['features'] not in FEATURE_MODES:
+            raise ValueError(f"Unknown feature mode '{self.params['features']}', expected one of: {', '.join(FEATURE_MODES)}")
+        if self.params['features'] == 'hashing' and self.params['classifier'] not in INCREMENTAL_BACKENDS:
+            raise ValueError(
+                f"Feature mode 'hashing' needs an incremental classifier ({', '.join(INCREMENTAL_BACKENDS)}), "
+                f"got '{self.params['classifier']}'"
+            )
         self.vectorizer = None
         self.label_encoder = LabelEncoder()
         self.model = None
         self.actual_accuracy = None
         self.actual_classification_report = None
+        self.training_params = None
+        self.training_records = None
 
     def configure_optimized_vectorizer(self, texts):
         data_size = len(texts)
@@ -26,6 +130,13 @@ class PetModel:
             max_features = min(1500, data_size // 3)
             ngram_range = (1, 3)
             min_df = 3
+
+        if self.params['tfidf_max_features'] is not None:
+            max_features = self.params['tfidf_max_features']
+        if self.params['ngram_range'] is not None:
+            ngram_range = tuple(self.params['ngram_range'])
+        if self.params['min_df'] is not None:
+            min_df = self.params['min_df']
         
         self.vectorizer = TfidfVectorizer(
             max_features=max_features,
@@ -37,30 +148,41 @@ class PetModel:
 
     def train_improved_model(self, df, preprocessor):
         df = df.dropna(subset=['text', 'condition'])
-        df = preprocessor.simple_data_augmentation(df)
-        df['processed_text'] = df['text'].apply(preprocessor.advanced_text_preprocessing)
+        if self.incremental:
+            return self.train_incremental([df], preprocessor, sorted(df['condition'].astype(str).unique()))
+        with pipeline_stage("augment"):
+            df = preprocessor.simple_data_augmentation(
+                df,
+                expansion_factor=self.params['augmentation_factor'],
+                max_rows=self.params['augmentation_max_rows']
+            )
+        with pipeline_stage("preprocess"):
+            df['processed_text'] = df['text'].apply(preprocessor.advanced_text_preprocessing)
         self.configure_optimized_vectorizer(df['processed_text'])
         
-        X = self.vectorizer.fit_transform(df['processed_text'])
+        with pipeline_stage("vectorize"):
+            X = self.vectorizer.fit_transform(df['processed_text'])
         y = self.label_encoder.fit_transform(df['condition'])
         
+        random_state = self.params['random_state']
         if len(df) >= 20:
             X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
+                X, y, test_size=self.params['test_size'], random_state=random_state, stratify=y
             )
         else:
             X_train, X_test, y_train, y_test = X, X, y, y
         
-        n_estimators = min(200, max(50, len(df) // 10))
-        max_depth = min(20, max(5, len(df) // 100 + 5))
-        
-        self.model = RandomForestClassifier(
-            n_estimators=n_estimators,
-            max_depth=max_depth,
-            min_samples_split=max(2, len(df)//500),
-            random_state=42
-        )
-        self.model.fit(X_train, y_train)
+        self.model, classifier_params = CLASSIFIER_BACKENDS[self.params['classifier']](self.params, len(df))
+        with pipeline_stage("fit"):
+            self.model.fit(X_train, y_train)
+        self.training_records = len(df)
+        self.training_params = {
+            'classifier': self.params['classifier'],
+            **classifier_params,
+            'tfidf_max_features': self.vectorizer.max_features,
+            'ngram_range': list(self.vectorizer.ngram_range),
+            'min_df': self.vectorizer.min_df
+        }
         
         y_pred = self.model.predict(X_test)
         self.actual_accuracy = accuracy_score(y_test, y_pred)
@@ -70,37 +192,218 @@ class PetModel:
         )
         return True
 
-    def multi_label_diagnosis(self, symptom_description, preprocessor, confidence_threshold=0.15):
-        from risk_calculator import RiskCalculator  # Confidence yorumları için
-
-        cleaned_text = preprocessor.advanced_text_preprocessing(symptom_description)
-        text_vector = self.vectorizer.transform([cleaned_text])
-        probabilities = self.model.predict_proba(text_vector)[0]
-
-        predictions = []
-        for i, prob in enumerate(probabilities):
-            condition = self.label_encoder.classes_[i]
-            if prob >= confidence_threshold:
-                confidence_level = "High" if prob > 0.6 else "Medium" if prob > 0.3 else "Low"
-                predictions.append({
-                    "condition": condition,
-                    "probability": round(prob, 3),
-                    "percentage": round(prob*100, 1),
-                    "confidence_level": confidence_level
-                })
-
-        predictions.sort(key=lambda x: x['probability'], reverse=True)
-        primary = predictions[0] if predictions else {
-            "condition": "Uncertain",
-            "probability": 0.0,
-            "percentage": 0.0,
-            "confidence_level": "Very Low"
-        }
+    @property
+    def incremental(self):
+        return self.params['features'] == 'hashing'
+
+    def configure_hashing_vectorizer(self):
+        ngram_range = tuple(self.params['ngram_range'] or (1, 3))
+        self.vectorizer = OnlineTfidfHasher(n_features=self.params['hash_features'], ngram_range=ngram_range)
+        return self.vectorizer
+
+    @property
+    def partial_fit_epochs(self):
+        # Naive Bayes partial_fit yalnızca sayaç toplar: aynı parçayı tekrar görmek sayaçları
+        # katlar ve alpha yumuşatmasını epoch sayısına bölmüş olur; tek geçiş hem doğru hem yeterli
+        return 1 if self.params['classifier'] == 'complement_nb' else self.params['partial_fit_epochs']
+
+    def _partial_fit_chunk(self, X, y, rng):
+        epochs = self.partial_fit_epochs
+        for _ in range(epochs):
+            order = rng.permutation(len(y)) if epochs > 1 else slice(None)
+            self.model.partial_fit(X[order], y[order], classes=self._class_ids)
 
-        return {
-            "primary_diagnosis": primary,
-            "possible_diagnoses": predictions,
-            "multiple_possibilities": len(predictions) > 1,
-            "confidence_interpretation": RiskCalculator.interpret_confidence(primary['confidence_level']),
-            "recommendations": []  # Klinik öneriler daha sonra eklenebilir
+    def train_incremental(self, chunks, preprocessor, classes):
+        """Hashing + partial_fit ile parça parça (out-of-core) eğitim.
+
+        chunks: 'text' ve 'condition' kolonlu DataFrame parçaları (ör. DataLoader.iter_symptoms).
+        classes: tüm condition etiketleri - partial_fit ilk çağrıda hepsini bilmeli.
+        Her parçanın test_size kadarı (en fazla holdout_max_rows satır) değerlendirme
+        için ayrılır; bellek kullanımı parça boyutu + hash uzayıyla sınırlıdır.
+        """
+        self.label_encoder.fit(list(classes))
+        self._class_ids = np.arange(len(self.label_encoder.classes_))
+        self.configure_hashing_vectorizer()
+        self.model, classifier_params = CLASSIFIER_BACKENDS[self.params['classifier']](self.params, 0)
+
+        rng = np.random.default_rng(self.params['random_state'])
+        holdout_texts, holdout_labels = [], []
+        records = 0
+        for chunk in chunks:
+            chunk = chunk.dropna(subset=['text', 'condition'])
+            if chunk.empty:
+                continue
+            texts = chunk['text'].astype(str).map(preprocessor.advanced_text_preprocessing).tolist()
+            labels = self.label_encoder.transform(chunk['condition'].astype(str))
+            records += len(texts)
+
+            is_holdout = rng.random(len(texts)) < self.params['test_size']
+            room = self.params['holdout_max_rows'] - len(holdout_texts)
+            is_holdout &= np.cumsum(is_holdout) <= room
+            holdout_texts.extend(t for t, h in zip(texts, is_holdout) if h)
+            holdout_labels.extend(labels[is_holdout])
+
+            train_texts = [t for t, h in zip(texts, is_holdout) if not h]
+            if train_texts:
+                with pipeline_stage("vectorize"):
+                    X = self.vectorizer.partial_fit_transform(train_texts)
+                with pipeline_stage("fit"):
+                    self._partial_fit_chunk(X, labels[~is_holdout], rng)
+
+        if records == 0:
+            return False
+        self.training_records = records
+        self.training_params = {
+            'classifier': self.params['classifier'],
+            **classifier_params,
+            'features': 'hashing',
+            'hash_features': self.vectorizer.n_features,
+            'ngram_range': list(self.vectorizer.ngram_range),
+            'partial_fit_epochs': self.partial_fit_epochs,
+            'documents_seen': self.vectorizer.n_documents
         }
+
+        if holdout_texts:
+            y_pred = self.model.predict(self.vectorizer.transform(holdout_texts))
+            self.actual_accuracy = accuracy_score(holdout_labels, y_pred)
+            self.actual_classification_report = classification_report(
+                holdout_labels, y_pred, labels=self._class_ids, target_names=self.label_encoder.classes_,
+                output_dict=True, zero_division=0
+            )
+        return True
+
+    def update(self, df, preprocessor):
+        """Yeni klinik notlarla modeli baştan eğitmeden güncelle (yalnızca hashing modu)"""
+        if not self.incremental or self.model is None:
+            raise ValueError("Incremental updates need a model trained with features='hashing'")
+        df = df.dropna(subset=['text', 'condition'])
+        unknown = set(df['condition'].astype(str)) - set(self.label_encoder.classes_)
+        if unknown:
+            raise ValueError(f"Unknown conditions for incremental update: {', '.join(sorted(unknown))}")
+        if df.empty:
+            return 0
+
+        self._class_ids = np.arange(len(self.label_encoder.classes_))
+        texts = df['text'].astype(str).map(preprocessor.advanced_text_preprocessing).tolist()
+        X = self.vectorizer.partial_fit_transform(texts)
+        self._partial_fit_chunk(X, self.label_encoder.transform(df['condition'].astype(str)),
+                                np.random.default_rng(self.params['random_state']))
+        self.training_records = (self.training_records or 0) + len(texts)
+        self.training_params = dict(self.training_params or {}, documents_seen=self.vectorizer.n_documents)
+        return len(texts)
+
+    def multi_label_diagnosis(self, symptom_description, preprocessor, confidence_threshold=0.15, top_k=None):
+        return self.diagnose_many([symptom_description], preprocessor, confidence_threshold, top_k)[0]
+
+    def diagnose_many(self, symptom_descriptions, preprocessor, confidence_threshold=0.15, top_k=None):
+        """Birden çok metni tek vectorize + tek predict_proba çağrısıyla teşhis et.
+
+        confidence_threshold ve top_k tek bir değer ya da metin başına bir değer olabilir.
+        """
+        cleaned_texts = [preprocessor.advanced_text_preprocessing(t) for t in symptom_descriptions]
+        return self.diagnose_cleaned(cleaned_texts, confidence_threshold, top_k)
+
+    def diagnose_cleaned(self, cleaned_texts, confidence_threshold=0.15, top_k=None):
+        """advanced_text_preprocessing'den geçmiş metinleri teşhis et"""
+        if not cleaned_texts:
+            return []
+        with timed("vectorize"):
+            text_vectors = self.vectorizer.transform(cleaned_texts)
+        with timed("predict_proba"):
+            probabilities = self.model.predict_proba(text_vectors)
+        with timed("build_diagnoses"):
+            return self.build_diagnoses(probabilities, confidence_threshold, top_k)
+
+    def _class_names(self):
+        """label_encoder.classes_ için object dizisi; sınıflar değişince yeniden kurulur"""
+        classes = self.label_encoder.classes_
+        cached = self.__dict__.get('_class_names_cache')
+        if cached is None or cached[0] is not classes:
+            cached = self._class_names_cache = (classes, np.asarray(classes, dtype=object))
+        return cached[1]
+
+    @staticmethod
+    def top_k_indices(probabilities, k):
+        """Satır başına en olası k sınıfın indeksleri, azalan sırada.
+
+        Sıralama 3 basamağa yuvarlanmış olasılığa göredir, eşitlikte küçük sınıf
+        indeksi önce gelir (tam argsort ile aynı sonuç). Anahtarlar tekil olduğu
+        için argpartition ile yalnızca k aday seçilip sadece onlar sıralanır.
+        """
+        n_classes = probabilities.shape[1]
+        keys = np.rint(probabilities * 1000).astype(np.int64) * n_classes + np.arange(n_classes - 1, -1, -1)
+        if k < n_classes:
+            candidates = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(n_classes), keys.shape)
+        order = np.argsort(-np.take_along_axis(keys, candidates, axis=1), axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def build_diagnoses(self, probabilities, confidence_threshold=0.15, top_k=None):
+        """predict_proba çıktısından tanı sözlükleri.
+
+        Satır başına eşiği geçen en fazla top_k sınıf döner (None = sınırsız).
+        Olasılıkların toplamı 1 olduğundan eşiği geçebilecek sınıf sayısı
+        1/eşik ile sınırlıdır; sınıf sayısı ne olursa olsun yalnızca bu kadar
+        aday seçilir ve Python tarafındaki iş aday sayısıyla orantılı kalır.
+        """
+        probabilities = np.asarray(probabilities)
+        n_rows, n_classes = probabilities.shape
+
+        thresholds = np.asarray(confidence_threshold, dtype=float)
+        if thresholds.ndim:
+            thresholds = thresholds[:, np.newaxis]
+        if top_k is None or np.ndim(top_k) == 0:
+            top_k = [top_k] * n_rows
+        limits = np.array([n_classes if k is None else min(int(k), n_classes) for k in top_k])
+
+        # Sıralama yuvarlanmış olasılığa göre olduğundan eşiğin 0.001 altındaki
+        # sınıflar eşiği geçenlerin arasına girebilir; aday sayısına eklenir
+        k = int(limits.max())
+        min_threshold = float(thresholds.min())
+        if min_threshold > 0:
+            k = min(k, int(1 / min_threshold + 1e-9))
+        near = (probabilities < thresholds) & (probabilities >= thresholds - 0.001)
+        k = max(1, min(n_classes, k + int(near.sum(axis=1).max())))
+
+        order = self.top_k_indices(probabilities, k)
+        sorted_probs = np.take_along_axis(probabilities, order, axis=1)
+        passed = sorted_probs >= thresholds
+        passed = (passed & (np.cumsum(passed, axis=1) <= limits[:, np.newaxis])).tolist()
+
+        class_names = self._class_names()
+        sorted_names = class_names[order].tolist()
+        rounded_probs = np.round(sorted_probs, 3).tolist()
+        percentages = np.round(sorted_probs * 100, 1).tolist()
+        confidence_levels = CONFIDENCE_LEVELS[(sorted_probs > 0.3).astype(np.intp) + (sorted_probs > 0.6)].tolist()
+        # Risk motoru eşik/top_k/yuvarlamadan bağımsız olarak tam olasılık satırını kullanır
+        full_rows = probabilities.astype(np.float32)
+
+        results = []
+        for row, row_passed in enumerate(passed):
+            predictions = [
+                {
+                    "condition": sorted_names[row][i],
+                    "probability": rounded_probs[row][i],
+                    "percentage": percentages[row][i],
+                    "confidence_level": confidence_levels[row][i]
+                }
+                for i, ok in enumerate(row_passed) if ok
+            ]
+            primary = predictions[0] if predictions else {
+                "condition": "Uncertain",
+                "probability": 0.0,
+                "percentage": 0.0,
+                "confidence_level": "Very Low"
+            }
+            results.append({
+                "primary_diagnosis": primary,
+                "possible_diagnoses": predictions,
+                "multiple_possibilities": len(predictions) > 1,
+                "confidence_interpretation": CONFIDENCE_INTERPRETATIONS[primary['confidence_level']],
+                "recommendations": [],  # Klinik öneriler daha sonra eklenebilir
+                # API yanıtına girmez: sınıf sırası "classes" ile aynı (paylaşılan dizi)
+                "class_probabilities": full_rows[row].copy(),
+                "classes": class_names
+            })
+        return results
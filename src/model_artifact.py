@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import sklearn
+
+from metrics import pipeline_stage
+
+# Artifact formatı değişirse artırın - eski artifact'ler otomatik olarak stale sayılır
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# tune.py'nin bulduğu en iyi hiperparametreler; train.py ve API bunları varsayılan alır
+TUNED_PARAMS_NAME = "tuned_params.json"
+
+DEFAULT_ARTIFACT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "pet_model"
+)
+
+
+class ModelArtifact:
+    """Eğitilmiş PetModel + klinik önerilerin diskteki versiyonlu hali.
+
+    Dizin yapısı:
+        manifest.json              - versiyon, anahtar, metrikler, klinik öneriler
+        estimators-<key>.joblib    - vectorizer, label encoder ve sınıflandırıcı
+        tuned_params.json          - (opsiyonel) tune.py'nin seçtiği parametreler + rapor
+
+    manifest.json'daki "params" artifact'in yapılandırmasıdır; API ve train.py
+    ortam değişkenlerindeki varsayılanlar yerine onu kullanır (bkz. read_params).
+
+    Manifest en son ve atomik olarak yazılır; okuyucular hiçbir zaman yarım
+    yazılmış bir artifact görmez.
+    """
+
+    @staticmethod
+    def artifact_dir():
+        return os.environ.get("PET_MODEL_DIR", DEFAULT_ARTIFACT_DIR)
+
+    @staticmethod
+    def compute_key(data_paths, params, extra=None):
+        """Eğitim verisi + hiperparametrelerden (+ ön işleme ayarları) artifact anahtarı üret.
+
+        Veri dosyalarından biri okunamazsa None döner (tazelik kontrol edilemez).
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format={ARTIFACT_FORMAT_VERSION};sklearn={sklearn.__version__}".encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        if extra:
+            digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+        for path in data_paths:
+            try:
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+            except OSError:
+                return None
+        return digest.hexdigest()
+
+    @staticmethod
+    def read_manifest(directory):
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def read_tuned_params(directory):
+        """Arama sonucu kaydedilmiş PetModel parametreleri (yoksa boş sözlük)"""
+        try:
+            with open(os.path.join(directory, TUNED_PARAMS_NAME), encoding="utf-8") as f:
+                return json.load(f).get("params", {})
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def read_params(directory):
+        """Dizindeki artifact'in eğitildiği PetModel parametreleri.
+
+        Manifest varsa onun parametreleri (train.py --classifier/--features ya da
+        tune.py ile bilerek seçilmiş yapılandırma korunur), yoksa tuned_params.json.
+        Tazelik bu parametrelerle hesaplanan anahtara göre kontrol edilir; böylece
+        yalnızca veri veya ön işleme değişince yeniden eğitilir.
+        """
+        manifest = ModelArtifact.read_manifest(directory)
+        if manifest and isinstance(manifest.get("params"), dict):
+            return dict(manifest["params"])
+        return ModelArtifact.read_tuned_params(directory)
+
+    @staticmethod
+    def write_tuned_params(directory, params, report):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{TUNED_PARAMS_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"params": params, **report}, f, ensure_ascii=False, indent=2, default=float)
+        os.replace(tmp_path, os.path.join(directory, TUNED_PARAMS_NAME))
+
+    @staticmethod
+    def is_fresh(manifest, expected_key):
+        if not manifest or manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            return False
+        # Artımlı güncellenmiş artifact'ler türedikleri eğitimin anahtarıyla karşılaştırılır
+        base_key = manifest.get("base_key", manifest.get("artifact_key"))
+        return expected_key is None or base_key == expected_key
+
+    @staticmethod
+    def save(directory, model, clinical, artifact_key, data_records=None, base_key=None, updates=None):
+        os.makedirs(directory, exist_ok=True)
+        estimators_name = f"estimators-{artifact_key[:16]}.joblib"
+
+        # Sıkıştırma yok: joblib ancak sıkıştırılmamış numpy dizilerini mmap edebilir.
+        # Aynı anahtarla yeniden kaydederken dosya yerinde yazılmaz: mmap etmiş bir
+        # süreç varken kesilen dosya onu SIGBUS ile düşürür. Geçici dosyaya yazılıp
+        # os.replace ile değiştirilir; eski inode açık mmap'ler kapanana dek yaşar.
+        tmp_estimators = os.path.join(directory, f".{estimators_name}.{os.getpid()}.tmp")
+        with pipeline_stage("artifact_save"):
+            joblib.dump(
+                {
+                    "vectorizer": model.vectorizer,
+                    "label_encoder": model.label_encoder,
+                    "model": model.model,
+                },
+                tmp_estimators,
+            )
+        os.replace(tmp_estimators, os.path.join(directory, estimators_name))
+
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "artifact_key": artifact_key,
+            "base_key": base_key or artifact_key,
+            "updates": updates or [],
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sklearn_version": sklearn.__version__,
+            "estimators_file": estimators_name,
+            "params": model.params,
+            "training_params": model.training_params,
+            "training_records": model.training_records,
+            "data_records": data_records,
+            "classes": [str(c) for c in model.label_encoder.classes_],
+            "accuracy": model.actual_accuracy,
+            "classification_report": model.actual_classification_report,
+            "clinical_recommendations": clinical.real_clinical_recommendations,
+        }
+        tmp_path = os.path.join(directory, f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, default=float)
+        os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+
+        # Artık referans verilmeyen eski estimator dosyalarını temizle
+        for name in os.listdir(directory):
+            if name.startswith("estimators-") and name != estimators_name:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+        return manifest
+
+    @staticmethod
+    def load(directory, model, clinical, expected_key=None, mmap_mode="r"):
+        """Taze bir artifact varsa model/clinical nesnelerine yükle.
+
+        Artifact yoksa, formatı eskiyse veya anahtarı uyuşmuyorsa None döner.
+        Diziler varsayılan olarak salt okunur mmap edilir; modeli yerinde
+        güncelleyecek çağıranlar (artımlı eğitim) mmap_mode=None vermeli.
+        mmap yalnızca düz numpy dizilerinde (ör. doğrusal modellerin katsayıları)
+        dosyaya bağlı kalır; RandomForest ağaç dizileri Tree.__setstate__ içinde
+        kopyalanır ve her süreçte özel bellektir. Worker'lar arası paylaşım için
+        prefork'un copy-on-write'ına güvenilir (bkz. prefork.serve_prefork).
+        """
+        manifest = ModelArtifact.read_manifest(directory)
+        if not ModelArtifact.is_fresh(manifest, expected_key):
+            return None
+
+        with pipeline_stage("artifact_load"):
+            estimators = joblib.load(
+                os.path.join(directory, manifest["estimators_file"]), mmap_mode=mmap_mode
+            )
+        model.vectorizer = estimators["vectorizer"]
+        model.label_encoder = estimators["label_encoder"]
+        model.model = estimators["model"]
+        model.params = manifest["params"]
+        model.training_params = manifest["training_params"]
+        model.training_records = manifest["training_records"]
+        model.actual_accuracy = manifest["accuracy"]
+        model.actual_classification_report = manifest["classification_report"]
+        clinical.real_clinical_recommendations = manifest["clinical_recommendations"]
+        return manifest
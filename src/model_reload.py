@@ -0,0 +1,156 @@
+import asyncio
+import math
+import os
+import time
+
+import sklearn
+
+from preprocessing import Preprocessor
+from model import PetModel
+from clinical_recommendation import ClinicalRecommendation
+from model_artifact import ModelArtifact, MANIFEST_NAME
+
+
+class ModelReloadError(Exception):
+    """Yeni artifact yüklenemedi ya da doğrulamadan geçemedi; aktif model değişmez"""
+
+    def __init__(self, message, failures=None):
+        super().__init__(message)
+        self.failures = failures or []
+
+
+class ModelReloadInProgress(ModelReloadError):
+    pass
+
+
+def check_manifest(manifest):
+    """Manifest'i çalışan yapılandırmaya karşı doğrula; sorun listesi döner (boşsa geçerli).
+
+    Farklı parametrelerle (ör. tune.py) eğitilmiş artifact'ler kabul edilir, ama
+    parametreler bu sürümde geçerli olmalı, artifact aynı sklearn sürümüyle
+    yazılmış olmalı ve anahtarı güncel eğitim verisi + ön işleme ayarlarıyla
+    manifest'teki parametrelerden hesaplanan anahtarla eşleşmeli.
+    """
+    from data_loader import DataLoader
+    from train import compute_artifact_key
+
+    problems = []
+    if manifest.get("sklearn_version") != sklearn.__version__:
+        problems.append(f"sklearn {manifest.get('sklearn_version')} != running {sklearn.__version__}")
+    if not manifest.get("classes"):
+        problems.append("artifact has no classes")
+    try:
+        params_model = PetModel(manifest.get("params") or {})
+    except ValueError as e:
+        return problems + [f"invalid params: {e}"]
+
+    expected_key = compute_artifact_key(DataLoader(), params_model)
+    if expected_key is not None and not ModelArtifact.is_fresh(manifest, expected_key):
+        problems.append(
+            f"artifact key {manifest.get('base_key', manifest.get('artifact_key', ''))[:12]} does not match "
+            f"the current training data/params ({expected_key[:12]})"
+        )
+    return problems
+
+
+def load_candidate(directory):
+    """Artifact'i yeni (paylaşılmayan) preprocessor/model/clinical nesnelerine yükle.
+
+    Estimator'lar yüklenmeden önce manifest check_manifest ile doğrulanır.
+    """
+    start = time.perf_counter()
+    manifest = ModelArtifact.read_manifest(directory)
+    if manifest is None:
+        raise ModelReloadError(f"No valid model artifact in {directory}")
+    problems = check_manifest(manifest)
+    if problems:
+        raise ModelReloadError(f"Artifact {manifest.get('artifact_key', '')[:12]} rejected",
+                               [{"input": None, "error": problem} for problem in problems])
+
+    candidate_model, candidate_clinical = PetModel(), ClinicalRecommendation()
+    checked_key = manifest.get("artifact_key")
+    manifest = ModelArtifact.load(directory, candidate_model, candidate_clinical)
+    if manifest is None:
+        raise ModelReloadError(f"No valid model artifact in {directory}")
+    # Kontrol ile yükleme arasında yeni bir artifact yayınlandıysa doğrulanmamış olanı alma
+    if manifest["artifact_key"] != checked_key:
+        raise ModelReloadError(f"Artifact in {directory} changed while loading, retry the reload")
+    return {
+        "preprocessor": Preprocessor(),
+        "model": candidate_model,
+        "clinical": candidate_clinical,
+        "manifest": manifest,
+        "load_seconds": time.perf_counter() - start
+    }
+
+
+def validate_candidate(candidate, test_cases, confidence_threshold=0.15):
+    """Test vakalarını yeni modelle çalıştır; hata listesi döner (boşsa geçerli).
+
+    test_cases: vaka metni -> kabul edilen birincil tanılar. Birincil tanı
+    bunlardan biri değilse (ya da olasılık geçersizse) aday reddedilir.
+    """
+    model, preprocessor = candidate["model"], candidate["preprocessor"]
+    classes = {str(c) for c in model.label_encoder.classes_}
+    failures = []
+    try:
+        cleaned = [preprocessor.advanced_text_preprocessing(case) for case in test_cases]
+        results = model.diagnose_cleaned(cleaned, confidence_threshold)
+    except Exception as e:
+        return [{"input": None, "error": f"{type(e).__name__}: {e}"}]
+
+    for case, result in zip(test_cases, results):
+        primary = result.get("primary_diagnosis") or {}
+        probability = primary.get("probability")
+        condition = primary.get("condition")
+        if condition not in classes:
+            failures.append({"input": case, "error": f"unknown condition {condition!r}"})
+        elif probability is None or not math.isfinite(probability) or not 0 <= probability <= 1:
+            failures.append({"input": case, "error": f"invalid probability {probability!r}"})
+        elif condition not in test_cases[case]:
+            failures.append({"input": case, "error": f"diagnosed {condition!r}, expected one of "
+                                                      f"{', '.join(test_cases[case])}"})
+    return failures
+
+
+class ArtifactWatcher:
+    """Artifact dizinindeki manifest.json'u yoklar; değişince on_change() çağırır.
+
+    Manifest atomik olarak ve en son yazıldığından, değiştiğinde estimator
+    dosyası da tamdır. interval <= 0 ise izleme kapalıdır.
+    """
+
+    def __init__(self, directory, on_change, interval=None):
+        self.directory = directory
+        self.on_change = on_change
+        self.interval = interval if interval is not None else float(os.environ.get("PET_MODEL_WATCH_INTERVAL", "0"))
+        self._mtime = self._manifest_mtime()
+        self._task = None
+
+    def _manifest_mtime(self):
+        try:
+            return os.stat(os.path.join(self.directory, MANIFEST_NAME)).st_mtime_ns
+        except OSError:
+            return None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            mtime = self._manifest_mtime()
+            if mtime is None or mtime == self._mtime:
+                continue
+            self._mtime = mtime
+            try:
+                await self.on_change()
+            except Exception as e:
+                print(f"⚠️ Model watcher reload failed: {e}")
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
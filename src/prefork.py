@@ -0,0 +1,90 @@
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+# Bir worker bu süreden kısa yaşayıp ölürse (ör. başlangıç hatası) yeniden başlatılmaz
+MIN_WORKER_UPTIME = 1.0
+
+
+def bind_socket(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock, log_level):
+    # Üst sürecin sinyal işleyicilerini bırak; uvicorn kendi işleyicilerini kurar
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+    try:
+        server.run(sockets=[sock])
+    finally:
+        os._exit(0)
+
+
+def serve_prefork(app, host, port, workers, log_level="info"):
+    """Modeli üst süreçte bir kez yükledikten sonra çağrılır; workers adet süreç fork eder.
+
+    Worker'lar üst sürecin belleğini copy-on-write paylaşır: import edilen
+    modüller, vectorizer sözlüğü ve sınıflandırıcı dizileri her worker'da
+    kopyalanmaz. gc.freeze() fork öncesi nesneleri kalıcı nesile taşır; böylece
+    worker'lardaki çöp toplayıcı bu nesnelerin başlıklarına yazıp sayfaları
+    kopyalatmaz. Aynı dinleyen soket tüm worker'lara miras kalır, bağlantıları
+    çekirdek dağıtır. Beklenmedik şekilde ölen worker yeniden fork edilir.
+
+    Not: hot reload (/admin/reload_model) her worker'da ayrı çalışır ve yeni
+    modeli paylaşmaz; çok worker'lı kurulumda yeni model için yeniden başlatın.
+    """
+    sock = bind_socket(host, port)
+    gc.collect()
+    gc.freeze()
+
+    children = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(app, sock, log_level)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    print(f"👥 {workers} workers serving on http://{host}:{port} (parent pid {os.getpid()})")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        if time.monotonic() - started < MIN_WORKER_UPTIME:
+            print(f"❌ Worker {pid} exited during startup (status {status}), not restarting")
+            continue
+        print(f"⚠️ Worker {pid} exited (status {status}), restarting")
+        spawn()
+    sock.close()
@@ -1,56 +1,128 @@
+import json
+import os
 import re
 import pandas as pd
 
+DEFAULT_MEDICAL_EXPANSIONS = {
+    'gi': 'gastrointestinal',
+    'dka': 'diabetic ketoacidosis',
+    'uri': 'upper respiratory infection',
+    'uti': 'urinary tract infection'
+}
+
+DEFAULT_SYNONYMS = {
+    'vomiting': ['throwing up'],
+    'diarrhea': ['loose stool'],
+    'assess': ['evaluate'],
+    'monitor': ['observe'],
+    'implement': ['apply']
+}
+
+ABBREVIATIONS_PATH = os.environ.get(
+    "PET_ABBREVIATIONS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "medical_abbreviations.json")
+)
+
+_PUNCTUATION = r'[^\w\s\-]'
+
+
+def _compile_normalizer(expansions):
+    # Kısaltmalar ve noktalama tek alternation'da: metin tek geçişte işlenir.
+    # Uzun kısaltmalar önce denenir; kısaltma alternatifi noktalamadan önce gelir.
+    alternation = '|'.join(re.escape(abbr) for abbr in sorted(expansions, key=len, reverse=True))
+    if not alternation:
+        return re.compile(_PUNCTUATION)
+    return re.compile(rf'\b(?:{alternation})\b|{_PUNCTUATION}')
+
+
 class Preprocessor:
+    medical_expansions = dict(DEFAULT_MEDICAL_EXPANSIONS)
+    # (pattern, sözlük) tek atamayla değişir; eşzamanlı çağrılar tutarlı bir çift görür
+    _normalizer = (_compile_normalizer(medical_expansions), medical_expansions)
+
+    @classmethod
+    def configure_abbreviations(cls, expansions=None, path=None, replace=False):
+        """Kısaltma sözlüğünü genişlet (ya da replace=True ile değiştir) ve pattern'i yeniden derle.
+
+        path: {"kısaltma": "açılım"} biçiminde bir JSON dosyası.
+        """
+        loaded = {}
+        if path:
+            with open(path, encoding='utf-8') as f:
+                loaded.update(json.load(f))
+        if expansions:
+            loaded.update(expansions)
+
+        # Açılımlar tekrar taranmadığı için noktalamaları burada temizlenir
+        loaded = {
+            str(abbr).lower().strip(): ' '.join(re.sub(_PUNCTUATION, ' ', str(expansion).lower()).split())
+            for abbr, expansion in loaded.items()
+        }
+        merged = loaded if replace else dict(cls.medical_expansions, **loaded)
+        cls._normalizer = (_compile_normalizer(merged), merged)
+        cls.medical_expansions = merged
+        return merged
+
     @staticmethod
     def advanced_text_preprocessing(text):
         text = str(text).lower()
         
-        # Medical abbreviations expansion
-        medical_expansions = {
-            'gi': 'gastrointestinal',
-            'dka': 'diabetic ketoacidosis', 
-            'uri': 'upper respiratory infection',
-            'uti': 'urinary tract infection'
-        }
-        
-        for abbr, expansion in medical_expansions.items():
-            text = re.sub(rf'\b{abbr}\b', expansion, text)
-        
-        text = re.sub(r'[^\w\s\-]', ' ', text)
+        # Medical abbreviations expansion + punctuation stripping (tek geçiş)
+        pattern, expansions = Preprocessor._normalizer
+        text = pattern.sub(lambda m: expansions.get(m.group(), ' '), text)
         text = ' '.join(text.split())
         
         return text
 
     @staticmethod
-    def simple_data_augmentation(df):
+    def simple_data_augmentation(df, synonyms=None, expansion_factor=1, max_rows=1000):
+        """Eş anlamlı kelime değişimiyle yeni eğitim örnekleri üret.
+
+        synonyms: terim -> eş anlamlılar listesi. Her varyantta eşleşen tüm terimler
+        sıradaki eş anlamlıyla değiştirilir; expansion_factor satır başına en fazla
+        kaç yeni örnek üretileceğini belirler. max_rows=None boyut sınırını kaldırır.
+        """
         original_size = len(df)
-        augmented_data = []
-        
         synonyms = {
-            'vomiting': 'throwing up',
-            'diarrhea': 'loose stool',
-            'assess': 'evaluate',
-            'monitor': 'observe',
-            'implement': 'apply'
+            term.lower(): [choices] if isinstance(choices, str) else list(choices)
+            for term, choices in (synonyms or DEFAULT_SYNONYMS).items()
         }
+        synonyms = {term: choices for term, choices in synonyms.items() if choices}
+        augmented_frames = []
+        
+        if synonyms and expansion_factor > 0 and (max_rows is None or len(df) < max_rows):
+            alternation = '|'.join(re.escape(term) for term in sorted(synonyms, key=len, reverse=True))
+            pattern = re.compile(rf'\b(?:{alternation})\b', flags=re.IGNORECASE)
+            
+            texts = df['text'].astype(str)
+            matches = texts.str.contains(pattern).to_numpy()
+            candidates = texts[matches]
+            conditions = df['condition'][matches]
+            variants = min(expansion_factor, max(len(choices) for choices in synonyms.values()))
+            
+            for variant in range(variants):
+                def replace(match, variant=variant):
+                    choices = synonyms[match.group().lower()]
+                    return choices[variant % len(choices)]
+                
+                replaced = candidates.str.replace(pattern, replace, regex=True)
+                changed = (replaced != candidates).to_numpy()
+                augmented_frames.append(pd.DataFrame({
+                    'text': replaced[changed].to_numpy(),
+                    'condition': conditions[changed].to_numpy()
+                }))
         
-        if len(df) < 1000:
-            for _, row in df.iterrows():
-                original_text = str(row['text'])
-                augmented_text = original_text
-                for original, synonym in synonyms.items():
-                    if original in original_text.lower():
-                        augmented_text = re.sub(rf'\b{original}\b', synonym, augmented_text, flags=re.IGNORECASE)
-                        break
-                if augmented_text != original_text:
-                    augmented_data.append({'text': augmented_text, 'condition': row['condition']})
+        # Kısa eş anlamlı listeleri döngüye girdiğinde oluşan tekrarları at
+        augmented_df = pd.concat(augmented_frames, ignore_index=True).drop_duplicates() if augmented_frames else None
         
-        if augmented_data:
-            augmented_df = pd.DataFrame(augmented_data)
+        if augmented_df is not None and len(augmented_df):
             combined_df = pd.concat([df, augmented_df], ignore_index=True)
             print(f"📈 Data augmentation: {original_size} → {len(combined_df)} samples")
             return combined_df
         else:
             print("📊 No augmentation applied")
             return df
+
+
+if os.path.exists(ABBREVIATIONS_PATH):
+    Preprocessor.configure_abbreviations(path=ABBREVIATIONS_PATH)
@@ -0,0 +1,98 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+# En üst çerçevesi bunlardan biri olan thread'ler boşta bekliyordur (event loop select'i,
+# boş havuz worker'ı vb.); varsayılan olarak örneklenmez
+IDLE_FUNCTIONS = frozenset({"select", "poll", "epoll", "wait", "_wait_for_tstate_lock", "accept", "sleep"})
+# Daha sık örnekleme, örnekleyici thread'inin inference ile GIL için yarışmasına yol açar
+MIN_SAMPLE_INTERVAL_MS = 1.0
+
+
+class SamplingProfiler:
+    """Çalışma anında açılıp kapatılabilen örnekleyici profiler.
+
+    Arka plan thread'i her interval_ms'de sys._current_frames() ile tüm
+    thread'lerin yığınını okur ve "katlanmış yığın" (flamegraph.pl / speedscope
+    biçimi) sayaçlarında toplar. İzlenen koda hiçbir şey eklenmez; kapalıyken
+    maliyeti sıfır, açıkken örnek başına yalnızca yığın yürüyüşüdür.
+    """
+
+    def __init__(self, interval_ms=None, max_depth=64, include_idle=False):
+        interval_ms = interval_ms or float(os.environ.get("PET_PROFILER_INTERVAL_MS", "5"))
+        self.interval_ms = max(MIN_SAMPLE_INTERVAL_MS, interval_ms)
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._deadline = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _stack(self, frame):
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self):
+        own = threading.get_ident()
+        interval = self.interval_ms / 1000
+        while not self._stop.wait(interval):
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                break
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own:
+                        continue
+                    if self.include_idle or frame.f_code.co_name not in IDLE_FUNCTIONS:
+                        self.stacks[self._stack(frame)] += 1
+                self.samples += 1
+
+    def start(self, interval_ms=None, duration=None):
+        """Örneklemeyi başlat; duration (saniye) verilirse o süre sonunda kendiliğinden durur"""
+        if self.running:
+            return False
+        if interval_ms:
+            self.interval_ms = max(MIN_SAMPLE_INTERVAL_MS, interval_ms)
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._deadline = time.monotonic() + duration if duration else None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self, limit=None):
+        """'çerçeve;çerçeve;... sayı' satırları, en sık görülen yığın önce"""
+        with self._lock:
+            items = self.stacks.most_common(limit)
+        return "\n".join(f"{stack} {count}" for stack, count in items) + "\n"
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            "started_at": self.started_at
+        }
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Boyut sınırlı, thread-safe LRU + TTL önbellek.
+
+    Süresi dolan girdiler okunurken silinir; maxsize aşılınca en eski
+    kullanılan atılır. maxsize <= 0 önbelleği kapatır. Döndürülen değerler
+    paylaşılır - çağıranlar değiştirmemelidir.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+class DiagnosisCache(TTLCache):
+    """Teşhis sonuçları için TTLCache; girdiler model versiyonuna bağlıdır.
+
+    Anahtar: (ön işlenmiş metin, pet_type, confidence_threshold, top_k). get'e
+    aktif model versiyonu verilir; versiyon değiştiyse önbellek boşaltılır.
+    put'a sonucu üreten modelin versiyonu verilir; önbelleğin versiyonundan
+    farklıysa (reload'dan önce başlamış bir istek) sonuç yazılmaz.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        super().__init__(
+            maxsize if maxsize is not None else int(os.environ.get("PET_CACHE_SIZE", "4096")),
+            ttl if ttl is not None else float(os.environ.get("PET_CACHE_TTL", "600"))
+        )
+        self.version = None
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self.version:
+                if self._data:
+                    self.invalidations += 1
+                self._data.clear()
+                self.version = version
+            return self._get(key)
+
+    def put(self, version, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                self.stale_puts += 1
+                return
+            self._put(key, value)
+
+    def stats(self):
+        return {**super().stats(), "invalidations": self.invalidations, "stale_puts": self.stale_puts}
@@ -1,10 +1,235 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from breed_resolver import normalize_breed_name
+
+PET_DIAGNOSIS_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pet_diagnosis_data.json"
+)
+
+# Model sınıfı -> ilgili genetik rahatsızlık anahtar kelimeleri (alt string eşleşmesi)
+CONDITION_AILMENT_KEYWORDS = {
+    'Digestive Issues': ('stomach', 'bloat', 'liver', 'pancreas', 'enzyme'),
+    'Ear Infections': ('deaf',),
+    'Mobility Problems': ('hip', 'elbow', 'knee', 'spin', 'joint', 'dwarfism', 'connective tissue', 'nerve'),
+    'Parasites': (),
+    'Skin Irritations': ('skin', 'hair loss', 'zinc', 'immune')
+}
+# Tanı olasılığının risk skoruna katkısı (sınıf başına ağırlık)
+CONDITION_SEVERITY = {
+    'Digestive Issues': 0.7,
+    'Ear Infections': 0.3,
+    'Mobility Problems': 0.6,
+    'Parasites': 0.5,
+    'Skin Irritations': 0.3
+}
+
+GENETIC_RISK_WEIGHT = 0.5      # İlgili rahatsızlık sayısı doyduğunda (2+) çarpan 1.5 olur
+DEFAULT_LONGEVITY = 12.0
+SENIOR_LIFE_FRACTION = 0.75    # age / longevity bu oranı aşarsa yaşlı
+JUVENILE_LIFE_FRACTION = 0.1
+SENIOR_FACTOR = 1.3
+JUVENILE_FACTOR = 1.15
+WEIGHT_TOLERANCE = 0.1         # Irk standardı aralığının %10 dışı normal sayılmaz
+WEIGHT_FACTOR = 1.15
+LBS_TO_KG = 0.45359237
+# Irk standardı kilo kolonları (lbs): aralık = en küçük min .. en büyük max (erkek/dişi)
+MIN_WEIGHT_COLUMNS = ('min_weight_male', 'min_weight_female')
+MAX_WEIGHT_COLUMNS = ('max_weight_male', 'max_weight_female')
+RISK_LEVELS = ((0.6, "High"), (0.35, "Medium"))
+
+_AILMENT_SEPARATORS = re.compile(r"[,;+]")
+
+
+def _split_ailments(value):
+    if not isinstance(value, str) or value.strip().lower() in ('', 'none', 'no data'):
+        return []
+    return [part.strip(" '\"").lower() for part in _AILMENT_SEPARATORS.split(value) if part.strip(" '\"")]
+
+
 class RiskCalculator:
+    """Tanı olasılıklarını ırk genetiği, yaş ve kiloyla birleştiren risk motoru.
+
+    Irk verileri load_breed_data ile bir kez yoğun NumPy tablolarına dökülür
+    (satır: ırk, sütun: condition). 0. satır "bilinmeyen ırk"tır; bir isteğin
+    skoru birkaç dizi okuması ve tek bir nokta çarpımıdır.
+    """
+
+    def __init__(self, resolver=None):
+        self.resolver = resolver
+        self.conditions = list(CONDITION_AILMENT_KEYWORDS)
+        self.condition_index = {condition: i for i, condition in enumerate(self.conditions)}
+        self._columns_cache = (None, None)
+        self.severity = np.array([CONDITION_SEVERITY[c] for c in self.conditions], dtype=np.float32)
+        self.breed_index = {}
+        self.genetic_multiplier = np.ones((1, len(self.conditions)), dtype=np.float32)
+        self.longevity = np.array([DEFAULT_LONGEVITY], dtype=np.float32)
+        self.weight_min = np.array([np.nan], dtype=np.float32)
+        self.weight_max = np.array([np.nan], dtype=np.float32)
+
     @staticmethod
     def interpret_confidence(confidence_level):
         interpretations = {
             "High": "Strong indication - recommend veterinary consultation",
-            "Medium": "Possible condition - monitor symptoms and consider veterinary advice", 
+            "Medium": "Possible condition - monitor symptoms and consider veterinary advice",
             "Low": "Uncertain diagnosis - veterinary examination recommended",
             "Very Low": "Unable to determine - professional evaluation necessary"
         }
         return interpretations.get(confidence_level, "Unknown confidence level")
+
+    def _breed_key(self, name, fuzzy=False):
+        if self.resolver is not None:
+            match = self.resolver.resolve(name, fuzzy=fuzzy)
+            if match:
+                return match['canonical']
+        return normalize_breed_name(name)
+
+    def _collect_weight_ranges(self, df, name_column, weights):
+        """Irk başına (min_kg, max_kg) standart aralığı; daha önce bulunmuş ırklar korunur"""
+        ranges = df.groupby(name_column, sort=False).agg(
+            low=(MIN_WEIGHT_COLUMNS[0], 'min'), low_f=(MIN_WEIGHT_COLUMNS[1], 'min'),
+            high=(MAX_WEIGHT_COLUMNS[0], 'max'), high_f=(MAX_WEIGHT_COLUMNS[1], 'max')
+        )
+        low = ranges[['low', 'low_f']].min(axis=1) * LBS_TO_KG
+        high = ranges[['high', 'high_f']].max(axis=1) * LBS_TO_KG
+        for name, lo, hi in zip(ranges.index, low, high):
+            if np.isnan(lo) or np.isnan(hi) or lo <= 0 or hi < lo:
+                continue
+            weights.setdefault(self._breed_key(name), (float(lo), float(hi)))
+
+    def load_breed_data(self, loader=None, diagnosis_data_path=PET_DIAGNOSIS_DATA_PATH):
+        """Genetik risk + demografi kaynaklarından ırk tablolarını önceden hesapla"""
+        ailments, longevity, weights = {}, {}, {}
+
+        try:
+            with open(diagnosis_data_path, encoding='utf-8') as f:
+                breed_risks = json.load(f).get('breed_genetic_risks', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ breed_genetic_risks okunamadı: {e}")
+            breed_risks = {}
+        for name, info in breed_risks.items():
+            key = self._breed_key(name)
+            ailments.setdefault(key, set()).update(a.lower() for a in info.get('genetic_ailments', []))
+            if info.get('longevity'):
+                longevity[key] = float(info['longevity'])
+
+        if loader is not None:
+            if loader.dog_genetics_data is None:
+                loader.load_real_datasets(datasets=('dog_genetics',))
+            genetics = loader.dog_genetics_data
+            if genetics is not None:
+                for name, value, years in zip(genetics['Breed'], genetics['GENETIC AILMENTS'],
+                                              genetics['LONGEVITY(YEARS)']):
+                    key = self._breed_key(name)
+                    ailments.setdefault(key, set()).update(_split_ailments(value))
+                    if key not in longevity and not np.isnan(years):
+                        longevity[key] = float(years)
+                if loader.release_after_use:
+                    loader.release('dog_genetics')
+
+            # Kilo referansı ırk standardı aralığı (dog_breeds.csv öncelikli, merged_dog_data
+            # tamamlar); merged'deki "Weight (kg)" bireysel kayıtlardır, ırk referansı değildir
+            sources = (('dog_breeds', loader.load_breed_standards, 'Name'),
+                       ('merged_dog_data', lambda: loader.load_processed('merged_dog_data'), 'Breed'))
+            for source, load, name_column in sources:
+                try:
+                    self._collect_weight_ranges(load(), name_column, weights)
+                except Exception as e:
+                    print(f"⚠️ {source} okunamadı: {e}")
+
+        breeds = sorted(set(ailments) | set(longevity) | set(weights))
+        n_rows = len(breeds) + 1
+        genetic_multiplier = np.ones((n_rows, len(self.conditions)), dtype=np.float32)
+        longevity_table = np.full(n_rows, DEFAULT_LONGEVITY, dtype=np.float32)
+        weight_min = np.full(n_rows, np.nan, dtype=np.float32)
+        weight_max = np.full(n_rows, np.nan, dtype=np.float32)
+
+        for row, breed in enumerate(breeds, start=1):
+            breed_ailments = ailments.get(breed, ())
+            for col, condition in enumerate(self.conditions):
+                keywords = CONDITION_AILMENT_KEYWORDS[condition]
+                matches = sum(any(k in ailment for k in keywords) for ailment in breed_ailments)
+                genetic_multiplier[row, col] += GENETIC_RISK_WEIGHT * min(matches, 2) / 2
+            longevity_table[row] = longevity.get(breed, DEFAULT_LONGEVITY)
+            weight_min[row], weight_max[row] = weights.get(breed, (np.nan, np.nan))
+
+        # Tablolar önce yerel olarak kurulur, en son atanır
+        self.breed_index = {breed: row for row, breed in enumerate(breeds, start=1)}
+        self.genetic_multiplier = genetic_multiplier
+        self.longevity = longevity_table
+        self.weight_min = weight_min
+        self.weight_max = weight_max
+        print(f"🧬 Risk tablosu: {len(breeds)} ırk x {len(self.conditions)} condition")
+        return len(breeds)
+
+    def _condition_columns(self, classes):
+        """Model sınıfı -> self.conditions sütunu (-1: risk motorunda yok); sınıf dizisi başına bir kez"""
+        cached = self._columns_cache
+        if cached[0] is not classes:
+            columns = np.array([self.condition_index.get(str(c), -1) for c in classes], dtype=np.intp)
+            cached = self._columns_cache = (classes, columns)
+        return cached[1]
+
+    def _condition_probabilities(self, result):
+        """Condition başına olasılık: varsa tam olasılık satırı, yoksa possible_diagnoses.
+
+        Tam satır (class_probabilities + classes) eşik, top_k ve yuvarlamadan
+        etkilenmez; böylece risk seviyesi sunum seçeneklerine bağlı değildir.
+        """
+        probabilities = np.zeros(len(self.conditions), dtype=np.float32)
+        row, classes = result.get('class_probabilities'), result.get('classes')
+        if row is not None and classes is not None:
+            columns = self._condition_columns(classes)
+            known = columns >= 0
+            probabilities[columns[known]] = np.asarray(row)[known]
+            return probabilities
+        for diagnosis in result.get('possible_diagnoses', []):
+            col = self.condition_index.get(diagnosis.get('condition'))
+            if col is not None:
+                probabilities[col] = diagnosis.get('probability', 0.0)
+        return probabilities
+
+    def calculate_risk_score(self, result, breed=None, age=None, weight=None):
+        """Tanı sonucundan (multi_label_diagnosis çıktısı) 0+ risk skoru ve katkıları"""
+        row = self.breed_index.get(self._breed_key(breed, fuzzy=True), 0) if breed else 0
+
+        probabilities = self._condition_probabilities(result)
+
+        score = float(np.dot(probabilities * self.severity, self.genetic_multiplier[row]))
+
+        life_stage_factor = 1.0
+        if age is not None:
+            life_fraction = age / self.longevity[row]
+            if life_fraction >= SENIOR_LIFE_FRACTION:
+                life_stage_factor = SENIOR_FACTOR
+            elif life_fraction < JUVENILE_LIFE_FRACTION:
+                life_stage_factor = JUVENILE_FACTOR
+
+        weight_factor = 1.0
+        weight_min, weight_max = self.weight_min[row], self.weight_max[row]
+        if weight is not None and not np.isnan(weight_min):
+            if weight < weight_min * (1 - WEIGHT_TOLERANCE) or weight > weight_max * (1 + WEIGHT_TOLERANCE):
+                weight_factor = WEIGHT_FACTOR
+
+        # Olasılık ağırlıklı ortalama genetik çarpan (raporlama için)
+        total = probabilities.sum()
+        genetic_factor = float(self.genetic_multiplier[row] @ probabilities / total) if total else 1.0
+
+        return {
+            "score": round(score * life_stage_factor * weight_factor, 3),
+            "breed_known": row != 0,
+            "genetic_factor": round(genetic_factor, 3),
+            "life_stage_factor": life_stage_factor,
+            "weight_factor": weight_factor
+        }
+
+    def calculate_risk(self, result, breed=None, age=None, weight=None):
+        """Risk seviyesi: High / Medium / Low"""
+        score = self.calculate_risk_score(result, breed, age, weight)["score"]
+        for threshold, level in RISK_LEVELS:
+            if score >= threshold:
+                return level
+        return "Low"
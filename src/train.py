@@ -0,0 +1,168 @@
+import argparse
+import hashlib
+import time
+
+import pandas as pd
+
+from data_loader import DataLoader
+from preprocessing import Preprocessor
+from model import PetModel, CLASSIFIER_BACKENDS, FEATURE_MODES, INCREMENTAL_BACKENDS
+from clinical_recommendation import ClinicalRecommendation
+from model_artifact import ModelArtifact
+from metrics import pipeline_stage
+
+
+def compute_artifact_key(loader, model):
+    """Veri dosyaları, hiperparametreler ve kısaltma sözlüğünden artifact anahtarı"""
+    return ModelArtifact.compute_key(
+        [loader.symptoms_path], model.params,
+        extra={"medical_expansions": Preprocessor.medical_expansions}
+    )
+
+
+def train_out_of_core(loader, preprocessor, model, clinical, chunksize=50000):
+    """Hashing modu: veri seti iki kez parça parça okunur, hiçbir zaman tamamı belleğe alınmaz.
+
+    İlk geçiş klinik önerileri çıkarır ve condition sınıflarını toplar (partial_fit
+    tüm sınıfları baştan bilmeli), ikinci geçiş modeli eğitir. Kayıt sayısını döner.
+    """
+    classes, records = set(), 0
+
+    def first_pass():
+        nonlocal records
+        for chunk in loader.iter_symptoms(chunksize):
+            classes.update(chunk['condition'].dropna().astype(str))
+            records += len(chunk)
+            yield chunk
+
+    with pipeline_stage("extract"):
+        clinical.extract_from_chunks(first_pass())
+    print("💊 Clinical recommendations extracted...")
+    if not model.train_incremental(loader.iter_symptoms(chunksize), preprocessor, sorted(classes)):
+        return None
+    return records
+
+
+def build_artifact(loader, preprocessor, model, clinical, directory, artifact_key=None, chunksize=50000):
+    """Veriyi yükle, modeli eğit ve artifact olarak diske yaz"""
+    if model.incremental and loader.symptoms_data is None:
+        try:
+            data_records = train_out_of_core(loader, preprocessor, model, clinical, chunksize)
+        except (OSError, ValueError) as e:
+            print(f"❌ Out-of-core training failed: {e}")
+            return None
+        if not data_records:
+            print("❌ Model training failed")
+            return None
+        if artifact_key is None:
+            artifact_key = compute_artifact_key(loader, model)
+        manifest = ModelArtifact.save(directory, model, clinical, artifact_key, data_records=data_records)
+        print(f"💾 Model artifact saved: {directory} ({artifact_key[:12]})")
+        return manifest
+
+    # Eğitim yalnızca semptom veri setini kullanır
+    if loader.symptoms_data is None and not loader.load_real_datasets(datasets=('symptoms',)):
+        print("❌ No datasets loaded")
+        return None
+
+    with pipeline_stage("extract"):
+        clinical.extract_real_clinical_recommendations(loader.symptoms_data)
+    print("💊 Clinical recommendations extracted...")
+
+    if not model.train_improved_model(loader.symptoms_data, preprocessor):
+        print("❌ Model training failed")
+        return None
+
+    if artifact_key is None:
+        artifact_key = compute_artifact_key(loader, model)
+    manifest = ModelArtifact.save(
+        directory, model, clinical, artifact_key, data_records=len(loader.symptoms_data)
+    )
+    if loader.release_after_use:
+        loader.release('symptoms')
+    print(f"💾 Model artifact saved: {directory} ({artifact_key[:12]})")
+    return manifest
+
+
+def update_artifact(directory, notes_path, preprocessor, chunksize=50000):
+    """Mevcut (hashing modlu) artifact'i yeni klinik notlarla baştan eğitmeden güncelle.
+
+    Yeni artifact anahtarı önceki anahtar + not dosyasının özetinden türetilir;
+    base_key korunur, böylece API güncellenmiş artifact'i hâlâ taze sayar.
+    """
+    model, clinical = PetModel(), ClinicalRecommendation()
+    manifest = ModelArtifact.load(directory, model, clinical, mmap_mode=None)
+    if manifest is None:
+        raise ValueError(f"No artifact found in {directory}")
+    model.params = dict(PetModel.DEFAULT_PARAMS, **model.params)
+    if not model.incremental:
+        raise ValueError("Artifact was not trained with features='hashing'; retrain with --features hashing")
+
+    digest = hashlib.sha256(manifest["artifact_key"].encode())
+    records = 0
+    for chunk in pd.read_csv(notes_path, usecols=['text', 'condition'], dtype=str, chunksize=chunksize):
+        records += model.update(chunk, preprocessor)
+        digest.update(pd.util.hash_pandas_object(chunk, index=False).values.tobytes())
+
+    updates = manifest.get("updates", []) + [{
+        "file": notes_path, "records": records, "at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }]
+    return ModelArtifact.save(
+        directory, model, clinical, digest.hexdigest(), data_records=manifest.get("data_records"),
+        base_key=manifest.get("base_key", manifest["artifact_key"]), updates=updates
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the pet diagnosis model and write the artifact")
+    parser.add_argument("--output", default=ModelArtifact.artifact_dir(), help="artifact directory")
+    parser.add_argument("--force", action="store_true", help="retrain even if the artifact is fresh")
+    parser.add_argument("--classifier", choices=list(CLASSIFIER_BACKENDS),
+                        help="classifier backend (default: the existing artifact's, "
+                             "else PET_MODEL_BACKEND or random_forest)")
+    parser.add_argument("--features", choices=FEATURE_MODES,
+                        help="feature pipeline (default: the existing artifact's, else PET_MODEL_FEATURES or tfidf); "
+                             "'hashing' trains out-of-core and supports --update")
+    parser.add_argument("--chunksize", type=int, default=50000, help="rows per chunk in hashing mode")
+    parser.add_argument("--update", metavar="NOTES_CSV",
+                        help="partial_fit the existing hashing artifact on new notes (text,condition)")
+    args = parser.parse_args()
+
+    if args.update:
+        start = time.perf_counter()
+        try:
+            manifest = update_artifact(args.output, args.update, Preprocessor(), args.chunksize)
+        except (OSError, ValueError) as e:
+            print(f"❌ Update failed: {e}")
+            exit(1)
+        print(f"🔁 Artifact updated with {manifest['updates'][-1]['records']} notes "
+              f"({manifest['artifact_key'][:12]}, {time.perf_counter() - start:.1f}s)")
+        exit(0)
+
+    loader = DataLoader()
+    # Başlangıç noktası mevcut artifact'in (yoksa tune.py'nin) parametreleri;
+    # farklı bir backend ya da özellik modu istenirse yok sayılır
+    params = ModelArtifact.read_params(args.output)
+    if args.classifier and params.get('classifier') != args.classifier:
+        params = {}
+    if args.features and params.get('features', 'tfidf') != args.features:
+        params = {}
+    if args.classifier:
+        params['classifier'] = args.classifier
+    if args.features:
+        params['features'] = args.features
+        if args.features == 'hashing' and params.get('classifier') not in INCREMENTAL_BACKENDS:
+            params['classifier'] = 'sgd'
+    model = PetModel(params)
+    key = compute_artifact_key(loader, model)
+
+    if key and not args.force and ModelArtifact.is_fresh(ModelArtifact.read_manifest(args.output), key):
+        print(f"✅ Artifact is up to date ({key[:12]}), nothing to do")
+        exit(0)
+
+    start = time.perf_counter()
+    manifest = build_artifact(loader, Preprocessor(), model, ClinicalRecommendation(), args.output, key,
+                              chunksize=args.chunksize)
+    if manifest is None:
+        exit(1)
+    print(f"🎯 Accuracy: {manifest['accuracy']:.3f} ({time.perf_counter() - start:.1f}s)")
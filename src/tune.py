@@ -0,0 +1,147 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from joblib import Memory
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+
+from data_loader import DataLoader
+from preprocessing import Preprocessor
+from model import PetModel, CLASSIFIER_BACKENDS
+from clinical_recommendation import ClinicalRecommendation
+from model_artifact import ModelArtifact
+from train import build_artifact, compute_artifact_key
+
+# TF-IDF ayarları; her biri fold başına bir kez fit edilir (joblib Memory önbelleği)
+VECTORIZER_GRID = {
+    'vectorizer__max_features': [300, 800, 1500],
+    'vectorizer__ngram_range': [(1, 2), (1, 3)],
+    'vectorizer__min_df': [1, 2]
+}
+
+# Backend başına sınıflandırıcı ayarları; PetModel'deki parametre adlarıyla
+CLASSIFIER_GRIDS = {
+    'random_forest': {
+        'classifier__n_estimators': [100, 200],
+        'classifier__max_depth': [10, 20],
+        'classifier__min_samples_split': [2, 5]
+    },
+    'logistic_regression': {'classifier__C': [1.0, 10.0, 100.0]},
+    'sgd': {'classifier__alpha': [1e-5, 1e-4, 1e-3]},
+    'complement_nb': {'classifier__alpha': [0.1, 0.3, 1.0]}
+}
+
+# Pipeline parametresi -> PetModel parametresi
+PARAM_NAMES = {
+    'vectorizer__max_features': 'tfidf_max_features',
+    'vectorizer__ngram_range': 'ngram_range',
+    'vectorizer__min_df': 'min_df'
+}
+
+
+class StageTimer:
+    """Aşama adı -> geçen süre (saniye), eklenme sırasıyla"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def run(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.stages[name] = round(time.perf_counter() - start, 3)
+        return result
+
+    def report(self):
+        total = sum(self.stages.values()) or 1.0
+        lines = [f"  {name:<14} {seconds:>9.2f}s {seconds / total:>6.1%}" for name, seconds in self.stages.items()]
+        return "\n".join(lines + [f"  {'total':<14} {total:>9.2f}s"])
+
+
+def to_model_params(best_params, classifier):
+    params = {'classifier': classifier}
+    for name, value in best_params.items():
+        key = PARAM_NAMES.get(name, name.split('__', 1)[1])
+        params[key] = list(value) if isinstance(value, tuple) else value
+    return params
+
+
+def search(texts, labels, classifier, cv=5, n_jobs=-1, scoring='accuracy', cache_dir=None, random_state=42):
+    """TF-IDF + sınıflandırıcı Pipeline'ı üzerinde paralel, çapraz doğrulamalı ızgara araması.
+
+    Pipeline'ın memory önbelleği sayesinde bir fold'daki TF-IDF dönüşümü aynı
+    vectorizer ayarını paylaşan tüm sınıflandırıcı ayarları için yeniden
+    kullanılır (önbellek diskte olduğundan paralel işçiler de paylaşır).
+    """
+    estimator = CLASSIFIER_BACKENDS[classifier](dict(PetModel.DEFAULT_PARAMS, random_state=random_state), len(texts))[0]
+    pipeline = Pipeline(
+        [('vectorizer', TfidfVectorizer(stop_words='english')), ('classifier', estimator)],
+        memory=Memory(cache_dir, verbose=0) if cache_dir else None
+    )
+    grid = GridSearchCV(
+        pipeline, {**VECTORIZER_GRID, **CLASSIFIER_GRIDS[classifier]},
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=scoring, n_jobs=n_jobs, refit=False
+    )
+    grid.fit(texts, labels)
+    return grid
+
+
+def tune(loader, preprocessor, classifier, directory, cv=5, n_jobs=-1, scoring='accuracy'):
+    timer = StageTimer()
+    if not timer.run('load', loader.load_real_datasets, datasets=('symptoms',)):
+        print("❌ No datasets loaded")
+        return None
+    df = loader.symptoms_data.dropna(subset=['text', 'condition'])
+    texts = timer.run('preprocess', lambda: df['text'].astype(str).map(preprocessor.advanced_text_preprocessing).tolist())
+    labels = df['condition'].astype(str).tolist()
+
+    cache_dir = tempfile.mkdtemp(prefix="pet-tune-")
+    try:
+        grid = timer.run('search', search, texts, labels, classifier, cv=cv, n_jobs=n_jobs,
+                         scoring=scoring, cache_dir=cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    candidates = len(grid.cv_results_['params'])
+    print(f"🔎 {candidates} candidates x {cv} folds, best {scoring}: {grid.best_score_:.3f}")
+
+    # En iyi ayarlarla standart artifact (ayrılmış %20 üzerinde metriklerle birlikte)
+    best_params = to_model_params(grid.best_params_, classifier)
+    model = PetModel(best_params)
+    artifact_key = compute_artifact_key(loader, model)
+    manifest = timer.run('train_best', build_artifact, loader, preprocessor, model,
+                         ClinicalRecommendation(), directory, artifact_key)
+    if manifest is None:
+        return None
+
+    report = {
+        'scoring': scoring,
+        'cv_folds': cv,
+        'cv_score': grid.best_score_,
+        'candidates': candidates,
+        'artifact_key': artifact_key,
+        'stage_seconds': timer.stages
+    }
+    timer.run('save', ModelArtifact.write_tuned_params, directory, best_params, report)
+    print("⏱️ Stage timings:\n" + timer.report())
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search; writes the best model as the artifact")
+    parser.add_argument("--output", default=ModelArtifact.artifact_dir(), help="artifact directory")
+    parser.add_argument("--classifier", choices=list(CLASSIFIER_BACKENDS), default=PetModel.DEFAULT_PARAMS['classifier'])
+    parser.add_argument("--cv", type=int, default=5, help="number of stratified folds")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel fits (-1: all cores)")
+    parser.add_argument("--scoring", default="accuracy", help="sklearn scoring name, e.g. f1_macro")
+    args = parser.parse_args()
+
+    print(f"🚀 Tuning {args.classifier} on {os.cpu_count()} cores...")
+    manifest = tune(DataLoader(), Preprocessor(), args.classifier, args.output,
+                    cv=args.cv, n_jobs=args.n_jobs, scoring=args.scoring)
+    if manifest is None:
+        exit(1)
+    print(f"🎯 Held-out accuracy: {manifest['accuracy']:.3f} ({manifest['artifact_key'][:12]})")
@@ -0,0 +1,137 @@
+import asyncio
+import os
+
+import requests
+
+from result_cache import TTLCache
+
+NO_PHONE = "Telefon bilgisi yok"
+OSM_ELEMENT_TYPES = {"node": "nodes", "way": "ways", "relation": "relations"}
+# OSM API multi-fetch (nodes?nodes=1,2,3) başına en fazla id (URL uzunluğu sınırı)
+MAX_IDS_PER_REQUEST = 100
+
+
+def parse_place_id(place_id):
+    """osm_node_123456 -> ("node", 123456); geçersizse None"""
+    parts = place_id.split("_")
+    if len(parts) != 3 or parts[0] != "osm" or parts[1] not in OSM_ELEMENT_TYPES or not parts[2].isdigit():
+        return None
+    return parts[1], int(parts[2])
+
+
+def _is_missing(error):
+    # 404 / 410: öğe yok ya da silinmiş (multi-fetch'te tek bir eksik id bile bu hatayı verir)
+    return (isinstance(error, requests.HTTPError) and error.response is not None
+            and error.response.status_code in (404, 410))
+
+
+def details_from_tags(tags):
+    return {
+        "formatted_phone_number": tags.get("phone", tags.get("contact:phone", NO_PHONE)),
+        "website": tags.get("website", tags.get("contact:website")),
+        "email": tags.get("email", tags.get("contact:email")),
+        "opening_hours": tags.get("opening_hours")
+    }
+
+
+class VetDetailsService:
+    """Veteriner iletişim etiketleri: TTL önbellek -> yerel POI indeksi -> OSM API multi-fetch.
+
+    Overpass sorgularının etiketleri de prime() ile önbelleğe yazılır.
+
+    Önbellekte olmayan id'ler türlerine göre gruplanır ve /nodes?nodes=...
+    gibi toplu isteklerle, parçalar eşzamanlı olarak çekilir. Toplu istek
+    (ör. silinmiş bir öğe yüzünden) başarısız olursa o parçanın id'leri tek
+    tek denenir. Bulunamayan öğeler de (boş etiketle) önbelleğe alınır.
+    """
+
+    def __init__(self, client, osm_api_url, maxsize=None, ttl=None):
+        self.client = client
+        self.osm_api_url = osm_api_url.rstrip("/")
+        self.cache = TTLCache(
+            maxsize=maxsize if maxsize is not None else int(os.environ.get("PET_VET_DETAILS_CACHE_SIZE", "10000")),
+            ttl=ttl if ttl is not None else float(os.environ.get("PET_VET_DETAILS_CACHE_TTL", "86400"))
+        )
+        self.upstream_requests = 0
+
+    def prime(self, elements):
+        """Overpass yanıtındaki etiketleri önbelleğe yaz (ayrı detay çağrısı gerekmez)"""
+        for element in elements:
+            if element.get("type") in OSM_ELEMENT_TYPES and "id" in element:
+                self.cache.put((element["type"], element["id"]), element.get("tags", {}))
+
+    async def _fetch_chunk(self, element_type, ids):
+        self.upstream_requests += 1
+        url = f"{self.osm_api_url}/{OSM_ELEMENT_TYPES[element_type]}.json"
+        data = await self.client.get_json(url, params={OSM_ELEMENT_TYPES[element_type]: ",".join(map(str, ids))})
+        return {
+            element["id"]: element.get("tags", {})
+            for element in data.get("elements", []) if element.get("type") == element_type
+        }
+
+    async def _fetch_one(self, element_type, element_id):
+        self.upstream_requests += 1
+        try:
+            data = await self.client.get_json(f"{self.osm_api_url}/{element_type}/{element_id}.json")
+        except requests.HTTPError as e:
+            if _is_missing(e):
+                return {element_id: {}}
+            raise
+        elements = data.get("elements", [{}])
+        return {element_id: elements[0].get("tags", {}) if elements else {}}
+
+    async def _fetch_type(self, element_type, ids):
+        chunks = [ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+        results = await asyncio.gather(
+            *(self._fetch_chunk(element_type, chunk) for chunk in chunks), return_exceptions=True
+        )
+        tags_by_id = {}
+        for chunk, result in zip(chunks, results):
+            if _is_missing(result):
+                singles = await asyncio.gather(*(self._fetch_one(element_type, i) for i in chunk))
+                for single in singles:
+                    tags_by_id.update(single)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                tags_by_id.update(result)
+        return tags_by_id
+
+    async def get_many(self, place_ids, index=None):
+        """place_id -> detay sözlüğü; geçersiz ya da çekilemeyen id'ler için "Telefon bilgisi yok" """
+        details, pending, missing = {}, {}, {}
+        for place_id in dict.fromkeys(place_ids):
+            parsed = parse_place_id(place_id)
+            tags = self.cache.get(parsed) if parsed else {}
+            if tags is None and index is not None:
+                element = index.get(place_id)
+                tags = element.get("tags") if element else None
+            if tags is None:
+                pending[place_id] = parsed
+                missing.setdefault(parsed[0], []).append(parsed[1])
+            else:
+                details[place_id] = details_from_tags(tags)
+
+        if missing:
+            types = list(missing)
+            fetched = await asyncio.gather(
+                *(self._fetch_type(t, list(dict.fromkeys(missing[t]))) for t in types), return_exceptions=True
+            )
+            tags_by_type = {}
+            for element_type, result in zip(types, fetched):
+                if isinstance(result, BaseException):
+                    # Upstream hatası: bu istekte etiketsiz dön, önbelleğe yazma
+                    print(f"OSM API Error: {str(result)}")
+                    continue
+                tags_by_type[element_type] = result
+            for place_id, (element_type, element_id) in pending.items():
+                if element_type not in tags_by_type:
+                    details[place_id] = details_from_tags({})
+                    continue
+                tags = tags_by_type[element_type].get(element_id, {})
+                self.cache.put((element_type, element_id), tags)
+                details[place_id] = details_from_tags(tags)
+        return {place_id: details[place_id] for place_id in place_ids}
+
+    def stats(self):
+        return {**self.cache.stats(), "upstream_requests": self.upstream_requests}
@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+VET_INDEX_FORMAT_VERSION = 1
+EARTH_RADIUS_M = 6371008.8
+
+VET_INDEX_PATH = os.environ.get(
+    "PET_VET_INDEX",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "data", "processed", "vet_index.json")
+)
+
+
+def is_veterinary(tags):
+    return tags.get("amenity") == "veterinary"
+
+
+def element_location(element):
+    """Overpass öğesinin koordinatı: node için kendisi, way/relation için 'out center' merkezi"""
+    if element.get("type") == "node":
+        return element.get("lat"), element.get("lon")
+    center = element.get("center", {})
+    return center.get("lat"), center.get("lon")
+
+
+def vet_result(element, lat, lng):
+    """/nearby_vets yanıtındaki tek veteriner kaydı"""
+    tags = element.get("tags", {})
+    return {
+        "place_id": f"osm_{element['type']}_{element['id']}",
+        "name": tags.get("name", "İsimsiz Veteriner"),
+        "vicinity": tags.get("addr:street", "") + " " + tags.get("addr:city", ""),
+        "geometry": {
+            "location": {
+                "lat": lat,
+                "lng": lng
+            }
+        },
+        "rating": None,
+        "opening_hours": {
+            "open_now": None
+        }
+    }
+
+
+def parse_overpass_elements(data):
+    """Overpass JSON yanıtını koordinatlı veteriner kayıtlarına çevir"""
+    vets = []
+    for element in data.get("elements", []):
+        lat, lng = element_location(element)
+        if not lat or not lng:
+            continue
+        vets.append(vet_result(element, lat, lng))
+    return vets
+
+
+def _xml_tags(node):
+    return {tag.get("k"): tag.get("v") for tag in node.iter("tag")}
+
+
+def read_osm_xml(path):
+    """OSM XML extract'inden amenity=veterinary node/way'lerini Overpass öğesi formatında oku.
+
+    İki geçiş: önce veteriner way'lerinin node referansları, sonra yalnızca o
+    node'ların koordinatları toplanır (tüm extract belleğe alınmaz).
+    """
+    elements, way_refs, needed = [], {}, set()
+    for _, node in ET.iterparse(path):
+        if node.tag == "node":
+            tags = _xml_tags(node)
+            if is_veterinary(tags):
+                elements.append({"type": "node", "id": int(node.get("id")),
+                                 "lat": float(node.get("lat")), "lon": float(node.get("lon")), "tags": tags})
+            node.clear()
+        elif node.tag == "way":
+            tags = _xml_tags(node)
+            if is_veterinary(tags):
+                refs = [int(nd.get("ref")) for nd in node.iter("nd")]
+                way_refs[int(node.get("id"))] = (refs, tags)
+                needed.update(refs)
+            node.clear()
+
+    if way_refs:
+        coords = {}
+        for _, node in ET.iterparse(path):
+            if node.tag == "node" and int(node.get("id")) in needed:
+                coords[int(node.get("id"))] = (float(node.get("lat")), float(node.get("lon")))
+            if node.tag in ("node", "way", "relation"):
+                node.clear()
+        for way_id, (refs, tags) in way_refs.items():
+            points = [coords[ref] for ref in refs if ref in coords]
+            if points:
+                lat, lon = np.mean(points, axis=0).tolist()
+                elements.append({"type": "way", "id": way_id, "center": {"lat": lat, "lon": lon}, "tags": tags})
+    return elements
+
+
+def _unit_vectors(lat, lng):
+    lat, lng = np.radians(lat), np.radians(lng)
+    return np.stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)], axis=-1)
+
+
+def _chord(distance_m):
+    # Büyük daire mesafesi -> birim küre üzerindeki kiriş uzunluğu (monoton)
+    return 2 * np.sin(min(distance_m / EARTH_RADIUS_M, np.pi) / 2)
+
+
+def _arc_m(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+class VetIndex:
+    """amenity=veterinary POI'leri için yerel, çevrimdışı mekânsal indeks.
+
+    Koordinatlar birim küre üzerindeki 3B vektörlere çevrilip bir KD-tree'de
+    tutulur; kiriş uzunluğu haversine mesafesiyle monoton olduğundan yarıçap
+    ve k-en-yakın sorguları kesin sonuç verir ve mesafeye göre sıralı döner.
+    Kayıtlar place_id -> Overpass öğesi sözlüğündedir; diff uygulandığında
+    ağaç yeniden kurulur ve (ağaç, id'ler, koordinatlar, vektörler) tek
+    atamayla değiştirilir.
+    """
+
+    def __init__(self, elements=(), metadata=None):
+        self.elements = {}
+        self.metadata = metadata or {}
+        self._state = (None, [], np.empty((0, 2)), np.empty((0, 3)))
+        self.upsert(elements)
+
+    def __len__(self):
+        return len(self.elements)
+
+    @staticmethod
+    def place_id(element):
+        return f"osm_{element['type']}_{element['id']}"
+
+    def upsert(self, elements, rebuild=True):
+        for element in elements:
+            lat, lng = element_location(element)
+            if lat is None or lng is None:
+                continue
+            self.elements[self.place_id(element)] = element
+        if rebuild:
+            self._rebuild()
+
+    def remove(self, place_ids, rebuild=True):
+        for place_id in place_ids:
+            self.elements.pop(place_id, None)
+        if rebuild:
+            self._rebuild()
+
+    def _rebuild(self):
+        ids = list(self.elements)
+        coords = np.array([element_location(self.elements[i]) for i in ids], dtype=float).reshape(-1, 2)
+        vectors = _unit_vectors(coords[:, 0], coords[:, 1])
+        tree = cKDTree(vectors) if len(ids) else None
+        self._state = (tree, ids, coords, vectors)
+
+    def get(self, place_id):
+        return self.elements.get(place_id)
+
+    def _results(self, ids, coords, indices, distances_m):
+        results = []
+        for index, distance in zip(indices, distances_m):
+            lat, lng = coords[index]
+            result = vet_result(self.elements[ids[index]], float(lat), float(lng))
+            result["distance_m"] = round(float(distance), 1)
+            results.append(result)
+        return results
+
+    def query_radius(self, lat, lng, radius_m, offset=0, limit=20):
+        """Yarıçap içindeki veterinerler, yakından uzağa; (toplam, sayfa)"""
+        tree, ids, coords, vectors = self._state
+        if tree is None:
+            return 0, []
+        point = _unit_vectors(lat, lng)
+        indices = np.asarray(tree.query_ball_point(point, _chord(radius_m)), dtype=np.intp)
+        distances = _arc_m(np.linalg.norm(vectors[indices] - point, axis=1))
+        order = np.argsort(distances, kind="stable")[offset:offset + limit]
+        return len(indices), self._results(ids, coords, indices[order], distances[order])
+
+    def query_knn(self, lat, lng, k=20, max_radius_m=None):
+        """En yakın k veteriner (isteğe bağlı en fazla max_radius_m uzaklıkta)"""
+        tree, ids, coords, _ = self._state
+        if tree is None or k <= 0:
+            return []
+        bound = _chord(max_radius_m) if max_radius_m is not None else np.inf
+        chords, indices = tree.query(_unit_vectors(lat, lng), k=min(k, len(ids)), distance_upper_bound=bound)
+        chords, indices = np.atleast_1d(chords), np.atleast_1d(indices)
+        found = np.isfinite(chords)
+        return self._results(ids, coords, indices[found], _arc_m(chords[found]))
+
+    def apply_osm_change(self, path):
+        """osmChange (.osc) diff'ini uygula; (eklenen/güncellenen, silinen) sayıları döndür.
+
+        Yalnızca koordinatı diff'te ya da mevcut kayıtta bulunan way'ler güncellenir.
+        """
+        upserts, removals = [], set()
+        node_coords = {}
+        root = ET.parse(path).getroot()
+        for node in root.iter("node"):
+            if node.get("lat") is not None:
+                node_coords[int(node.get("id"))] = (float(node.get("lat")), float(node.get("lon")))
+
+        for action in root:
+            for node in action:
+                if node.tag not in ("node", "way"):
+                    continue
+                element_id = int(node.get("id"))
+                place_id = f"osm_{node.tag}_{element_id}"
+                tags = _xml_tags(node)
+                if action.tag == "delete" or not is_veterinary(tags):
+                    # Silinen ya da veteriner etiketi kaldırılan öğe
+                    if place_id in self.elements:
+                        removals.add(place_id)
+                    continue
+                if node.tag == "node":
+                    upserts.append({"type": "node", "id": element_id, "lat": float(node.get("lat")),
+                                    "lon": float(node.get("lon")), "tags": tags})
+                    continue
+                points = [node_coords[int(nd.get("ref"))] for nd in node.iter("nd")
+                          if int(nd.get("ref")) in node_coords]
+                if points:
+                    lat, lon = np.mean(points, axis=0).tolist()
+                    center = {"lat": lat, "lon": lon}
+                elif place_id in self.elements:
+                    center = self.elements[place_id].get("center")
+                else:
+                    continue
+                upserts.append({"type": "way", "id": element_id, "center": center, "tags": tags})
+
+        self.remove(removals, rebuild=False)
+        self.upsert(upserts, rebuild=False)
+        self._rebuild()
+        self.metadata.setdefault("applied_diffs", []).append(os.path.basename(path))
+        return len(upserts), len(removals)
+
+    @classmethod
+    def from_file(cls, path):
+        """Overpass JSON dump'ı (.json) ya da OSM XML extract'i (.osm/.xml)"""
+        if path.endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                elements = [e for e in json.load(f).get("elements", []) if is_veterinary(e.get("tags", {}))]
+        else:
+            elements = read_osm_xml(path)
+        return cls(elements, metadata={"source": os.path.basename(path)})
+
+    def save(self, path=None):
+        path = path or VET_INDEX_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = {
+            "format_version": VET_INDEX_FORMAT_VERSION,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "metadata": self.metadata,
+            "elements": list(self.elements.values())
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or VET_INDEX_PATH, encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("format_version") != VET_INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported vet index format: {payload.get('format_version')}")
+        metadata = dict(payload.get("metadata", {}), updated_at=payload.get("updated_at"))
+        return cls(payload.get("elements", []), metadata=metadata)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and maintain the local veterinary POI index")
+    parser.add_argument("--index", default=VET_INDEX_PATH, help="index file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("import", help="build the index from an Overpass JSON dump or OSM XML extract")
+    build.add_argument("source")
+    diff = commands.add_parser("apply-diff", help="apply osmChange (.osc) diffs in order")
+    diff.add_argument("diffs", nargs="+")
+    query = commands.add_parser("query", help="radius query against the index")
+    query.add_argument("lat", type=float)
+    query.add_argument("lng", type=float)
+    query.add_argument("--radius", type=int, default=10000)
+    query.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "import":
+        index = VetIndex.from_file(args.source)
+        index.save(args.index)
+        print(f"✅ {len(index)} veteriner indekslendi -> {args.index} ({time.perf_counter() - start:.2f}s)")
+    elif args.command == "apply-diff":
+        index = VetIndex.load(args.index)
+        for path in args.diffs:
+            upserted, removed = index.apply_osm_change(path)
+            print(f"🔄 {os.path.basename(path)}: {upserted} eklendi/güncellendi, {removed} silindi")
+        index.save(args.index)
+        print(f"✅ İndeks: {len(index)} veteriner ({time.perf_counter() - start:.2f}s)")
+    else:
+        total, results = VetIndex.load(args.index).query_radius(args.lat, args.lng, args.radius, limit=args.limit)
+        print(f"{total} veteriner ({args.radius} m içinde)")
+        for result in results:
+            print(f"  {result['distance_m']:>9.1f} m  {result['name']}  ({result['place_id']})")